@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import inspect
 import sys
+import threading
 import warnings
 from typing import (
     TYPE_CHECKING,
@@ -55,6 +56,13 @@ _RetT = TypeVar("_RetT")
 
 NON_PERSISTABLE_VAR_NAME_SUFFIX = "__non_persistable"
 
+# NOTE: The default programs and the unique name generator switched by
+# `program_guard` and `unique_name.guard` are shared by all threads, so
+# building static graphs is serialized by this lock, e.g. building the
+# programs of to_static functions in the main thread while SOT translates
+# a frame in the background, see `SOT_ASYNC_COMPILE`.
+_static_graph_lock = threading.RLock()
+
 
 def in_to_static_mode() -> bool:
     """
@@ -89,7 +97,7 @@ def _switch_to_static_graph_(
     func: Callable[_InputT, _RetT]
 ) -> Callable[_InputT, _RetT]:
     def __impl__(*args: _InputT.args, **kwargs: _InputT.kwargs) -> _RetT:
-        with framework._dygraph_guard(None):
+        with _static_graph_lock, framework._dygraph_guard(None):
             return func(*args, **kwargs)
 
     return __impl__
@@ -15,13 +15,23 @@
 from __future__ import annotations
 
 import copy
+import functools
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 import paddle
+from paddle.base import core
+from paddle.base.framework import convert_np_dtype_to_proto_type
 from paddle.distributed.communication.group import is_initialized
 from paddle.distributed.fleet.utils.log_util import logger
+from paddle.framework.stream_io import (
+    _is_stream_file,
+    _map_stream_data,
+    _numpy_dtype,
+)
 
 from .metadata import LocalTensorIndex, LocalTensorMetadata
 from .utils import (
@@ -44,8 +54,74 @@ class ReadItem:
     lengths: tuple[int, ...]
 
 
+@dataclass
+class TransferBucket:
+    """
+    Read items sent from `src` rank to `dst` rank in one flat buffer.
+    """
+
+    src: int
+    dst: int
+    dtype: str
+    items: list[ReadItem] = field(default_factory=list)
+    numel: int = 0
+
+
+class MmapStorageFile:
+    """
+    The local tensors in a data file saved in the stream format of
+    `paddle.save`. The file is mapped into memory, and only the regions to
+    be read are copied from it.
+
+    Args:
+        path(str): The path of the data file.
+        byte_ranges(dict[str, tuple[int, int]]): The (offset, size) in bytes
+            of each local tensor in the data section of the file.
+        tensor_metadata(dict[str, LocalTensorMetadata]): The metadata of each
+            local tensor.
+    """
+
+    def __init__(self, path, byte_ranges, tensor_metadata):
+        self.path = path
+        self.byte_ranges = byte_ranges
+        self.tensor_metadata = tensor_metadata
+        self._buffer = None
+        self._data_start = None
+
+    def __contains__(self, tensor_key):
+        return tensor_key in self.byte_ranges
+
+    def read(self, tensor_key, offsets, lengths):
+        if self._buffer is None:
+            self._buffer, self._data_start = _map_stream_data(self.path)
+        offset, nbytes = self.byte_ranges[tensor_key]
+        local_tensor_metadata = self.tensor_metadata[tensor_key]
+        dtype = _numpy_dtype(local_tensor_metadata.dtype)
+        local_shape = tuple(local_tensor_metadata.local_shape)
+        if nbytes == 0:
+            array = np.empty(local_shape, dtype=dtype)
+        else:
+            array = np.frombuffer(
+                self._buffer,
+                dtype=dtype,
+                count=nbytes // dtype.itemsize,
+                offset=self._data_start + offset,
+            ).reshape(local_shape)
+        region = array[
+            tuple(
+                slice(begin, begin + length)
+                for begin, length in zip(offsets, lengths)
+            )
+        ]
+        # copy the region only, which is read from the file
+        return paddle.to_tensor(np.array(region, order='C'))
+
+
 PATH_TO_CHECKPOINT_FILES: dict[str, tuple[list[str], list[str]]] = {}
 
+# The max bytes sent and received by a rank in one batch of transfers.
+MAX_TRANSFER_BYTES_PER_RANK = 256 * 1024 * 1024
+
 
 def get_checkpoint_files(path, use_cache=True):
     global PATH_TO_CHECKPOINT_FILES
@@ -69,6 +145,22 @@ def get_checkpoint_files(path, use_cache=True):
     return (metadata_files, local_data_files)
 
 
+def get_referenced_files(path, metadata_list):
+    """
+    Get the data files of previous checkpoints referenced by the incremental
+    checkpoint in `path`, which are accessible in current rank. The file
+    names are relative to `path`.
+    """
+    referenced_files = set()
+    for metadata in metadata_list:
+        for file_name in metadata.storage_metadata.values():
+            if os.path.dirname(file_name) and os.path.isfile(
+                os.path.join(path, file_name)
+            ):
+                referenced_files.add(file_name)
+    return sorted(referenced_files)
+
+
 def get_rank_to_files(
     metadata_list, local_data_files, state_dict, process_group, use_dist
 ):
@@ -248,6 +340,61 @@ def get_local_load_files(rank_to_files):
         return []
 
 
+def get_storage_byte_ranges(metadata_list):
+    """
+    Get the byte ranges and metadata of local tensors in each data file.
+
+    Returns:
+        dict[str, tuple[dict, dict]]: mapping from file name to the byte ranges
+        and metadata of its tensors, which are keyed by tensor key. Files saved
+        without byte ranges are not included.
+    """
+    file_to_byte_ranges = {}
+    for metadata in metadata_list:
+        if metadata.storage_byte_ranges is None:
+            continue
+        local_tensor_metadata = {}
+        for (
+            tensor_key,
+            metadata_list_of_key,
+        ) in metadata.state_dict_metadata.items():
+            for local_metadata in metadata_list_of_key:
+                local_tensor_metadata[
+                    LocalTensorIndex(
+                        tensor_key, tuple(local_metadata.global_offset)
+                    )
+                ] = local_metadata
+        for (
+            local_tensor_index,
+            byte_range,
+        ) in metadata.storage_byte_ranges.items():
+            file_name = metadata.storage_metadata[local_tensor_index]
+            byte_ranges, tensor_metadata = file_to_byte_ranges.setdefault(
+                file_name, ({}, {})
+            )
+            byte_ranges[local_tensor_index.tensor_key] = byte_range
+            tensor_metadata[local_tensor_index.tensor_key] = (
+                local_tensor_metadata[local_tensor_index]
+            )
+    return file_to_byte_ranges
+
+
+def load_storage_file(path, file_name, file_to_byte_ranges):
+    """
+    Load a data file lazily as `MmapStorageFile` if its byte ranges are
+    saved, otherwise load the whole file.
+    """
+    file_path = os.path.join(path, file_name)
+    if file_name in file_to_byte_ranges and _is_stream_file(file_path):
+        byte_ranges, tensor_metadata = file_to_byte_ranges[file_name]
+        if all(
+            _numpy_dtype(local_metadata.dtype) is not None
+            for local_metadata in tensor_metadata.values()
+        ):
+            return MmapStorageFile(file_path, byte_ranges, tensor_metadata)
+    return paddle.load(file_path)
+
+
 def get_load_infos(metadata_list, local_load_files, process_group, use_dist):
     load_info = {}
     for metadata in metadata_list:
@@ -470,6 +617,9 @@ def load_state_dict(
         metadata_list = []
         for file in metadata_files:
             metadata_list.append(paddle.load(os.path.join(path, file)))
+        local_data_files = local_data_files + get_referenced_files(
+            path, metadata_list
+        )
 
         rank_to_files, missing_keys = get_rank_to_files(
             metadata_list,
@@ -488,9 +638,13 @@ def load_state_dict(
 
         local_load_files = get_local_load_files(rank_to_files)
 
+        # Only the regions overlapped with the tensors to load are read from files saved with byte ranges.
+        file_to_byte_ranges = get_storage_byte_ranges(metadata_list)
         source_state_dict = {}
         for file in local_load_files:
-            source_state_dict[file] = paddle.load(os.path.join(path, file))
+            source_state_dict[file] = load_storage_file(
+                path, file, file_to_byte_ranges
+            )
 
         state_dict_in_cpu = []
         for k, v in flat_state_dict.items():
@@ -528,95 +682,197 @@ def _load_state_dict(
             metadata_list, target_state_dict, process_group, use_dist
         )
 
+        cur_rank = paddle.distributed.get_rank()
         for item in read_items:
             assert (
                 item.local_tensor_index in load_infos
             ), f"item:{item}, load_infos:{load_infos}"
             src_rank, file_name = load_infos[item.local_tensor_index]
-            storage_chunk_tensor = None
-            cur_chunk_tensor = None
-            # The src rank need to load the state_dict.
-            if src_rank == paddle.distributed.get_rank():
-                assert file_name in source_state_dict
-                storage_state_dict = source_state_dict[file_name]
-                assert item.local_tensor_index.tensor_key in storage_state_dict
-                storage_local_tensor = storage_state_dict[
-                    item.local_tensor_index.tensor_key
-                ]
-                storage_offsets = item.storage_offset
-                storage_lengths = item.lengths
-                storage_ends = [
-                    storage_offset + storage_length
-                    for storage_offset, storage_length in zip(
-                        storage_offsets, storage_lengths
-                    )
-                ]
-                # The storage_chunk_tensor and storage_local_tensor share the same memory.
-                if len(storage_lengths) > 0:
-                    storage_chunk_tensor = paddle.slice(
-                        storage_local_tensor,
-                        list(range(len(storage_lengths))),
-                        storage_offsets,
-                        storage_ends,
-                    )
-                else:
-                    storage_chunk_tensor = storage_local_tensor
-            # The read item rank need to be assigned
-            if item.rank == paddle.distributed.get_rank():
-                assert (
-                    item.local_tensor_index.tensor_key in target_state_dict
-                ), f"item:{item}, state_dict:{target_state_dict}"
-
-                cur_local_tensor = (
-                    target_state_dict[
-                        item.local_tensor_index.tensor_key
-                    ]._local_value()
-                    if use_dist
-                    and target_state_dict[
-                        item.local_tensor_index.tensor_key
-                    ].is_dist()
-                    else target_state_dict[item.local_tensor_index.tensor_key]
+            # Src_rank represents the rank of data read from ckpt, item_rank is the rank of the parameter of the data to be loaded.
+            # Assign value locally: in the case of src_rank is cur_rank, it means that the ckpt and the parameters to be loaded are both in the current node.
+            if src_rank == item.rank == cur_rank:
+                paddle.assign(
+                    get_storage_chunk(item, file_name, source_state_dict),
+                    get_cur_chunk(item, target_state_dict, use_dist),
                 )
 
-                cur_offsets = item.cur_offset
-                cur_lengths = item.lengths
-                cur_ends = [
-                    cur_offset + cur_length
-                    for cur_offset, cur_length in zip(cur_offsets, cur_lengths)
-                ]
-                # The cur_chunk_tensor and cur_local_tensor share the same memory.
-                if len(cur_lengths) > 0:
-                    cur_chunk_tensor = paddle.slice(
-                        cur_local_tensor,
-                        list(range(len(cur_lengths))),
-                        cur_offsets,
-                        cur_ends,
-                    )
-                else:
-                    cur_chunk_tensor = cur_local_tensor
-            else:
-                # Why we use item.dtype: In static mode, the state_dict maybe incomplete in pp, the dtype is stored in advance.
-                cur_chunk_tensor = paddle.zeros(
-                    item.lengths,
-                    item.dtype,
-                )
+        # Assign value remotely: chunks between each pair of ranks are sent in flat buffers, ranks not involved in a batch skip it.
+        for batch in get_transfer_batches(read_items, load_infos):
+            transfer_batch(
+                batch,
+                target_state_dict,
+                source_state_dict,
+                load_infos,
+                process_group,
+                use_dist,
+            )
 
-            # Src_rank represents the rank of data read from ckpt, item_rank is the rank of the parameter of the data to be loaded.
-            if src_rank == item.rank:
-                if src_rank == paddle.distributed.get_rank():
-                    # Assign value locally: in the case of src_rank is cur_rank, it means that the ckpt and the parameters to be loaded are both in the current node.
-                    paddle.assign(storage_chunk_tensor, cur_chunk_tensor)
-            else:
-                # Assign value remotely: src_rank broadcasts the ckpt, and the parameters to be loaded receive the data broadcast by src_rank.
-                if src_rank == paddle.distributed.get_rank():
-                    storage_chunk_tensor = storage_chunk_tensor.contiguous()
-                    paddle.distributed.broadcast(
-                        storage_chunk_tensor, src=src_rank, group=process_group
-                    )
-                else:
-                    # The memory hold by cur_chunk_tensor may be non-contiguous, and the broadcast API does not support this type of tensor.
-                    tmp_tensor = paddle.assign(cur_chunk_tensor)
-                    paddle.distributed.broadcast(
-                        tmp_tensor, src=src_rank, group=process_group
-                    )
-                    paddle.assign(tmp_tensor, cur_chunk_tensor)
+
+def get_storage_chunk(item, file_name, source_state_dict):
+    assert file_name in source_state_dict
+    storage_state_dict = source_state_dict[file_name]
+    assert item.local_tensor_index.tensor_key in storage_state_dict
+    if isinstance(storage_state_dict, MmapStorageFile):
+        return storage_state_dict.read(
+            item.local_tensor_index.tensor_key,
+            item.storage_offset,
+            item.lengths,
+        )
+    storage_local_tensor = storage_state_dict[
+        item.local_tensor_index.tensor_key
+    ]
+    storage_offsets = item.storage_offset
+    storage_lengths = item.lengths
+    storage_ends = [
+        storage_offset + storage_length
+        for storage_offset, storage_length in zip(
+            storage_offsets, storage_lengths
+        )
+    ]
+    # The storage_chunk_tensor and storage_local_tensor share the same memory.
+    if len(storage_lengths) > 0:
+        return paddle.slice(
+            storage_local_tensor,
+            list(range(len(storage_lengths))),
+            storage_offsets,
+            storage_ends,
+        )
+    return storage_local_tensor
+
+
+def get_cur_chunk(item, target_state_dict, use_dist):
+    assert (
+        item.local_tensor_index.tensor_key in target_state_dict
+    ), f"item:{item}, state_dict:{target_state_dict}"
+    cur_tensor = target_state_dict[item.local_tensor_index.tensor_key]
+    cur_local_tensor = (
+        cur_tensor._local_value()
+        if use_dist and cur_tensor.is_dist()
+        else cur_tensor
+    )
+    cur_offsets = item.cur_offset
+    cur_lengths = item.lengths
+    cur_ends = [
+        cur_offset + cur_length
+        for cur_offset, cur_length in zip(cur_offsets, cur_lengths)
+    ]
+    # The cur_chunk_tensor and cur_local_tensor share the same memory.
+    if len(cur_lengths) > 0:
+        return paddle.slice(
+            cur_local_tensor,
+            list(range(len(cur_lengths))),
+            cur_offsets,
+            cur_ends,
+        )
+    return cur_local_tensor
+
+
+@functools.lru_cache(maxsize=None)
+def _size_of_dtype(dtype):
+    return core.size_of_dtype(convert_np_dtype_to_proto_type(dtype))
+
+
+def get_transfer_batches(
+    read_items, load_infos, max_bytes_per_rank=MAX_TRANSFER_BYTES_PER_RANK
+):
+    """
+    Plan the transfers of read items whose src rank is not the rank to load
+    them. Items of the same (src rank, dst rank, dtype) are packed into one
+    bucket, which is sent in one flat buffer, and buckets are split into
+    batches, in which each rank sends and receives no more than
+    `max_bytes_per_rank` bytes, unless a single item is larger. The plan only
+    depends on `read_items` and `load_infos`, so it is the same in all ranks.
+
+    Returns:
+        list[list[TransferBucket]]: the batches of transfers.
+    """
+    groups = {}
+    for item in read_items:
+        src_rank, _ = load_infos[item.local_tensor_index]
+        if src_rank == item.rank:
+            continue
+        numel = int(np.prod(item.lengths, dtype='int64'))
+        if numel == 0:
+            continue
+        groups.setdefault((src_rank, item.rank, item.dtype), []).append(
+            (item, numel)
+        )
+
+    batches = []
+    batch = []
+    rank_bytes = {}
+    for (src_rank, dst_rank, dtype), items in groups.items():
+        bucket = None
+        for item, numel in items:
+            nbytes = numel * _size_of_dtype(dtype)
+            used = max(rank_bytes.get(src_rank, 0), rank_bytes.get(dst_rank, 0))
+            if len(batch) > 0 and used + nbytes > max_bytes_per_rank:
+                batches.append(batch)
+                batch = []
+                rank_bytes = {}
+                bucket = None
+            if bucket is None:
+                bucket = TransferBucket(src_rank, dst_rank, dtype)
+                batch.append(bucket)
+            bucket.items.append(item)
+            bucket.numel += numel
+            rank_bytes[src_rank] = rank_bytes.get(src_rank, 0) + nbytes
+            rank_bytes[dst_rank] = rank_bytes.get(dst_rank, 0) + nbytes
+    if len(batch) > 0:
+        batches.append(batch)
+    return batches
+
+
+def transfer_batch(
+    batch,
+    target_state_dict,
+    source_state_dict,
+    load_infos,
+    process_group,
+    use_dist,
+):
+    cur_rank = paddle.distributed.get_rank()
+    p2p_ops = []
+    recv_buckets = []
+    for bucket in batch:
+        if bucket.src == cur_rank:
+            chunks = [
+                get_storage_chunk(
+                    item,
+                    load_infos[item.local_tensor_index][1],
+                    source_state_dict,
+                )
+                .contiguous()
+                .flatten()
+                for item in bucket.items
+            ]
+            buffer = paddle.concat(chunks) if len(chunks) > 1 else chunks[0]
+            p2p_ops.append(
+                paddle.distributed.P2POp(
+                    paddle.distributed.isend, buffer, bucket.dst, process_group
+                )
+            )
+        elif bucket.dst == cur_rank:
+            # Why we use item.dtype: In static mode, the state_dict maybe incomplete in pp, the dtype is stored in advance.
+            buffer = paddle.empty([bucket.numel], bucket.dtype)
+            p2p_ops.append(
+                paddle.distributed.P2POp(
+                    paddle.distributed.irecv, buffer, bucket.src, process_group
+                )
+            )
+            recv_buckets.append((bucket, buffer))
+
+    if len(p2p_ops) == 0:
+        return
+    for task in paddle.distributed.batch_isend_irecv(p2p_ops):
+        task.wait()
+
+    for bucket, buffer in recv_buckets:
+        offset = 0
+        for item in bucket.items:
+            numel = int(np.prod(item.lengths, dtype='int64'))
+            paddle.assign(
+                buffer[offset : offset + numel].reshape(list(item.lengths)),
+                get_cur_chunk(item, target_state_dict, use_dist),
+            )
+            offset += numel
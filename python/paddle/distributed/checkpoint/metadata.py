@@ -42,3 +42,9 @@ class Metadata:
     state_dict_metadata: dict[str, list[LocalTensorMetadata]] = None
     storage_metadata: dict[LocalTensorIndex, str] = None
     flat_mapping: dict[str, tuple[str]] = None
+    # The (offset, size) in bytes of the local tensor in the data section of
+    # its storage file, which is saved in the stream format of `paddle.save`.
+    storage_byte_ranges: dict[LocalTensorIndex, tuple[int, int]] = None
+    # The content hash of the local tensor, which is saved in incremental
+    # mode, see `save_state_dict` .
+    storage_hashes: dict[LocalTensorIndex, str] = None
@@ -13,20 +13,28 @@
 # limitations under the License.
 from __future__ import annotations
 
-import multiprocessing
 import os
-import time
+from concurrent.futures import TimeoutError
 from typing import TYPE_CHECKING
 
 import paddle
 from paddle.distributed.communication.group import is_initialized
 from paddle.distributed.fleet.utils.log_util import logger
+from paddle.framework.io import _stream_state_dict_byte_ranges
 
+from .load_state_dict import get_checkpoint_files
 from .metadata import LocalTensorIndex, LocalTensorMetadata, Metadata
 from .utils import (
     compute_local_shape_and_global_offset,
+    compute_tensor_hash,
     flatten_state_dict,
 )
+from .writer import (
+    get_part_file_name,
+    get_writer_pool,
+    save_parts,
+    split_state_dict,
+)
 
 if TYPE_CHECKING:
     from paddle import Tensor
@@ -35,45 +43,19 @@ if TYPE_CHECKING:
 async_save_queue = []
 
 
-def check_exitcode(task):
-    exitcode = task.exitcode
-    if exitcode != 0:
-        logger.error(
-            f"Error: save ckpt process failed with exitcode {exitcode}!!!"
-        )
-
-
 def clear_async_save_task_queue():
     """
     wait until all async save task to be done.
     """
     while len(async_save_queue) > 0:
         task = async_save_queue.pop()
-        if task and task.is_alive():
-            task.join(timeout=60)
-            if task.is_alive():
-                logger.error("Error: save ckpt process timeout!!!")
-                async_save_queue.append(task)
-            else:
-                check_exitcode(task)
-        else:
-            check_exitcode(task)
-
-
-def copy_dict_to_cpu(nested_dict):
-    """
-    Copy the paddle.Tensor objects in the nested dictionary to the CPU and return a new dict.
-    """
-    new_dict = {}
-    for key, value in nested_dict.items():
-        if isinstance(value, paddle.Tensor):
-            new_dict[key] = value.cpu()
-            paddle.device.synchronize()
-        elif isinstance(value, dict):
-            new_dict[key] = copy_dict_to_cpu(value)
-        else:
-            new_dict[key] = value
-    return new_dict
+        try:
+            task.result(timeout=60)
+        except TimeoutError:
+            logger.error("Error: save ckpt task timeout!!!")
+            async_save_queue.append(task)
+        except Exception as e:
+            logger.error(f"Error: save ckpt task failed with error: {e}!!!")
 
 
 def check_file_name(file_name, process_group):
@@ -142,12 +124,47 @@ def dedup_tensor(
             local_state_dict.pop(tensor_index.tensor_key)
 
 
+def get_base_storage_metadata(base_path, path):
+    """
+    Get the data file, byte range and content hash of local tensors saved in
+    the incremental checkpoint in `base_path`, the data files are relative to
+    the checkpoint directory `path` to save.
+
+    Returns:
+        dict[LocalTensorIndex, tuple[str, tuple[int, int], str]]: The data
+        file, byte range and content hash of each local tensor.
+    """
+    metadata_files, _ = get_checkpoint_files(base_path, use_cache=False)
+    base_storage_metadata = {}
+    for metadata_file in metadata_files:
+        metadata = paddle.load(os.path.join(base_path, metadata_file))
+        if metadata.storage_hashes is None:
+            continue
+        storage_byte_ranges = metadata.storage_byte_ranges or {}
+        for local_tensor_index, tensor_hash in metadata.storage_hashes.items():
+            # The tensor may be referenced from an older checkpoint by the base checkpoint.
+            file_name = os.path.relpath(
+                os.path.join(
+                    base_path, metadata.storage_metadata[local_tensor_index]
+                ),
+                path,
+            )
+            base_storage_metadata[local_tensor_index] = (
+                file_name,
+                storage_byte_ranges.get(local_tensor_index),
+                tensor_hash,
+            )
+    return base_storage_metadata
+
+
 def save_state_dict(
     state_dict: dict[str, Tensor],
     path: str,
     process_group: Group | None = None,
     coordinator_rank: int = 0,
     async_save: bool = False,
+    incremental: bool = False,
+    base_path: str | None = None,
 ) -> None:
     """
     Save the state_dict of model to path.
@@ -158,6 +175,8 @@ def save_state_dict(
         process_group(paddle.distributed.collective.Group): ProcessGroup to be used for cross-rank synchronization. Use the default process group which contains all cards.
         coordinator_rank(int): The rank used to save non distributed values. Rank0 is used by default.
         async_save(bool): Async save the state_dict, default is False.
+        incremental(bool): Save the content hash of each local tensor, so that the checkpoint can be the base of later incremental checkpoints, default is False.
+        base_path(str|None): The directory of a previous checkpoint saved with `incremental=True` . Local tensors whose content is the same as in it are not written, but referenced to its data files, which must be kept while the checkpoint is used. Only used in incremental mode, default is None.
 
     Examples:
         .. code-block:: python
@@ -177,6 +196,9 @@ def save_state_dict(
         assert isinstance(
             state_dict, dict
         ), "The state_dict should be a dictionary."
+        assert (
+            incremental or base_path is None
+        ), "The base_path is only used when incremental is True."
         flat_state_dict, mapping = flatten_state_dict(state_dict)
         if len(flat_state_dict) > 0:
             for val in flat_state_dict.values():
@@ -273,39 +295,80 @@ def save_state_dict(
         )
         metadata.storage_metadata = dedup_key_in_dict(global_storage_metadata)
         metadata.flat_mapping = dedup_key_in_dict(global_flatten_mapping)
-        if coordinator_rank == paddle.distributed.get_rank():
-            logger.debug(f"metadata:{metadata}")
-            paddle.save(metadata, os.path.join(path, f"{unique_id}.metadata"))
         logger.debug(f"local_state_dict:{local_state_dict}")
         dedup_tensor(
             local_state_dict, local_storage_metadata, metadata.storage_metadata
         )
 
-        if async_save:
-            cpu_state_dict = copy_dict_to_cpu(local_state_dict)
-            clear_async_save_task_queue()
-
-            attempt = 0
-            ctx = multiprocessing.get_context("spawn")
+        # The data file, byte range and content hash of local tensors, so that the loader can read the regions it needs without loading the whole file.
+        local_part_metadata = {}
+        local_hashes = {}
+        if incremental:
+            base_storage_metadata = (
+                get_base_storage_metadata(base_path, path)
+                if base_path is not None
+                else {}
+            )
+            for key in list(local_state_dict.keys()):
+                local_tensor_index = LocalTensorIndex(
+                    key, tuple(local_state_dict_metadata[key].global_offset)
+                )
+                tensor_hash = compute_tensor_hash(local_state_dict[key])
+                base_metadata = base_storage_metadata.get(local_tensor_index)
+                if (
+                    base_metadata is not None
+                    and base_metadata[2] == tensor_hash
+                ):
+                    # Unchanged since the base checkpoint, refer to its data file instead of writing it again.
+                    local_part_metadata[local_tensor_index] = base_metadata
+                    local_state_dict.pop(key)
+                else:
+                    local_hashes[local_tensor_index] = tensor_hash
+
+        # A large local state_dict is split into several data files, which are written in parallel.
+        parts = split_state_dict(local_state_dict)
+        part_file_names = [
+            get_part_file_name(file_name, i) for i in range(len(parts))
+        ]
+        for part, part_file_name in zip(parts, part_file_names):
+            for key, byte_range in _stream_state_dict_byte_ranges(part).items():
+                local_tensor_index = LocalTensorIndex(
+                    key, tuple(local_state_dict_metadata[key].global_offset)
+                )
+                local_part_metadata[local_tensor_index] = (
+                    part_file_name,
+                    byte_range,
+                    local_hashes.get(local_tensor_index),
+                )
+        global_part_metadata = []
+        if use_dist:
+            paddle.distributed.all_gather_object(
+                global_part_metadata, local_part_metadata, process_group
+            )
+        else:
+            global_part_metadata.append(local_part_metadata)
+        metadata.storage_byte_ranges = {}
+        if incremental:
+            metadata.storage_hashes = {}
+        for local_tensor_index, (
+            part_file_name,
+            byte_range,
+            tensor_hash,
+        ) in dedup_key_in_dict(global_part_metadata).items():
+            metadata.storage_metadata[local_tensor_index] = part_file_name
+            if byte_range is not None:
+                metadata.storage_byte_ranges[local_tensor_index] = byte_range
+            if tensor_hash is not None:
+                metadata.storage_hashes[local_tensor_index] = tensor_hash
 
-            def start_process():
-                nonlocal attempt
-                try:
-                    p = ctx.Process(
-                        target=paddle.save,
-                        args=(cpu_state_dict, os.path.join(path, file_name)),
-                    )
-                    p.start()
-                    return p
-                except Exception as e:
-                    logger.error(
-                        f"Attempt {attempt + 1} failed with error: {e}"
-                    )
-                    attempt += 1
-                    time.sleep(1)
-                    return start_process()
+        if coordinator_rank == paddle.distributed.get_rank():
+            logger.debug(f"metadata:{metadata}")
+            paddle.save(metadata, os.path.join(path, f"{unique_id}.metadata"))
 
-            p = start_process()
-            async_save_queue.append(p)
+        paths = [os.path.join(path, name) for name in part_file_names]
+        if async_save:
+            clear_async_save_task_queue()
+            # The tensors are copied to shared memory before returning, and written by the writer processes.
+            async_save_queue.append(get_writer_pool().save(parts, paths))
         else:
-            paddle.save(local_state_dict, os.path.join(path, file_name))
+            save_parts(parts, paths)
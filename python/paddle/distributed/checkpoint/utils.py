@@ -14,6 +14,7 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -72,6 +73,20 @@ def compute_local_shape_and_global_offset(
     return tuple(local_shape), tuple(global_offset)
 
 
+def compute_tensor_hash(tensor):
+    """
+    Compute the hash of the content of a local tensor, in which the dtype and
+    shape are included.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(str(tensor.dtype).encode())
+    hasher.update(str(tuple(tensor.shape)).encode())
+    hasher.update(
+        np.ascontiguousarray(tensor.numpy()).reshape(-1).view(np.uint8)
+    )
+    return hasher.hexdigest()
+
+
 def flatten_state_dict(state_dict):
     """
     Flatten the nested dict to a flat dict.
@@ -0,0 +1,239 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+import paddle
+from paddle.distributed.fleet.utils.log_util import logger
+from paddle.framework.stream_io import _align, _stream_save, _to_numpy
+
+# The max size of a data file, a local state_dict larger than it is split
+# into several files, which are written in parallel.
+FILE_SIZE_LIMIT = 1 << 30
+# The max number of files written in parallel.
+NUM_WRITERS = 4
+
+_NAME_TABLE_KEY = "StructuredToParameterName@@"
+
+
+def _tensor_nbytes(tensor):
+    return int(np.prod(tensor.shape, dtype='int64')) * tensor.element_size()
+
+
+def split_state_dict(state_dict, file_size_limit=None):
+    """
+    Split the local state_dict into several parts in order, each part is no
+    larger than `file_size_limit` bytes unless it has only one tensor, which
+    is `FILE_SIZE_LIMIT` by default. There is always at least one part,
+    which may be empty.
+    """
+    if file_size_limit is None:
+        file_size_limit = FILE_SIZE_LIMIT
+    parts = [{}]
+    part_size = 0
+    for key, tensor in state_dict.items():
+        nbytes = _tensor_nbytes(tensor)
+        if len(parts[-1]) > 0 and part_size + nbytes > file_size_limit:
+            parts.append({})
+            part_size = 0
+        parts[-1][key] = tensor
+        part_size += nbytes
+    return parts
+
+
+def get_part_file_name(file_name, part):
+    """
+    The file name of the part of a data file, e.g. "0_0.distcp" for part 0
+    and "0_0.1.distcp" for part 1, so that the rank and unique id are parsed
+    from the name in the same way.
+    """
+    if part == 0:
+        return file_name
+    prefix, suffix = file_name.split(".", 1)
+    return f"{prefix}.{part}.{suffix}"
+
+
+def fsync_files(paths):
+    """
+    Flush the written files and their directories to disk together, after
+    all files of a checkpoint are written.
+    """
+    for path in paths:
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+    if hasattr(os, "O_DIRECTORY"):
+        for dirname in {os.path.dirname(os.path.abspath(p)) for p in paths}:
+            fd = os.open(dirname, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+
+def log_throughput(stats):
+    for path, nbytes, seconds in stats:
+        logger.info(
+            f"Saved {os.path.basename(path)}: {nbytes / 2**20:.2f} MB in "
+            f"{seconds:.3f}s, {nbytes / 2**20 / max(seconds, 1e-6):.2f} MB/s."
+        )
+
+
+def _save_part(part, path):
+    start = time.time()
+    paddle.save(part, path, use_stream_format=True)
+    return path, os.path.getsize(path), time.time() - start
+
+
+def save_parts(parts, paths):
+    """
+    Save the parts of the local state_dict to files in parallel threads.
+    """
+    with ThreadPoolExecutor(
+        max_workers=max(min(len(parts), NUM_WRITERS), 1)
+    ) as executor:
+        stats = list(executor.map(_save_part, parts, paths))
+    fsync_files(paths)
+    log_throughput(stats)
+    return stats
+
+
+def _write_shared_part(shm_name, layout, keys, name_table, path):
+    # Run in the writer process, tensors are read from the shared memory
+    # written by the trainer process.
+    start = time.time()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    # The shared memory is owned and unlinked by the trainer process.
+    resource_tracker.unregister(shm._name, "shared_memory")
+    try:
+        arrays = [
+            np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            for dtype, shape, offset in layout
+        ]
+        obj = {key: arrays[slot] for key, slot in keys}
+        obj[_NAME_TABLE_KEY] = name_table
+        _stream_save(obj, path)
+        # release the views of the shared memory before closing it
+        del arrays, obj
+    finally:
+        shm.close()
+    return path, os.path.getsize(path), time.time() - start
+
+
+class CheckpointWriterPool:
+    """
+    A long-lived pool of writer processes for async save. Tensors are
+    copied to shared memory in the trainer process, and each part of the
+    local state_dict is written to a file by a writer process, which is
+    loadable by `paddle.load` like the file of `paddle.save(part, path,
+    use_stream_format=True)` .
+    """
+
+    def __init__(self, num_workers=NUM_WRITERS):
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def _submit(self, part, path):
+        # The same tensor is copied once, so the layout of the file is the
+        # same as `paddle.save` .
+        slots = {}
+        keys = []
+        tensors = []
+        size = 0
+        for key, tensor in part.items():
+            if id(tensor) not in slots:
+                slots[id(tensor)] = len(tensors)
+                tensors.append((tensor, size))
+                size = _align(size + _tensor_nbytes(tensor))
+            keys.append((key, slots[id(tensor)]))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            layout = []
+            for tensor, offset in tensors:
+                array = _to_numpy(tensor)
+                np.ndarray(
+                    array.shape,
+                    dtype=array.dtype,
+                    buffer=shm.buf,
+                    offset=offset,
+                )[...] = array
+                layout.append((array.dtype, array.shape, offset))
+            name_table = {key: tensor.name for key, tensor in part.items()}
+            future = self._executor.submit(
+                _write_shared_part, shm.name, layout, keys, name_table, path
+            )
+        except:
+            shm.close()
+            shm.unlink()
+            raise
+
+        def release(_):
+            shm.close()
+            shm.unlink()
+
+        future.add_done_callback(release)
+        return future
+
+    def save(self, parts, paths):
+        """
+        Save the parts of the local state_dict to files asynchronously. It
+        returns after the tensors are copied to shared memory.
+
+        Returns:
+            Future: the future of the save, the result is a list of (path,
+            size, seconds) of files, which are flushed to disk together after
+            all files are written.
+        """
+        futures = [self._submit(part, path) for part, path in zip(parts, paths)]
+        result = Future()
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def on_part_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            try:
+                stats = [future.result() for future in futures]
+                fsync_files(paths)
+                log_throughput(stats)
+                result.set_result(stats)
+            except BaseException as e:
+                result.set_exception(e)
+
+        for future in futures:
+            future.add_done_callback(on_part_done)
+        return result
+
+
+_writer_pool = None
+
+
+def get_writer_pool():
+    global _writer_pool
+    if _writer_pool is None:
+        _writer_pool = CheckpointWriterPool()
+    return _writer_pool
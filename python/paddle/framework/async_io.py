@@ -0,0 +1,217 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import collections
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import paddle
+from paddle.base import core
+
+__all__ = []
+
+
+def _tensor_nbytes(tensor):
+    return int(np.prod(tensor.shape, dtype='int64')) * tensor.element_size()
+
+
+class _StagingPool:
+    """
+    Host buffers to snapshot tensors for async save. Buffers are cached by
+    place, dtype and shape after they are used, and reused by later saves,
+    as state dicts of the same model are saved repeatedly.
+
+    Before staging the tensors of a save, their total size is reserved, and
+    the reservation waits until the reserved size of pending saves is no
+    more than `capacity`. One save is always allowed, so a save larger than
+    `capacity` does not wait forever.
+    """
+
+    def __init__(self, capacity=None):
+        self._capacity = capacity
+        self._cond = threading.Condition()
+        self._reserved = 0
+        self._free = collections.defaultdict(list)
+        self._free_bytes = 0
+
+    def reserve(self, nbytes):
+        with self._cond:
+            while (
+                self._capacity is not None
+                and self._reserved > 0
+                and self._reserved + nbytes > self._capacity
+            ):
+                self._cond.wait()
+            self._reserved += nbytes
+
+    def release(self, nbytes, buffers):
+        with self._cond:
+            self._reserved -= nbytes
+            for key, buffer in buffers:
+                self._free[key].append(buffer)
+                self._free_bytes += _tensor_nbytes(buffer)
+            self._trim()
+            self._cond.notify_all()
+
+    def _trim(self):
+        if self._capacity is None:
+            return
+        # drop cached buffers exceeding the capacity
+        for key in list(self._free.keys()):
+            buffers = self._free[key]
+            while (
+                buffers and self._free_bytes + self._reserved > self._capacity
+            ):
+                self._free_bytes -= _tensor_nbytes(buffers.pop())
+            if not buffers:
+                del self._free[key]
+
+    def _acquire(self, key):
+        with self._cond:
+            buffers = self._free.get(key)
+            if not buffers:
+                return None
+            buffer = buffers.pop()
+            self._free_bytes -= _tensor_nbytes(buffer)
+            return buffer
+
+    def stage(self, tensor):
+        """
+        Copy `tensor` to a host buffer. Tensors on GPU are copied to pinned
+        memory without blocking, the copy is ordered before later kernels on
+        the same stream, so the snapshot is not changed by later updates,
+        and the caller should wait for an event recorded after it before
+        reading the buffer. Tensors on other places are copied with
+        blocking.
+        """
+        if core.is_compiled_with_cuda() and tensor.place.is_gpu_place():
+            place, blocking = core.CUDAPinnedPlace(), False
+        else:
+            place, blocking = paddle.CPUPlace(), True
+        key = (str(place), str(tensor.dtype), tuple(tensor.shape))
+        buffer = self._acquire(key)
+        if buffer is None:
+            buffer = tensor._copy_to(place, blocking)
+        else:
+            buffer.copy_(tensor, blocking)
+        buffer.name = tensor.name
+        buffer.stop_gradient = tensor.stop_gradient
+        return key, buffer
+
+
+class _AsyncSaveEngine:
+    """
+    Save objects containing tensors in a background thread.
+
+    `submit` snapshots tensors of the object to buffers of a staging pool
+    on the caller thread, which only issues copies for tensors on GPU, and
+    returns a `concurrent.futures.Future` of the save at once. Saves are
+    written one by one in submitting order, and buffers are returned to the
+    pool after written. If `max_pending` saves are not finished, or the
+    staging pool is full, `submit` waits for pending saves, which limits
+    the host memory used by async save.
+    """
+
+    def __init__(self, max_pending=2, staging_bytes=None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="paddle_async_save"
+        )
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._pool = _StagingPool(staging_bytes)
+
+    def _collect_tensors(self, obj, tensors):
+        if isinstance(obj, core.eager.Tensor):
+            tensors.setdefault(id(obj), obj)
+        elif isinstance(obj, dict):
+            for value in obj.values():
+                self._collect_tensors(value, tensors)
+        elif isinstance(obj, (list, tuple)):
+            for value in obj:
+                self._collect_tensors(value, tensors)
+
+    def _snapshot(self, obj, staged):
+        if isinstance(obj, core.eager.Tensor):
+            return staged[id(obj)]
+        elif isinstance(obj, dict):
+            return {k: self._snapshot(v, staged) for k, v in obj.items()}
+        elif isinstance(obj, (list, tuple)):
+            return type(obj)(self._snapshot(v, staged) for v in obj)
+        return obj
+
+    def submit(self, obj, save_fn):
+        self._pending.acquire()
+        try:
+            tensors = {}
+            self._collect_tensors(obj, tensors)
+            nbytes = sum(_tensor_nbytes(t) for t in tensors.values())
+            self._pool.reserve(nbytes)
+            buffers = []
+            try:
+                staged = {}
+                devices = set()
+                for key, tensor in tensors.items():
+                    buffer_key, buffer = self._pool.stage(tensor)
+                    buffers.append((buffer_key, buffer))
+                    staged[key] = buffer
+                    if tensor.place.is_gpu_place():
+                        devices.add(tensor.place.gpu_device_id())
+                snapshot = self._snapshot(obj, staged)
+                events = []
+                for device_id in devices:
+                    event = paddle.device.Event(paddle.CUDAPlace(device_id))
+                    event.record()
+                    events.append(event)
+                future = self._executor.submit(
+                    self._write, save_fn, snapshot, events
+                )
+            except:
+                self._pool.release(nbytes, buffers)
+                raise
+        except:
+            self._pending.release()
+            raise
+
+        def on_done(future):
+            self._pool.release(nbytes, buffers)
+            self._pending.release()
+
+        future.add_done_callback(on_done)
+        return future
+
+    def _write(self, save_fn, snapshot, events):
+        for event in events:
+            event.synchronize()
+        save_fn(snapshot)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def _get_async_save_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            max_pending = int(os.getenv("PADDLE_ASYNC_SAVE_MAX_PENDING", "2"))
+            staging_mb = int(os.getenv("PADDLE_ASYNC_SAVE_STAGING_MB", "0"))
+            _engine = _AsyncSaveEngine(
+                max_pending=max(max_pending, 1),
+                staging_bytes=(staging_mb << 20) if staging_mb > 0 else None,
+            )
+        return _engine
@@ -19,7 +19,6 @@ import copyreg
 import os
 import pickle
 import sys
-import threading
 import warnings
 from collections.abc import Iterable
 from typing import TYPE_CHECKING
@@ -43,6 +42,7 @@ from paddle.base.framework import (
     in_pir_mode,
 )
 
+from .async_io import _get_async_save_engine
 from .io_utils import (
     _is_file_path,
     _is_memory_buffer,
@@ -52,8 +52,17 @@ from .io_utils import (
     _pickle_loads_mac,
     _unpack_saved_dict,
 )
+from .stream_io import (
+    _is_stream_file,
+    _plan_stream,
+    _RawTensor,
+    _stream_load,
+    _stream_save,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Future
     from io import BytesIO
     from typing import Any, Literal, TypedDict
 
@@ -71,10 +80,12 @@ if TYPE_CHECKING:
         params_filename: NotRequired[str]
         keep_name_table: NotRequired[bool]
         return_numpy: NotRequired[bool]
+        keys: NotRequired[Sequence[Any]]
 
     class _SaveOptions(TypedDict):
         use_binary_format: NotRequired[bool]
         pickle_protocol: NotRequired[Literal[2, 3, 4]]
+        use_stream_format: NotRequired[bool]
 
 
 __all__ = []
@@ -83,12 +94,17 @@ async_save_queue = []
 
 def clear_async_save_task_queue() -> None:
     '''
-    wait until all async save task to be done.
+    wait until all async save task to be done, and raise the first error
+    of failed tasks if there is any.
     '''
+    error = None
     while len(async_save_queue) > 0:
-        task = async_save_queue.pop()
-        if task and task.is_alive():
-            task.join()
+        task = async_save_queue.pop(0)
+        exception = task.exception()
+        if error is None:
+            error = exception
+    if error is not None:
+        raise error
 
 
 def async_save(
@@ -97,13 +113,19 @@ def async_save(
     protocol: Literal[2, 3, 4] = 4,
     sync_other_task: bool = False,
     **configs: Unpack[_EmptyDict],
-) -> None:
+) -> Future[None]:
     '''
     async version of paddle.save.
     Note:
         currently only support dygraph mode.
     Note:
         any argument passed through configs will be overridden by default setting.
+    Note:
+        tensors of ``obj`` are copied to reusable host buffers (pinned memory for tensors on GPU) before it returns,
+        the copies from GPU do not block the calling thread, and the object is saved in a background thread.
+        The number of pending tasks is limited by environment variable ``PADDLE_ASYNC_SAVE_MAX_PENDING`` (default 2),
+        and the size of host buffers of pending tasks can be limited by ``PADDLE_ASYNC_SAVE_STAGING_MB`` .
+        When the limits are reached, it waits for pending tasks to be done.
     Args:
         obj(Object) : The object to be saved.
         path(str|BytesIO) : The path/buffer of the object to be saved.
@@ -112,6 +134,8 @@ def async_save(
                                  Default: 4
         sync_other_task(bool) : Determine whether to wait other async save task to be finished before this one be put in queue.
         **configs(dict, optional): compatible argument to paddle.save, but will be overridden by default setting.
+    Returns:
+        Future: the future of the save task, which can be used to wait for the task and get its error.
     Examples:
         .. code-block:: python
             :name: code-example-1
@@ -121,9 +145,11 @@ def async_save(
             layer_state_dict = emb.state_dict()
 
             # call paddle.async_save with the same style of paddle.save
-            paddle.async_save(layer_state_dict, "emb.pdparams")
+            future = paddle.async_save(layer_state_dict, "emb.pdparams")
             for i in range(10):
                 # do some calculations here
+            # wait for the task, raise error if it fails
+            future.result()
             # wait if any async_save task has not been done
             paddle.clear_async_task_queue()
     '''
@@ -136,31 +162,29 @@ def async_save(
             "configs are not supported in async mode, will be overridden by default settings."
         )
 
-    # TODO: make this part async
-    def move_state_dict_to_cpu(sd):
-        for k, v in sd.items():
-            if isinstance(v, dict):
-                move_state_dict_to_cpu(v)
-            elif isinstance(v, core.eager.Tensor):
-                sd[k] = v.pin_memory() if core.is_compiled_with_cuda() else v
-
-    if isinstance(obj, dict):
-        move_state_dict_to_cpu(obj)
-    elif isinstance(obj, core.eager.Tensor):
-        obj = obj.pin_memory() if core.is_compiled_with_cuda() else obj
-    else:
+    if not isinstance(obj, (dict, core.eager.Tensor)):
         # other types are currently not supported
         raise TypeError(
             f"currently async_save does not support this type: {type(obj)}"
         )
     if sync_other_task:
         clear_async_save_task_queue()
-    t = threading.Thread(target=save, args=(obj, path, protocol))
-    t.start()
-    async_save_queue.append(t)
+    # keep failed tasks to be reported by `clear_async_save_task_queue`
+    async_save_queue[:] = [
+        task
+        for task in async_save_queue
+        if not task.done() or task.exception() is not None
+    ]
+    task = _get_async_save_engine().submit(
+        obj, lambda snapshot: save(snapshot, path, protocol)
+    )
+    async_save_queue.append(task)
+    return task
 
 
-def _build_saved_state_dict(state_dict):
+def _build_saved_state_dict(state_dict, lazy=False):
+    # If lazy, tensors are kept in the result and copied to host when they
+    # are written by `_stream_save`.
     save_dict = {}
     name_table = {}
     for key, value in state_dict.items():
@@ -174,7 +198,10 @@ def _build_saved_state_dict(state_dict):
                     )
                 if value.is_dense() and value.place.is_custom_place():
                     value = paddle._C_ops.npu_identity(value, -1)
-                save_dict[key] = np.array(value.cpu())
+                if lazy:
+                    save_dict[key] = _RawTensor(value)
+                else:
+                    save_dict[key] = np.array(value.cpu())
             name_table[key] = value.name
         else:
             save_dict[key] = value
@@ -365,6 +392,7 @@ def _parse_load_config(configs):
         'params_filename',
         'keep_name_table',
         'return_numpy',
+        'keys',
     ]
 
     # input check
@@ -384,12 +412,17 @@ def _parse_load_config(configs):
     inner_config.params_filename = configs.get('params_filename', None)
     inner_config.keep_name_table = configs.get('keep_name_table', None)
     inner_config.return_numpy = configs.get('return_numpy', False)
+    inner_config.keys = configs.get('keys', None)
 
     return inner_config
 
 
 def _parse_save_config(configs):
-    supported_configs = ['use_binary_format', 'pickle_protocol']
+    supported_configs = [
+        'use_binary_format',
+        'pickle_protocol',
+        'use_stream_format',
+    ]
 
     # input check
     for key in configs:
@@ -406,6 +439,7 @@ def _parse_save_config(configs):
     inner_config = _SaveLoadConfig()
     inner_config.use_binary_format = configs.get('use_binary_format', False)
     inner_config.pickle_protocol = configs.get('pickle_protocol', None)
+    inner_config.use_stream_format = configs.get('use_stream_format', False)
 
     return inner_config
 
@@ -801,6 +835,11 @@ def save(
           use_binary_format(bool): When the saved object is static graph variable, you can specify ``use_binary_for_var``.
           If True, save the file in the c++ binary format when saving a single static graph variable; otherwise, save it in pickle format.
           Default: False
+          use_stream_format(bool): If True, save the object to a file in the stream format, in which tensors are written as raw
+          data after an index, and they are copied to host and written one by one in several threads, so the peak memory is about
+          the size of several tensors instead of the whole object. The file is loaded by ``paddle.load`` lazily, which only reads
+          tensors to be returned, see ``keys`` of ``paddle.load`` . Saving ``Program`` or to ``BytesIO`` is not supported.
+          Default: False
 
     Returns:
         None
@@ -932,8 +971,20 @@ def save(
             f"Type of `use_binary_format` should be bool, but received {type(config.use_binary_format)}."
         )
 
+    if not isinstance(config.use_stream_format, bool):
+        raise TypeError(
+            f"Type of `use_stream_format` should be bool, but received {type(config.use_stream_format)}."
+        )
+
+    if config.use_binary_format and config.use_stream_format:
+        raise ValueError(
+            "`use_binary_format` and `use_stream_format` can not be True at the same time."
+        )
+
     if config.use_binary_format:
         _save_binary_var(obj, path)
+    elif config.use_stream_format:
+        _save_stream(obj, path, protocol)
     else:
         # `protocol` need to be used, `pickle_protocol` is a deprecated arg.
         if config.pickle_protocol is not None:
@@ -962,6 +1013,61 @@ def save(
                 _pickle_save(obj, f, protocol)
 
 
+def _save_stream(obj, path, protocol):
+    if not _is_file_path(path):
+        raise ValueError(
+            f"`use_stream_format` only supports saving objects to file, but got {type(path)}"
+        )
+    if isinstance(obj, Program):
+        raise ValueError("`use_stream_format` does not support saving Program.")
+    if not isinstance(protocol, int):
+        raise ValueError(
+            f"The 'protocol' MUST be `int`, but received {type(protocol)}"
+        )
+    if protocol < 2 or protocol > 4:
+        raise ValueError(
+            f"Expected 1<'protocol'<5, but received protocol={protocol}"
+        )
+
+    if _is_state_dict(obj):
+        if len(obj) == 0:
+            warnings.warn("The input state dict is empty, no need to save.")
+        obj = _build_stream_state_dict(obj)
+
+    _stream_save(obj, path, protocol)
+
+
+def _build_stream_state_dict(state_dict):
+    # the same as `_legacy_save` and `_legacy_static_save`, values of state
+    # dict are loaded as ndarray
+    if in_dygraph_mode():
+        return _build_saved_state_dict(state_dict, lazy=True)
+    return {
+        key: (
+            _RawTensor(value)
+            if isinstance(value, (paddle.Tensor, core.LoDTensor))
+            else value
+        )
+        for key, value in state_dict.items()
+    }
+
+
+def _stream_state_dict_byte_ranges(state_dict, protocol=4):
+    """
+    Get the (offset, size) in bytes of each tensor of `state_dict` in the
+    file saved by `paddle.save(state_dict, path, use_stream_format=True)` ,
+    offsets are relative to the data section of the file.
+    """
+    obj = _build_stream_state_dict(state_dict)
+    _, pickler = _plan_stream(obj, protocol)
+    byte_ranges = {}
+    for key, value in obj.items():
+        if isinstance(value, _RawTensor):
+            payload = pickler.payload_of(value.value)
+            byte_ranges[key] = (payload.offset, payload.nbytes)
+    return byte_ranges
+
+
 def _legacy_save(obj, path, protocol=2):
     # 1. input check
     if not isinstance(obj, dict):
@@ -1062,6 +1168,8 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
             by default.
             (3) return_numpy(bool): If specified as True, return tensor as numpy.ndarray, otherwise return tensor as paddle.Tensor.
             Default False.
+            (4) keys(list): If the loaded object is a dict, only load the values of the given keys. For a file saved with
+            ``use_stream_format=True`` , only the tensors of these values are read from the file. Default None, load all values.
 
     Returns:
         Object(Object): a target object can be used in paddle
@@ -1184,6 +1292,9 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
 
     if _is_memory_buffer(path) or os.path.isfile(path):
         config = _parse_load_config(configs)
+        if _is_file_path(path) and _is_stream_file(path):
+            return _parse_loaded_object(_stream_load(path), config)
+
         exception_type = pickle.UnpicklingError
         try:
             with _open_file_buffer(path, 'rb') as f:
@@ -1197,40 +1308,7 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
                 else:
                     load_result = pickle.load(f, encoding='latin1')
 
-                # TODO(weixin):If `obj` is any object, the judgment condition should be more precise.
-                if isinstance(load_result, dict):
-                    load_result = _pack_loaded_dict(load_result)
-                    # paddle2.0: paddle.save/load
-                    if "StructuredToParameterName@@" in load_result:
-                        for key, name in load_result[
-                            "StructuredToParameterName@@"
-                        ].items():
-                            if isinstance(load_result[key], np.ndarray):
-                                load_result[key] = _ndarray_to_tensor(
-                                    load_result[key], config.return_numpy
-                                )
-                                # default name is "generatedxxx" which is set in Tensor init, if not set
-                                if not config.return_numpy and getattr(
-                                    load_result[key], "name", ""
-                                ):
-                                    load_result[key].name = name
-
-                        if (
-                            not config.keep_name_table
-                            and "StructuredToParameterName@@" in load_result
-                        ):
-                            del load_result["StructuredToParameterName@@"]
-                    else:
-                        # paddle2.1 static.save/load
-                        load_result = _parse_load_result(
-                            load_result, config.return_numpy
-                        )
-
-                else:
-                    load_result = _parse_load_result(
-                        load_result, config.return_numpy
-                    )
-
+                load_result = _parse_loaded_object(load_result, config)
         except exception_type as msg_pickle:
             try:
                 tensor, _ = _load_selected_rows(path)
@@ -1302,6 +1380,61 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
     return load_result
 
 
+def _select_loaded_keys(load_result, keys):
+    if not isinstance(load_result, dict):
+        raise ValueError(
+            f"`keys` can only be used when the loaded object is a dict, but got {type(load_result)}."
+        )
+    missing_keys = [key for key in keys if key not in load_result]
+    if missing_keys:
+        raise KeyError(
+            f"The keys {missing_keys} are not found in the loaded object."
+        )
+    selected = {key: load_result[key] for key in keys}
+    name_table = load_result.get("StructuredToParameterName@@")
+    if name_table is not None:
+        selected["StructuredToParameterName@@"] = {
+            key: name for key, name in name_table.items() if key in selected
+        }
+    return selected
+
+
+def _parse_loaded_object(load_result, config):
+    if isinstance(load_result, dict):
+        load_result = _pack_loaded_dict(load_result)
+    if config.keys is not None:
+        load_result = _select_loaded_keys(load_result, config.keys)
+
+    # TODO(weixin):If `obj` is any object, the judgment condition should be more precise.
+    if isinstance(load_result, dict):
+        # paddle2.0: paddle.save/load
+        if "StructuredToParameterName@@" in load_result:
+            for key, name in load_result["StructuredToParameterName@@"].items():
+                if isinstance(load_result[key], np.ndarray):
+                    load_result[key] = _ndarray_to_tensor(
+                        load_result[key], config.return_numpy
+                    )
+                    # default name is "generatedxxx" which is set in Tensor init, if not set
+                    if not config.return_numpy and getattr(
+                        load_result[key], "name", ""
+                    ):
+                        load_result[key].name = name
+
+            if (
+                not config.keep_name_table
+                and "StructuredToParameterName@@" in load_result
+            ):
+                del load_result["StructuredToParameterName@@"]
+        else:
+            # paddle2.1 static.save/load
+            load_result = _parse_load_result(load_result, config.return_numpy)
+
+    else:
+        load_result = _parse_load_result(load_result, config.return_numpy)
+
+    return load_result
+
+
 def _legacy_load(path, **configs):
     load_result = None
     config = _parse_load_config(configs)
@@ -0,0 +1,330 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# The stream format of `paddle.save(..., use_stream_format=True)`:
+#
+#   +--------------------------------------------------------------+
+#   | magic(8) | version(4) | reserved(4) | header length(8)       |
+#   +--------------------------------------------------------------+
+#   | header: pickled (index, skeleton)                            |
+#   +--------------------------------------------------------------+
+#   | padding to 64 bytes                                          |
+#   +--------------------------------------------------------------+
+#   | payload 0 | padding | payload 1 | padding | ...              |
+#   +--------------------------------------------------------------+
+#
+# The skeleton is the pickled object in which every tensor is replaced by
+# a persistent id pointing to an entry of the index, and each entry records
+# the kind, name, dtype, shape, offset and size of a raw payload. Offsets
+# are relative to the data section and aligned to 64 bytes. Sizes of
+# payloads are known from shapes and dtypes, so the header is written
+# first, then payloads are copied to host and written in chunks by several
+# threads, one tensor per thread at a time. When loading, the file is
+# mapped into memory and payloads are viewed as numpy arrays lazily, which
+# are only read from disk when they are converted to tensors.
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import pickle
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import paddle
+from paddle.base import core
+from paddle.base.data_feeder import convert_dtype
+
+__all__ = []
+
+_MAGIC = b'PDSTREAM'
+_VERSION = 1
+_ALIGNMENT = 64
+_CHUNK_SIZE = 64 << 20
+_PROLOGUE = struct.Struct('<8sIIQ')
+
+# payload loaded as a tuple of (name, ndarray), which is the same as
+# `paddle.Tensor` reduced by `_pickle_save`
+_KIND_TENSOR = 'tensor'
+# payload loaded as a ndarray
+_KIND_NDARRAY = 'ndarray'
+
+
+class _RawTensor:
+    # Marks a tensor to be saved and loaded as a ndarray, used for values
+    # of state dict which are saved as ndarray in legacy format.
+    def __init__(self, value):
+        self.value = value
+
+
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _numpy_dtype(dtype):
+    try:
+        return np.dtype(convert_dtype(dtype))
+    except TypeError:
+        return None
+
+
+def _to_numpy(value):
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, core.LoDTensor):
+        p = core.Place()
+        p.set_place(paddle.CPUPlace())
+        if value._place().is_custom_place():
+            return np.array(paddle._C_ops.npu_identity(value, -1)._copy(p))
+        return np.array(value._copy(p))
+    if value.is_dense() and value.place.is_custom_place():
+        value = paddle._C_ops.npu_identity(value, -1)
+    return np.array(value.cpu())
+
+
+class _Payload:
+    def __init__(self, value, kind, name, offset):
+        self.kind = kind
+        self.name = name
+        self.offset = offset
+        self.array = None
+        if isinstance(value, np.ndarray):
+            self.value = None
+            self.array = value
+            dtype, shape = value.dtype, value.shape
+        else:
+            self.value = value
+            if isinstance(value, core.LoDTensor):
+                dtype, shape = _numpy_dtype(value._dtype()), value.shape()
+            else:
+                dtype, shape = _numpy_dtype(value.dtype), value.shape
+            if dtype is None:
+                # dtype not supported by numpy, copy it to know the size
+                self.array = _to_numpy(value)
+                dtype = self.array.dtype
+        self.dtype = dtype
+        self.shape = tuple(shape)
+        self.nbytes = int(np.prod(self.shape, dtype='int64')) * dtype.itemsize
+
+    def entry(self):
+        return (
+            self.kind,
+            self.name,
+            self.dtype,
+            self.shape,
+            self.offset,
+            self.nbytes,
+        )
+
+    def numpy(self):
+        array = self.array if self.array is not None else _to_numpy(self.value)
+        if array.dtype != self.dtype or array.nbytes != self.nbytes:
+            raise ValueError(
+                f"The data of tensor '{self.name}' is expected to be "
+                f"{self.dtype} with {self.nbytes} bytes, but got "
+                f"{array.dtype} with {array.nbytes} bytes."
+            )
+        return np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+
+
+class _StreamPickler(pickle.Pickler):
+    def __init__(self, file, protocol):
+        super().__init__(file, protocol)
+        self.payloads = []
+        self._ids = {}
+        self._size = 0
+
+    def persistent_id(self, obj):
+        if isinstance(obj, _RawTensor):
+            value, kind, name = obj.value, _KIND_NDARRAY, None
+        elif isinstance(obj, core.eager.Tensor):
+            value, kind, name = obj, _KIND_TENSOR, obj.name
+        elif isinstance(obj, core.LoDTensor):
+            value, kind, name = obj, _KIND_NDARRAY, None
+        elif isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+            value, kind, name = obj, _KIND_NDARRAY, None
+        elif isinstance(obj, paddle.nn.Layer):
+            raise ValueError(
+                "paddle do not support saving `paddle.nn.Layer` object."
+            )
+        else:
+            return None
+
+        # the same tensor is saved once and shared after loading
+        key = (id(value), kind)
+        if key not in self._ids:
+            payload = _Payload(value, kind, name, self._size)
+            self._size = _align(self._size + payload.nbytes)
+            self._ids[key] = len(self.payloads)
+            self.payloads.append(payload)
+        return self._ids[key]
+
+    def payload_of(self, value, kind=_KIND_NDARRAY):
+        index = self._ids.get((id(value), kind))
+        return None if index is None else self.payloads[index]
+
+
+def _write_payload(fd, payload, data_start):
+    data = memoryview(payload.numpy())
+    offset = data_start + payload.offset
+    written = 0
+    while written < len(data):
+        chunk = data[written : written + _CHUNK_SIZE]
+        written += os.pwrite(fd, chunk, offset + written)
+    payload.array = None
+
+
+def _plan_stream(obj, protocol=4):
+    """
+    Pickle the header of `obj` in the stream format, the returned pickler
+    holds the payloads to be written, whose offsets only depend on the
+    order, dtypes and shapes of tensors in `obj`.
+    """
+    skeleton = io.BytesIO()
+    pickler = _StreamPickler(skeleton, protocol)
+    pickler.dump(obj)
+    header = pickle.dumps(
+        (
+            [payload.entry() for payload in pickler.payloads],
+            skeleton.getvalue(),
+        ),
+        protocol=protocol,
+    )
+    return header, pickler
+
+
+def _stream_save(obj, path, protocol=4, num_workers=None):
+    """
+    Save `obj` to `path` in the stream format. Tensors in `obj` are copied
+    to host one by one when they are written, so the peak memory is about
+    `num_workers` tensors instead of the whole object.
+    """
+    header, pickler = _plan_stream(obj, protocol)
+    payloads = pickler.payloads
+    data_start = _align(_PROLOGUE.size + len(header))
+
+    with open(path, 'wb') as f:
+        f.write(_PROLOGUE.pack(_MAGIC, _VERSION, 0, len(header)))
+        f.write(header)
+        f.write(b'\0' * (data_start - f.tell()))
+        if payloads:
+            last = payloads[-1]
+            f.truncate(data_start + last.offset + last.nbytes)
+        f.flush()
+
+        if not hasattr(os, 'pwrite'):
+            for payload in payloads:
+                f.seek(data_start + payload.offset)
+                f.write(memoryview(payload.numpy()))
+                payload.array = None
+            return
+
+        if num_workers is None:
+            num_workers = min(8, os.cpu_count() or 1)
+        if num_workers <= 1 or len(payloads) <= 1:
+            for payload in payloads:
+                _write_payload(f.fileno(), payload, data_start)
+            return
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            # consume results to raise the exception in writing
+            list(
+                executor.map(
+                    lambda payload: _write_payload(
+                        f.fileno(), payload, data_start
+                    ),
+                    payloads,
+                )
+            )
+
+
+def _is_stream_file(path):
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(_MAGIC)) == _MAGIC
+
+
+class _StreamUnpickler(pickle.Unpickler):
+    def __init__(self, file, entries, buffer, data_start):
+        super().__init__(file, encoding='latin1')
+        self._entries = entries
+        self._buffer = buffer
+        self._data_start = data_start
+        self._loaded = {}
+
+    def persistent_load(self, pid):
+        if pid not in self._loaded:
+            kind, name, dtype, shape, offset, nbytes = self._entries[pid]
+            if nbytes == 0:
+                array = np.empty(shape, dtype=dtype)
+            else:
+                # a view of the mapped file, data is read when it is used
+                array = np.frombuffer(
+                    self._buffer,
+                    dtype=dtype,
+                    count=nbytes // dtype.itemsize,
+                    offset=self._data_start + offset,
+                ).reshape(shape)
+            self._loaded[pid] = (name, array) if kind == _KIND_TENSOR else array
+        return self._loaded[pid]
+
+
+def _read_header_size(f, path):
+    magic, version, _, header_size = _PROLOGUE.unpack(f.read(_PROLOGUE.size))
+    if magic != _MAGIC:
+        raise ValueError(f"The file {path} is not saved in stream format.")
+    if version > _VERSION:
+        raise ValueError(
+            f"The version of stream format of file {path} is {version}, "
+            f"which is not supported, the max supported version is "
+            f"{_VERSION}."
+        )
+    return header_size
+
+
+def _map_stream_data(path):
+    """
+    Map the file saved by `_stream_save` into memory without reading the
+    header, returns the buffer and the start of the data section, which
+    payload offsets are relative to.
+    """
+    with open(path, 'rb') as f:
+        header_size = _read_header_size(f, path)
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    return buffer, _align(_PROLOGUE.size + header_size)
+
+
+def _stream_load(path):
+    """
+    Load the object saved by `_stream_save`, in which tensors are loaded as
+    numpy arrays mapped to the file, see `_StreamPickler` for the kinds of
+    tensors. The arrays are writable, and writing them does not modify the
+    file.
+    """
+    with open(path, 'rb') as f:
+        header_size = _read_header_size(f, path)
+        entries, skeleton = pickle.loads(f.read(header_size))
+        buffer = None
+        if entries:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data_start = _align(_PROLOGUE.size + header_size)
+    unpickler = _StreamUnpickler(
+        io.BytesIO(skeleton), entries, buffer, data_start
+    )
+    return unpickler.load()
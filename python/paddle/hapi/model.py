@@ -127,6 +127,21 @@ def _all_gather(x):
     return output
 
 
+def _detach_outputs(outputs):
+    return [
+        o.detach() if isinstance(o, paddle.Tensor) else o
+        for o in to_list(outputs)
+    ]
+
+
+def _metric_states_mergeable(metrics):
+    # metrics overriding `get_states` can be computed locally on each rank
+    # and reduced once at the end of epoch
+    return all(
+        type(metric).get_states is not Metric.get_states for metric in metrics
+    )
+
+
 def wait_server_ready(endpoints):
     assert not isinstance(endpoints, str)
     while True:
@@ -380,6 +395,14 @@ class StaticGraphAdapter:
         self.mode = 'eval'
         return self._run(inputs, labels)
 
+    def reduce_metrics(self):
+        # outputs and labels are gathered in program in static graph mode
+        return False
+
+    def flush_metrics(self):
+        # metrics are updated with fetched numpy states in each step
+        pass
+
     def predict_batch(self, inputs):
         self.mode = 'test'
         return self._run(inputs, None)
@@ -816,6 +839,16 @@ class DynamicGraphAdapter:
             'test_batch': 0,
         }
 
+        # local sample count and local non-padding sample number of
+        # current eval epoch, when metric states are reduced at the end
+        self._local_eval_count = 0
+        self._local_eval_valid = None
+
+        # if True, train_batch keeps losses and metric inputs on device,
+        # and metrics are updated in `flush_metrics`
+        self._defer_sync = False
+        self._pending_metric_outs = []
+
         self._input_info = None
         self._amp_level = "O0"
         self._amp_configs = {}
@@ -887,6 +920,22 @@ class DynamicGraphAdapter:
                 self.model._optimizer.minimize(final_loss)
                 self.model.network.clear_gradients()
 
+        if self._defer_sync:
+            # no device to host copy in this step, losses are returned as
+            # tensors and metric inputs are kept until `flush_metrics`
+            self._pending_metric_outs.append(
+                [
+                    _detach_outputs(
+                        metric.compute(*(to_list(outputs) + labels))
+                    )
+                    for metric in self.model._metrics
+                ]
+            )
+            losses = [l.detach() for l in losses]
+            if len(self.model._metrics) > 0:
+                return losses, [None] * len(self.model._metrics)
+            return losses
+
         metrics = []
         for metric in self.model._metrics:
             metric_outs = metric.compute(*(to_list(outputs) + labels))
@@ -921,7 +970,24 @@ class DynamicGraphAdapter:
             losses = self.model._loss(*(to_list(outputs) + labels))
             losses = to_list(losses)
 
-        if self._nranks > 1:
+        all_padding = False
+        if self._nranks > 1 and _metric_states_mergeable(self.model._metrics):
+            # metrics are updated with local samples, and the states are
+            # reduced by `reduce_metrics` at the end of epoch, only the
+            # padding samples of DistributedBatchSampler are cut off here
+            outputs = to_list(outputs)
+            if self._local_eval_valid is None:
+                self._local_eval_valid = self._num_local_valid_samples()
+            if self._local_eval_valid is not None:
+                samples = outputs[0].shape[0]
+                keep = self._local_eval_valid - self._local_eval_count
+                keep = min(max(keep, 0), samples)
+                self._local_eval_count += samples
+                if keep < samples:
+                    outputs = [o[:keep] for o in outputs]
+                    labels = [l[:keep] for l in labels]
+                all_padding = keep == 0
+        elif self._nranks > 1:
             outputs = [_all_gather(o) for o in to_list(outputs)]
             labels = [_all_gather(l) for l in labels]
 
@@ -949,6 +1015,9 @@ class DynamicGraphAdapter:
 
         metrics = []
         for metric in self.model._metrics:
+            if all_padding:
+                metrics.append(metric.accumulate())
+                continue
             # cut off padding value.
             metric_outs = metric.compute(*(to_list(outputs) + labels))
             m = metric.update(*[to_numpy(m) for m in to_list(metric_outs)])
@@ -961,6 +1030,34 @@ class DynamicGraphAdapter:
         else:
             return metrics
 
+    def _num_local_valid_samples(self):
+        data_loader = self.model._test_dataloader
+        if not isinstance(data_loader, DataLoader) or not isinstance(
+            data_loader.batch_sampler, DistributedBatchSampler
+        ):
+            return None
+        sampler = data_loader.batch_sampler
+        positions = sampler._local_positions()
+        return int(np.count_nonzero(positions < len(sampler.dataset)))
+
+    def flush_metrics(self):
+        # update metrics with the inputs kept by deferred train steps
+        pending, self._pending_metric_outs = self._pending_metric_outs, []
+        for step_outs in pending:
+            for metric, metric_outs in zip(self.model._metrics, step_outs):
+                metric.update(*[to_numpy(m) for m in metric_outs])
+
+    def reduce_metrics(self):
+        self._local_eval_count = 0
+        self._local_eval_valid = None
+        if self._nranks < 2 or not _metric_states_mergeable(
+            self.model._metrics
+        ):
+            return False
+        for metric in self.model._metrics:
+            metric.all_reduce()
+        return True
+
     def predict_batch(self, inputs):
         self.model.network.eval()
         self.mode = 'test'
@@ -1212,6 +1309,10 @@ class Model:
         self._is_shape_inferred = False
         self._test_dataloader = None
         self.stop_training = False
+        # train steps between host synchronizations in fit, and the log
+        # frequency at which losses and metrics are also fetched
+        self._sync_interval = 1
+        self._sync_log_freq = None
 
         if not in_dynamic_mode():
             if not isinstance(inputs, (list, tuple, dict, Input)):
@@ -1822,6 +1923,7 @@ class Model:
         callbacks: Sequence[Callback] | Callback | None = None,
         accumulate_grad_batches: int = 1,
         num_iters: int | None = None,
+        sync_interval: int = 1,
     ) -> None:
         """
 
@@ -1870,6 +1972,15 @@ class Model:
             num_iters (int|None, optional): The number of iterations to evaluate the model.
                 If None, evaluate on whole input dataset, otherwise, evaluate `num_iters` times.
                 Default: None.
+            sync_interval (int, optional): The number of training steps between
+                synchronizations of device and host in dynamic graph mode. Losses and
+                the inputs of metrics are kept as device tensors, and are only fetched
+                to update the training logs and metrics every `sync_interval` steps,
+                at the steps logged by `log_freq` when `verbose` is not 0, and at the
+                end of epoch, so the data loading and H2D copy of next batches can
+                overlap with the computation. The logs passed to callbacks in other
+                steps keep the values of the last synchronized step. Default: 1,
+                which synchronizes in every step.
 
         Returns:
             None
@@ -1958,6 +2069,9 @@ class Model:
                 ...
         """
         assert train_data is not None, "train_data must be given!"
+        assert (
+            isinstance(sync_interval, int) and sync_interval > 0
+        ), "sync_interval must be a positive integer!"
 
         if isinstance(batch_size, (tuple, list)) and all(
             isinstance(x, int) for x in batch_size
@@ -2032,6 +2146,9 @@ class Model:
         if any(isinstance(k, EarlyStopping) for k in cbks) and not do_eval:
             warnings.warn("EarlyStopping needs validation data.")
 
+        self._sync_interval = sync_interval
+        self._sync_log_freq = log_freq if verbose else None
+
         cbks.on_begin('train')
         for epoch in range(epochs):
             cbks.on_epoch_begin(epoch)
@@ -2053,6 +2170,8 @@ class Model:
 
         cbks.on_end('train', logs)
         self._test_dataloader = None
+        self._sync_interval = 1
+        self._sync_log_freq = None
 
     def evaluate(
         self,
@@ -2382,6 +2501,11 @@ class Model:
         logs={},
     ):
         outputs = []
+        defer_sync = (
+            mode == 'train' and self._sync_interval > 1 and in_dynamic_mode()
+        )
+        self._adapter._defer_sync = defer_sync
+        synced = True
         for step, data in enumerate(data_loader):
             # Data might come from different types of data_loader and have
             # different format, as following:
@@ -2416,21 +2540,9 @@ class Model:
 
                 outs = getattr(self, mode + '_batch')(*_inputs)
 
-                if self._metrics and self._loss:
-                    metrics = [[float(l) for l in outs[0]]]
-                elif self._loss:
-                    metrics = [[float(l) for l in outs]]
-                else:
-                    metrics = []
-
-                # metrics
-                for metric in self._metrics:
-                    res = metric.accumulate()
-                    metrics.extend(to_list(res))
-
-                assert len(self._metrics_name()) == len(metrics)
-                for k, v in zip(self._metrics_name(), metrics):
-                    logs[k] = v
+                synced = not defer_sync or self._is_sync_step(step)
+                if synced:
+                    self._update_logs(outs, logs)
             else:
                 if self._inputs is not None:
                     outs = self.predict_batch(data[: len(self._inputs)])
@@ -2457,6 +2569,20 @@ class Model:
                     self.stop_training = True
                     del self.num_iters
                     break
+
+        self._adapter._defer_sync = False
+        if not synced:
+            # fetch the steps after the last synchronization
+            self._update_logs(outs, logs)
+
+        if mode == 'eval' and self._adapter.reduce_metrics():
+            # metrics of the epoch over all ranks
+            metrics = []
+            for metric in self._metrics:
+                metrics.extend(to_list(metric.accumulate()))
+            names = self._metrics_name()[1 if self._loss else 0 :]
+            for k, v in zip(names, metrics):
+                logs[k] = v
         self._reset_metrics()
 
         if mode == 'predict':
@@ -2572,6 +2698,32 @@ class Model:
 
         return out_specs
 
+    def _is_sync_step(self, step):
+        step += 1
+        return step % self._sync_interval == 0 or (
+            self._sync_log_freq is not None and step % self._sync_log_freq == 0
+        )
+
+    def _update_logs(self, outs, logs):
+        # fetch losses and metrics of the step into logs, which
+        # synchronizes device and host
+        self._adapter.flush_metrics()
+        if self._metrics and self._loss:
+            metrics = [[float(l) for l in outs[0]]]
+        elif self._loss:
+            metrics = [[float(l) for l in outs]]
+        else:
+            metrics = []
+
+        # metrics
+        for metric in self._metrics:
+            res = metric.accumulate()
+            metrics.extend(to_list(res))
+
+        assert len(self._metrics_name()) == len(metrics)
+        for k, v in zip(self._metrics_name(), metrics):
+            logs[k] = v
+
     def _reset_metrics(self):
         for metric in self._metrics:
             metric.reset()
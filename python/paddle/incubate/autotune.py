@@ -34,6 +34,9 @@ if TYPE_CHECKING:
     class _Dataloader(TypedDict):
         enable: bool
         tuning_steps: int
+        adaptive: NotRequired[bool]
+        max_num_workers: NotRequired[int]
+        max_prefetch_factor: NotRequired[int]
 
     class _ConfigKernel(TypedDict):
         kernel: NotRequired[_Kernel]
@@ -67,6 +70,15 @@ def set_config(config: _ConfigKernel | str | None = None) -> None:
     the origin dataloader setting. Tuning parameters are as follows:
 
     - enable(bool): Whether to enable dataloader tuning.
+    - adaptive(bool): Whether to tune active num_workers and prefetch_factor
+      continuously while iterating data, according to the time waiting for
+      data and the depth of prefetch queue. Only map-style dataset with
+      num_workers > 0 is supported. The decisions can be got by
+      :code:`DataLoader.autotune_metrics`. Default: False.
+    - max_num_workers(int): Max num_workers of adaptive tuning.
+      Default: half of cpu count.
+    - max_prefetch_factor(int): Max prefetch_factor of adaptive tuning.
+      Default: 2 times of the prefetch_factor of DataLoader.
 
     Args:
         config (dict|str|None, optional): Configuration for auto-tuning. If it is a
@@ -179,3 +191,15 @@ def set_config(config: _ConfigKernel | str | None = None) -> None:
                     "The `tuning_steps` should be int. Use default parameter instead."
                 )
                 paddle.io.reader.set_autotune_config(use_autotune)
+        if "adaptive" in dataloader_config:
+            if isinstance(dataloader_config['adaptive'], bool):
+                paddle.io.reader.set_adaptive_autotune_config(
+                    dataloader_config['adaptive'],
+                    dataloader_config.get('max_num_workers'),
+                    dataloader_config.get('max_prefetch_factor'),
+                )
+            else:
+                warnings.warn(
+                    "The auto-tuning configuration of the dataloader is incorrect."
+                    "The `adaptive` should be bool. Use default parameter instead."
+                )
@@ -22,9 +22,12 @@ from .dataloader import (
     Dataset,
     DistributedBatchSampler,
     IterableDataset,
+    PackedRecordDataset,
+    PackedRecordWriter,
     RandomSampler,
     Sampler,
     SequenceSampler,
+    ShardedIterableDataset,
     Subset,
     SubsetRandomSampler,
     TensorDataset,
@@ -52,4 +55,7 @@ __all__ = [
     'Subset',
     'SubsetRandomSampler',
     'ConcatDataset',
+    'PackedRecordWriter',
+    'PackedRecordDataset',
+    'ShardedIterableDataset',
 ]
@@ -26,6 +26,10 @@ from .dataset import (  # noqa: F401
     TensorDataset,
     random_split,
 )
+from .packed_dataset import (  # noqa: F401
+    PackedRecordDataset,
+    PackedRecordWriter,
+)
 from .sampler import (  # noqa: F401
     RandomSampler,
     Sampler,
@@ -33,4 +37,5 @@ from .sampler import (  # noqa: F401
     SubsetRandomSampler,
     WeightedRandomSampler,
 )
+from .sharded_dataset import ShardedIterableDataset  # noqa: F401
 from .worker import get_worker_info  # noqa: F401
@@ -0,0 +1,142 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+
+
+class _AdaptiveAutoTuner:
+    """
+    Online tuner of active worker number and prefetch factor for
+    multi-process DataLoader.
+
+    The tuner is fed with the time the consumer waits for each batch and
+    the depth of the blocking queue when the batch is requested. Every
+    :attr:`interval` batches it checks the window:
+
+    1. if the consumer waits for data for more than :attr:`grow_ratio` of
+       the wall time, the input pipeline is the bottleneck, one more worker
+       is activated, or prefetch factor is increased if all workers are
+       active.
+    2. if the consumer almost never waits and the blocking queue is almost
+       full for 2 windows in a row, the input pipeline is over provisioned,
+       prefetch factor is decreased first, then one worker is deactivated.
+
+    The tuner is kept by DataLoader, so the tuned setting is inherited by
+    iterators of following epochs, and each decision is recorded in
+    :attr:`metrics`.
+
+    Args:
+        num_workers(int): initial active worker number.
+        max_num_workers(int): max active worker number, which is also the
+            number of started worker processes.
+        prefetch_factor(int): initial prefetch factor.
+        max_prefetch_factor(int): max prefetch factor.
+        interval(int): batch number of each tuning window. Default 50.
+        grow_ratio(float): wait time ratio to grow input pipeline.
+            Default 0.1.
+        shrink_ratio(float): wait time ratio to shrink input pipeline.
+            Default 0.01.
+    """
+
+    def __init__(
+        self,
+        num_workers,
+        max_num_workers,
+        prefetch_factor,
+        max_prefetch_factor,
+        interval=50,
+        grow_ratio=0.1,
+        shrink_ratio=0.01,
+    ):
+        assert 0 < num_workers <= max_num_workers
+        assert 0 < prefetch_factor <= max_prefetch_factor
+        self.num_workers = num_workers
+        self.max_num_workers = max_num_workers
+        self.prefetch_factor = prefetch_factor
+        self.max_prefetch_factor = max_prefetch_factor
+        self._min_prefetch_factor = prefetch_factor
+        self._interval = interval
+        self._grow_ratio = grow_ratio
+        self._shrink_ratio = shrink_ratio
+
+        self.metrics = []
+        self._steps = 0
+        self._saturated_windows = 0
+        self.reset_window()
+
+    def reset_window(self):
+        self._window_start = time.perf_counter()
+        self._window_steps = 0
+        self._window_wait = 0.0
+        self._window_depth = 0.0
+
+    def step(self, wait_time, queue_depth, queue_capacity):
+        """
+        Record one batch. Return True if num_workers or prefetch_factor
+        is changed.
+        """
+        self._steps += 1
+        self._window_steps += 1
+        self._window_wait += wait_time
+        self._window_depth += queue_depth / max(queue_capacity, 1)
+        if self._window_steps < self._interval:
+            return False
+
+        elapsed = max(time.perf_counter() - self._window_start, 1e-9)
+        wait_ratio = self._window_wait / elapsed
+        depth_ratio = self._window_depth / self._window_steps
+        self.reset_window()
+
+        num_workers, prefetch_factor = self.num_workers, self.prefetch_factor
+        if wait_ratio > self._grow_ratio:
+            self._saturated_windows = 0
+            if self.num_workers < self.max_num_workers:
+                self.num_workers += 1
+            elif self.prefetch_factor < self.max_prefetch_factor:
+                self.prefetch_factor += 1
+        elif wait_ratio < self._shrink_ratio and depth_ratio > 0.9:
+            self._saturated_windows += 1
+            if self._saturated_windows >= 2:
+                self._saturated_windows = 0
+                if self.prefetch_factor > self._min_prefetch_factor:
+                    self.prefetch_factor -= 1
+                elif self.num_workers > 1:
+                    self.num_workers -= 1
+        else:
+            self._saturated_windows = 0
+
+        changed = (
+            num_workers != self.num_workers
+            or prefetch_factor != self.prefetch_factor
+        )
+        self.metrics.append(
+            {
+                'step': self._steps,
+                'wait_ratio': wait_ratio,
+                'queue_depth_ratio': depth_ratio,
+                'num_workers': self.num_workers,
+                'prefetch_factor': self.prefetch_factor,
+                'changed': changed,
+            }
+        )
+        if changed:
+            logging.info(
+                f"DataLoader adaptive autotune at step {self._steps}: "
+                f"wait_ratio {wait_ratio:.4f}, queue_depth_ratio "
+                f"{depth_ratio:.4f}, num_workers {num_workers} -> "
+                f"{self.num_workers}, prefetch_factor {prefetch_factor} -> "
+                f"{self.prefetch_factor}"
+            )
+        return changed
@@ -14,8 +14,11 @@
 
 from __future__ import annotations
 
+import itertools
 import math
 from typing import (
+    TYPE_CHECKING,
+    Any,
     Iterable,
     Iterator,
     Sequence,
@@ -27,6 +30,9 @@ import numpy as np
 from .dataset import IterableDataset
 from .sampler import RandomSampler, Sampler, SequenceSampler
 
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
 
 class BatchSampler(Sampler[Sequence[int]]):
     """
@@ -155,15 +161,42 @@ class BatchSampler(Sampler[Sequence[int]]):
         # in auto-parallel
         self._acc_steps = 1
 
+        self._num_batches_yielded = 0
+        self._resume_state = None
+
+    def _sampler_iter(
+        self, state: dict[str, Any] | None, num_skip_samples: int
+    ) -> Iterator[int]:
+        if state is None:
+            return iter(self.sampler)
+        sampler_state = state.get('sampler')
+        if (
+            sampler_state is not None
+            and 'num_samples_yielded' in sampler_state
+            and hasattr(self.sampler, 'load_state_dict')
+        ):
+            # sampler skips the consumed indices by itself, which also
+            # restores the random state of RandomSampler
+            sampler_state = dict(sampler_state)
+            sampler_state['num_samples_yielded'] = num_skip_samples
+            self.sampler.load_state_dict(sampler_state)
+            return iter(self.sampler)
+        return itertools.islice(iter(self.sampler), num_skip_samples, None)
+
     def __iter__(self) -> Iterator[list[int]]:
         local_batch_size = self.batch_size * self._acc_steps
+        state, self._resume_state = self._resume_state, None
+        start = state['num_batches_yielded'] if state is not None else 0
+        self._num_batches_yielded = start
         batch_indices = []
-        for idx in self.sampler:
+        for idx in self._sampler_iter(state, start * local_batch_size):
             batch_indices.append(idx)
             if len(batch_indices) == local_batch_size:
+                self._num_batches_yielded += 1
                 yield batch_indices
                 batch_indices = []
         if not self.drop_last and len(batch_indices) > 0:
+            self._num_batches_yielded += 1
             yield batch_indices
 
     def __len__(self) -> int:
@@ -172,6 +205,49 @@ class BatchSampler(Sampler[Sequence[int]]):
         num_samples += int(not self.drop_last) * (local_batch_size - 1)
         return num_samples // local_batch_size
 
+    def state_dict(self) -> dict[str, Any]:
+        """
+        Get the state of batch sampler, which contains the number of
+        batches yielded in current epoch and the state of the sampler if
+        the sampler is stateful.
+
+        Returns:
+            dict: the state of batch sampler.
+
+        Examples:
+            .. code-block:: python
+
+                >>> from paddle.io import BatchSampler, RandomSampler
+
+                >>> sampler = RandomSampler(list(range(100)))
+                >>> bs = BatchSampler(sampler=sampler, batch_size=8)
+                >>> it = iter(bs)
+                >>> first = [next(it) for _ in range(3)]
+                >>> state = bs.state_dict()
+
+                >>> bs.load_state_dict(state)
+                >>> rest = list(bs)
+                >>> len(first) + len(rest)
+                13
+        """
+        sampler_state = None
+        if hasattr(self.sampler, 'state_dict'):
+            sampler_state = self.sampler.state_dict()
+        return {
+            'num_batches_yielded': self._num_batches_yielded,
+            'sampler': sampler_state,
+        }
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        """
+        Load the state of batch sampler, the next iteration will resume
+        from the batch after the last batch yielded when the state is saved.
+
+        Args:
+            state_dict(dict): the state got by :code:`state_dict`.
+        """
+        self._resume_state = dict(state_dict)
+
 
 class _InfiniteIterableSampler(Sampler[Sequence[None]]):
     dataset: IterableDataset
@@ -304,63 +380,85 @@ class DistributedBatchSampler(BatchSampler):
         # in auto-parallel
         self._acc_steps = 1
 
-    def __iter__(self) -> Iterator[list[int]]:
-        local_batch_size = self.batch_size * self._acc_steps
-        num_samples = len(self.dataset)
-        indices = np.arange(num_samples).tolist()
-        # add extra samples to make it evenly divisible
-        padding_size = self.total_size - len(indices)
-        if padding_size <= len(indices):
-            indices += indices[:padding_size]
-        else:
-            indices += (indices * math.ceil(padding_size / len(indices)))[
-                :padding_size
+        # epoch used by current iteration, None if iteration not started
+        self._iter_epoch = None
+        self._num_batches_yielded = 0
+        self._resume_state = None
+
+    def _local_positions(self) -> npt.NDArray[np.int64]:
+        # positions of this rank's samples in the padded epoch indices,
+        # positions not less than len(dataset) hold padded samples
+        if self.total_size == 0:
+            return np.zeros([0], dtype=np.int64)
+        round_size = self.batch_size * self.nranks
+        last_batch_size = self.total_size % round_size
+        assert last_batch_size % self.nranks == 0
+        last_local_batch_size = last_batch_size // self.nranks
+        num_rounds = (self.total_size - last_batch_size) // round_size
+        return np.concatenate(
+            [
+                (
+                    np.arange(num_rounds, dtype=np.int64)[:, None] * round_size
+                    + self.local_rank * self.batch_size
+                    + np.arange(self.batch_size, dtype=np.int64)[None, :]
+                ).reshape([-1]),
+                num_rounds * round_size
+                + self.local_rank * last_local_batch_size
+                + np.arange(last_local_batch_size, dtype=np.int64),
             ]
+        )
+
+    def _local_indices(self) -> npt.NDArray[np.int64]:
+        # NOTE: sample indices of this rank are computed with numpy arrays
+        # instead of python lists, the order is the same as the following
+        # steps, which builds the whole epoch indices:
+        #   1. pad arange(len(dataset)) to total_size by repeating it
+        #   2. shuffle the padded indices with RandomState(epoch)
+        #   3. take batch_size indices for each rank in turn, and split the
+        #      last incomplete round of batches evenly among ranks
+        num_samples = len(self.dataset)
+        if self.total_size == 0:
+            return np.zeros([0], dtype=np.int64)
+        positions = self._local_positions()
 
-        assert len(indices) == self.total_size
         if self.shuffle:
+            # padded epoch indices are only needed to be generated when
+            # shuffling, otherwise the index at each position is known
+            indices = np.arange(self.total_size, dtype=np.int64) % num_samples
             np.random.RandomState(self.epoch).shuffle(indices)
             self.epoch += 1
-
-        # subsample
-        def _get_indices_by_batch_size(indices):
-            subsampled_indices = []
-            last_batch_size = self.total_size % (self.batch_size * self.nranks)
-            assert last_batch_size % self.nranks == 0
-            last_local_batch_size = last_batch_size // self.nranks
-
-            for i in range(
-                self.local_rank * self.batch_size,
-                len(indices) - last_batch_size,
-                self.batch_size * self.nranks,
-            ):
-                subsampled_indices.extend(indices[i : i + self.batch_size])
-
-            indices = indices[len(indices) - last_batch_size :]
-            subsampled_indices.extend(
-                indices[
-                    self.local_rank
-                    * last_local_batch_size : (self.local_rank + 1)
-                    * last_local_batch_size
-                ]
-            )
-
-            return subsampled_indices
-
-        if self.nranks > 1:
-            indices = _get_indices_by_batch_size(indices)
+            indices = indices[positions]
+        else:
+            indices = positions % num_samples
 
         assert len(indices) == self.num_samples
-        _sample_iter = iter(indices)
+        return indices
 
-        batch_indices = []
-        for idx in _sample_iter:
-            batch_indices.append(idx)
-            if len(batch_indices) == local_batch_size:
-                yield batch_indices
-                batch_indices = []
-        if not self.drop_last and len(batch_indices) > 0:
-            yield batch_indices
+    def __iter__(self) -> Iterator[list[int]]:
+        local_batch_size = self.batch_size * self._acc_steps
+        state, self._resume_state = self._resume_state, None
+        start = 0
+        if state is not None:
+            self.epoch = state['epoch']
+            start = state['num_batches_yielded']
+        self._iter_epoch = self.epoch
+        self._num_batches_yielded = start
+        indices = self._local_indices()
+
+        # resuming only slices the local indices, no index is regenerated
+        num_batches = len(indices) // local_batch_size
+        for i in range(start, num_batches):
+            self._num_batches_yielded += 1
+            yield indices[
+                i * local_batch_size : (i + 1) * local_batch_size
+            ].tolist()
+        if (
+            not self.drop_last
+            and start <= num_batches
+            and len(indices) > num_batches * local_batch_size
+        ):
+            self._num_batches_yielded += 1
+            yield indices[num_batches * local_batch_size :].tolist()
 
     def __len__(self) -> int:
         local_batch_size = self.batch_size * self._acc_steps
@@ -406,3 +504,20 @@ class DistributedBatchSampler(BatchSampler):
                 ...     sampler.set_epoch(epoch)
         """
         self.epoch = epoch
+        self._iter_epoch = None
+        self._num_batches_yielded = 0
+
+    def state_dict(self) -> dict[str, Any]:
+        """
+        Get the state of sampler, which contains the epoch used to shuffle
+        indices of current iteration and the number of batches yielded.
+
+        Returns:
+            dict: the state of sampler.
+        """
+        return {
+            'epoch': (
+                self.epoch if self._iter_epoch is None else self._iter_epoch
+            ),
+            'num_batches_yielded': self._num_batches_yielded,
+        }
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import concurrent.futures
+import copy
 import itertools
 import logging
+import math
 import os
 import queue
 import sys
@@ -40,10 +44,19 @@ from ..multiprocess_utils import (
 from .batch_sampler import _InfiniteIterableSampler
 from .collate import default_collate_fn, default_convert_fn
 from .flat import _flatten_batch, _restore_batch
+from .shm_ring import (
+    _MainShmRing,
+    _ShmRingBatch,
+    _ShmRingRelease,
+    _use_shm_ring,
+)
 from .worker import (
+    WorkerInfo,
     _DatasetKind,
+    _iterable_dataset_state,
     _IterableDatasetStopIteration,
     _ResumeIteration,
+    _thread_worker_info,
     _worker_loop,
     _WorkerException,
 )
@@ -65,6 +78,36 @@ from .worker import (
 # instance and will cause memory leak
 _loader = None
 
+# interval for DataLoader thread to check exit when waiting for batches
+# fetched by worker threads
+_THREAD_STATUS_CHECK_INTERVAL = 0.5
+
+
+def _iterator_state_dict(batch_sampler, progress):
+    num_batches = progress['num_batches_yielded']
+    sampler_state = None
+    if batch_sampler is not None and hasattr(batch_sampler, 'state_dict'):
+        sampler_state = batch_sampler.state_dict()
+        # batch sampler is ahead of the consumer because of prefetching,
+        # resume from the consumed batches instead
+        sampler_state['num_batches_yielded'] = num_batches
+    return {
+        'num_batches_yielded': num_batches,
+        'sampler_state': sampler_state,
+    }
+
+
+def _merge_dataset_state(merged, state):
+    # states of IterableDataset sent from different workers are merged
+    # key by key, e.g. cursors of different workers
+    merged = {} if merged is None else merged
+    for key, value in state.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
 
 def _clear_loader():
     global _loader
@@ -107,7 +150,12 @@ class _DataLoaderIterBase:
         self._dataset_kind = loader.dataset_kind
         self._pin_memory = loader.pin_memory
 
-        self._sampler_iter = iter(self._index_sampler)
+        # progress is shared with DataLoader, so DataLoader.state_dict can
+        # be called after the iterator is released, e.g. break in for loop
+        self._progress = {'num_batches_yielded': 0}
+        loader._progress = self._progress
+        self._load_dataset_state(loader._resume_state)
+        self._sampler_iter = self._init_sampler_iter(loader._resume_state)
         if self._auto_collate_batch:
             self._collate_fn = loader.collate_fn or default_collate_fn
         else:
@@ -132,6 +180,57 @@ class _DataLoaderIterBase:
             else:
                 return _InfiniteIterableSampler(self._dataset, 1)
 
+    def _load_dataset_state(self, resume_state=None):
+        # NOTE: state of IterableDataset is loaded when iterator is created
+        #       instead of in DataLoader.load_state_dict, so it is consumed
+        #       by the iteration of this iterator only
+        if resume_state is None or resume_state.get('dataset_state') is None:
+            return
+        self._dataset.load_state_dict(resume_state['dataset_state'])
+
+    def _init_sampler_iter(self, resume_state=None):
+        # NOTE: only the number of consumed batches is recorded in the
+        # state, batches prefetched by the blocking queue or workers but
+        # not consumed are regenerated from the consumed cursor by the
+        # sampler, so no in-flight indices need to be saved
+        self._progress['num_batches_yielded'] = 0
+        self._progress['dataset_state'] = None
+        if resume_state is None:
+            return iter(self._index_sampler)
+        num_batches = resume_state['num_batches_yielded']
+        self._progress['num_batches_yielded'] = num_batches
+        # workers which yield nothing after resuming keep their state
+        self._progress['dataset_state'] = copy.deepcopy(
+            resume_state.get('dataset_state')
+        )
+        sampler_state = resume_state.get('sampler_state')
+        if (
+            self._auto_collate_batch
+            and sampler_state is not None
+            and hasattr(self._batch_sampler, 'load_state_dict')
+        ):
+            self._batch_sampler.load_state_dict(sampler_state)
+            return iter(self._batch_sampler)
+        return itertools.islice(iter(self._index_sampler), num_batches, None)
+
+    def state_dict(self):
+        """
+        Get the state of iterator, which contains the number of batches
+        consumed in current epoch and the state of batch sampler.
+        """
+        return _iterator_state_dict(
+            self._batch_sampler if self._auto_collate_batch else None,
+            self._progress,
+        )
+
+    def _get_structure_info(self):
+        structure, dataset_state = self._structure_infos.get()
+        if dataset_state is not None:
+            self._progress['dataset_state'] = _merge_dataset_state(
+                self._progress['dataset_state'], dataset_state
+            )
+        return structure
+
     def __iter__(self):
         return self
 
@@ -253,39 +352,47 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
             if batch is None or self._thread_done_event.is_set():
                 break
 
-            # flat batch and record structure infos
-            batch, structure = _flatten_batch(batch)
-            self._structure_infos.put(structure)
-
-            if self._thread_done_event.is_set():
+            dataset_state = _iterable_dataset_state(
+                self._dataset, self._dataset_kind
+            )
+            if not self._push_batch(batch, dataset_state):
                 break
 
-            try:
-                # pack as LoDTensorArray
-                array = core.LoDTensorArray()
-                for slot in batch:
-                    if isinstance(slot, paddle.Tensor):
-                        slot = slot.value().get_tensor()
-                    elif not isinstance(slot, core.LoDTensor):
-                        tmp = core.LoDTensor()
-                        tmp.set(slot, core.CPUPlace())
-                        slot = tmp
-
-                    array.append(slot)
+        self._exit_thread_expectedly()
 
-                if self._thread_done_event.is_set():
-                    break
+    def _push_batch(self, batch, dataset_state=None):
+        # flat batch and record structure infos
+        batch, structure = _flatten_batch(batch)
+        self._structure_infos.put((structure, dataset_state))
 
-                try:
-                    self._blocking_queue.push(array)
-                except:
-                    self._exit_thread_expectedly()
+        if self._thread_done_event.is_set():
+            return False
 
-            except Exception as e:
-                self._exit_thread_unexpectedly()
-                raise e
+        try:
+            # pack as LoDTensorArray
+            array = core.LoDTensorArray()
+            for slot in batch:
+                if isinstance(slot, paddle.Tensor):
+                    slot = slot.value().get_tensor()
+                elif not isinstance(slot, core.LoDTensor):
+                    tmp = core.LoDTensor()
+                    tmp.set(slot, core.CPUPlace())
+                    slot = tmp
+
+                array.append(slot)
 
-        self._exit_thread_expectedly()
+            if self._thread_done_event.is_set():
+                return False
+
+            try:
+                self._blocking_queue.push(array)
+            except:
+                self._exit_thread_expectedly()
+
+        except Exception as e:
+            self._exit_thread_unexpectedly()
+            raise e
+        return True
 
     def __next__(self):
         if in_profiler_mode():
@@ -301,7 +408,7 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
                 data = core.eager.read_next_tensor_list(
                     self._reader.read_next_list()[0]
                 )
-                structure_info = self._structure_infos.get()
+                structure_info = self._get_structure_info()
                 data = _restore_batch(data, structure_info)
             else:
                 # in static graph mode
@@ -310,7 +417,7 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
                     for i in range(len(data)):
                         data[i] = data[i]._move_to_list()
                     structs = [
-                        self._structure_infos.get()
+                        self._get_structure_info()
                         for _ in range(len(self._places))
                     ]
                     data = [_restore_batch(d, s) for d, s in zip(data, structs)]
@@ -321,6 +428,7 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
                         data = data[0]
                 else:
                     data = self._reader.read_next()
+            self._progress['num_batches_yielded'] += len(self._places)
             benchmark().after_reader()
 
             return data
@@ -367,12 +475,177 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
         self._try_shutdown_all()
 
 
+class _DataLoaderIterThread(_DataLoaderIterSingleProcess):
+    """
+    Thread worker mode implement of DataLoaderIter, batches are fetched by
+    worker threads in main process and handed over to the blocking queue
+    in the order of indices. Batches are passed by reference without
+    pickling or shared memory, which avoids the startup and inter-process
+    communication cost of worker processes for datasets whose loading
+    releases the GIL, e.g. numpy/cv2/PIL based transforms.
+    """
+
+    def __init__(self, loader):
+        # NOTE: these are used by _thread_loop, which is started in
+        # super().__init__
+        self._fetch_timeout = loader.timeout
+        self._base_seed = np.random.randint(low=0, high=sys.maxsize)
+        self._worker_fetchers = {}
+        self._worker_error = None
+        super().__init__(loader)
+
+    def _fetch(self, worker_id, indices):
+        # NOTE: each worker thread has its own fetcher and worker info, the
+        #       fetcher is created in worker thread, so IterableDataset can
+        #       split data by get_worker_info in __iter__
+        fetcher = self._worker_fetchers.get(worker_id)
+        if fetcher is None:
+            _thread_worker_info.info = WorkerInfo(
+                id=worker_id,
+                num_workers=self._num_workers,
+                dataset=self._dataset,
+                seed=self._base_seed,
+            )
+            if self._worker_init_fn is not None:
+                self._worker_init_fn(worker_id)
+            fetcher = _DatasetKind.create_fetcher(
+                self._dataset_kind,
+                self._dataset,
+                self._auto_collate_batch,
+                self._collate_fn,
+                self._drop_last,
+            )
+            self._worker_fetchers[worker_id] = fetcher
+        batch = fetcher.fetch(indices, self._thread_done_event)
+        # NOTE: the state is got in worker thread, so IterableDataset can
+        #       return the state of current worker only
+        return batch, _iterable_dataset_state(self._dataset, self._dataset_kind)
+
+    def _wait_task(self, task):
+        # wait in short intervals to check exit, and raise RuntimeError
+        # if the batch is not ready in user given timeout
+        start = time.time()
+        while not self._thread_done_event.is_set():
+            try:
+                return task.result(timeout=_THREAD_STATUS_CHECK_INTERVAL)
+            except concurrent.futures.TimeoutError:
+                if 0 < self._fetch_timeout < time.time() - start:
+                    raise RuntimeError(
+                        f"DataLoader worker thread timeout "
+                        f"({self._fetch_timeout}s) to fetch a batch"
+                    )
+        return None
+
+    def _thread_loop(self, legacy_expected_place):
+        core.set_current_thread_name("Dataloader_" + str(id(self)))
+        _set_expected_place(legacy_expected_place)
+
+        def init_worker_thread():
+            _set_expected_place(legacy_expected_place)
+
+        # one single thread executor for each worker, batches of the same
+        # worker are fetched sequentially, which is required by iterator
+        # of IterableDataset
+        workers = [
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=f"DataLoaderWorker_{i}",
+                initializer=init_worker_thread,
+            )
+            for i in range(self._num_workers)
+        ]
+        worker_status = [True] * self._num_workers
+        capacity = self._prefetch_factor * self._num_workers
+        tasks = collections.deque()
+        worker_idx = 0
+        sampler_exhausted = False
+        try:
+            while not self._thread_done_event.is_set():
+                while (
+                    not sampler_exhausted
+                    and len(tasks) < capacity
+                    and any(worker_status)
+                ):
+                    try:
+                        indices = next(self._sampler_iter)
+                    except StopIteration:
+                        sampler_exhausted = True
+                        break
+                    while not worker_status[worker_idx]:
+                        worker_idx = (worker_idx + 1) % self._num_workers
+                    task = workers[worker_idx].submit(
+                        self._fetch, worker_idx, indices
+                    )
+                    tasks.append((worker_idx, task))
+                    worker_idx = (worker_idx + 1) % self._num_workers
+
+                if len(tasks) == 0:
+                    break
+                worker_id, task = tasks.popleft()
+                if not worker_status[worker_id]:
+                    task.cancel()
+                    continue
+                try:
+                    result = self._wait_task(task)
+                except StopIteration:
+                    # worker of IterableDataset drained, other workers
+                    # may still be working
+                    worker_status[worker_id] = False
+                    continue
+
+                if result is None or self._thread_done_event.is_set():
+                    break
+                batch, dataset_state = result
+                if batch is None:
+                    break
+
+                if not self._push_batch(batch, dataset_state):
+                    break
+        except Exception as e:
+            # the error is raised in __next__ of main thread
+            self._worker_error = e
+            self._exit_thread_unexpectedly()
+            return
+        finally:
+            for _, task in tasks:
+                task.cancel()
+            for worker in workers:
+                worker.shutdown(wait=False)
+
+        self._exit_thread_expectedly()
+
+    def __next__(self):
+        try:
+            data = super().__next__()
+        except BaseException:
+            if self._worker_error is not None:
+                raise self._worker_error
+            raise
+        return data
+
+
 class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
     def __init__(self, loader):
         super().__init__(loader)
 
         self._persistent_workers = loader._persistent_workers
         self._resume_worker_cnt = 0
+        self._resume_done_event = threading.Event()
+
+        # NOTE: in adaptive autotune mode, max_num_workers worker processes
+        # are started, and only the first _active_workers workers are
+        # assigned with indices, active worker number and prefetch factor
+        # are tuned online by _adaptive_tuner, see autotune.py
+        self._adaptive_tuner = getattr(loader, '_adaptive_tuner', None)
+        if self._adaptive_tuner is not None:
+            self._num_workers = self._adaptive_tuner.max_num_workers
+            self._active_workers = self._adaptive_tuner.num_workers
+            self._prefetch_factor = self._adaptive_tuner.prefetch_factor
+            max_prefetch_factor = self._adaptive_tuner.max_prefetch_factor
+            self._adaptive_tuner.reset_window()
+        else:
+            self._active_workers = self._num_workers
+            max_prefetch_factor = self._prefetch_factor
 
         assert self._num_workers > 0, (
             "Multi-process DataLoader "
@@ -398,6 +671,9 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         # output data for at least "_prefetch_factor" iterations(Note that len(_places)
         # batches will be composed as an iteration output)
         self._outstanding_capacity = self._prefetch_factor * max(
+            self._active_workers, len(self._places)
+        )
+        self._max_outstanding_capacity = max_prefetch_factor * max(
             self._num_workers, len(self._places)
         )
 
@@ -429,6 +705,24 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             (self._worker_shm_buffer_size) * 2 * self._num_workers
         )
 
+        # NOTE: shared memory ring slot number of each worker should cover
+        # all outstanding batches of the worker and the batch kept by the
+        # one iteration lag of slot releasing, if all slots are used, the
+        # worker falls back to sending batch in the common way.
+        # see [ shared memory ring ] in shm_ring.py
+        self._shm_ring_size = 0
+        if self._use_shared_memory and _use_shm_ring():
+            self._shm_ring_size = (
+                math.ceil(self._max_outstanding_capacity / self._num_workers)
+                + 2
+            )
+        self._shm_ring = _MainShmRing()
+        # slots of batches pushed to blocking_queue in order, None for
+        # batches not in the ring
+        self._shm_ring_inflight = collections.deque()
+        # slots of batches output in last iteration
+        self._shm_ring_output = []
+
         # init workers and indices queues and put 2 indices in each indices queue
         self._init_workers()
         for _ in range(self._outstanding_capacity):
@@ -437,6 +731,13 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._init_thread()
         self._shutdown = False
 
+    def _load_dataset_state(self, resume_state=None):
+        # NOTE: dataset in main process is not iterated, the state is sent
+        #       to workers and loaded by the dataset copy in each worker
+        self._dataset_state = None
+        if resume_state is not None:
+            self._dataset_state = resume_state.get('dataset_state')
+
     def _init_workers(self):
         # multiprocess worker and indice queue list initial as empty
         self._workers = []
@@ -473,6 +774,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._use_shared_memory,
                     self._base_seed,
                     self._worker_shm_buffer_size,
+                    self._shm_ring_size,
+                    self._dataset_state,
                 ),
             )
             worker.daemon = True
@@ -508,7 +811,9 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             self._dtypes = [v.dtype for v in self._feed_list]
         # if only 1 place, do not need to keep order
         self._blocking_queue = core.init_lod_tensor_blocking_queue(
-            core.Variable(), self._outstanding_capacity, len(self._places) > 1
+            core.Variable(),
+            self._max_outstanding_capacity,
+            len(self._places) > 1,
         )
         core._set_max_memory_map_allocation_pool_size(
             self._main_thread_shm_buffer_size
@@ -533,34 +838,50 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._thread.daemon = True
         self._thread.start()
 
-    def _reset(self):
+    def _clear_blocking_queue(self):
+        while self._blocking_queue.size() >= len(self._places):
+            if in_dynamic_mode():
+                core.eager.read_next_tensor_list(
+                    self._reader.read_next_list()[0]
+                )
+            elif self._return_list:
+                self._reader.read_next_list()
+            else:
+                self._reader.read_next()
+
+    def _reset(self, resume_state=None):
         # resume iteration in following steps
         # 1. Resume workers, clear worker caches
         # put _ResumeIteration to all worker as resume iteration flag
+        self._load_dataset_state(resume_state)
         with self._thread_lock:
+            self._resume_done_event.clear()
             self._resume_worker_cnt = self._num_workers
             for worker_id in range(self._num_workers):
-                self._indices_queues[worker_id].put(_ResumeIteration())
+                self._indices_queues[worker_id].put(
+                    _ResumeIteration(self._dataset_state)
+                )
                 self._batches_outstanding += 1
-        # all flag will be check in _thread_loop, simply wait here
-        while self._resume_worker_cnt > 0:
-            time.sleep(0.5)
+        # all flag will be check in _thread_loop, wait for the event set
+        # by _thread_loop when all workers resumed. If last epoch is not
+        # drained, e.g. break in for loop, _thread_loop may block on
+        # pushing to a full blocking_queue, so clear it while waiting
+        while not self._resume_done_event.wait(
+            _THREAD_STATUS_CHECK_INTERVAL / 10
+        ):
+            self._clear_blocking_queue()
 
         # 2. clear blocking_queue caches
         # in order not to restart the thread, we just clear
         # the blocking_queue cachees instead of recreating one
-        while self._blocking_queue.size() >= len(self._places):
-            if in_dynamic_mode():
-                data = core.eager.read_next_tensor_list(
-                    self._reader.read_next_list()[0]
-                )
-            else:
-                if self._return_list:
-                    self._reader.read_next_list()
-                else:
-                    data = self._reader.read_next()
+        self._clear_blocking_queue()
 
         # 3. reset all states
+        if self._shm_ring_size > 0:
+            slots = self._shm_ring_output + list(self._shm_ring_inflight)
+            self._shm_ring_inflight.clear()
+            self._shm_ring_output = []
+            self._release_shm_ring_slots(slots)
         self._send_idx = 0
         self._rcvd_idx = 0
         self._batches_outstanding = 0
@@ -573,7 +894,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
 
         # 4. reset _sampler_iter and put prefetch indices to start next epoch
         # init workers and indices queues and put 2 indices in each indices queue
-        self._sampler_iter = iter(self._index_sampler)
+        self._sampler_iter = self._init_sampler_iter(resume_state)
         for _ in range(self._outstanding_capacity):
             self._try_put_indices()
 
@@ -603,6 +924,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     for q in self._indices_queues:
                         q.cancel_join_thread()
                         q.close()
+                self._shm_ring.clear()
             finally:
                 core._erase_process_pids(id(self))
                 self._shutdown = True
@@ -625,11 +947,20 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     if isinstance(batch, _ResumeIteration):
                         assert self._resume_worker_cnt > 0
                         self._resume_worker_cnt -= 1
+                        if self._resume_worker_cnt == 0:
+                            self._resume_done_event.set()
                         continue
                     try:
                         # pack as LoDTensorArray
                         array = core.LoDTensorArray()
                         if self._use_shared_memory:
+                            if isinstance(batch, _ShmRingBatch):
+                                self._shm_ring_inflight.append(
+                                    (batch.worker_id, batch.slot_id)
+                                )
+                                batch = self._shm_ring.to_tensors(batch)
+                            elif self._shm_ring_size > 0:
+                                self._shm_ring_inflight.append(None)
                             for tensor in batch:
                                 array.append(tensor)
                         else:
@@ -796,7 +1127,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
 
             for i in range(self._num_workers):
                 worker_idx = next(self._workers_idx_cycle)
-                if self._worker_status[worker_idx]:
+                if (
+                    self._worker_status[worker_idx]
+                    and worker_idx < self._active_workers
+                ):
                     break
             else:
                 return
@@ -836,11 +1170,15 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._thread_done_event.set()
                     self._blocking_queue.close()
 
+            if self._adaptive_tuner is not None:
+                queue_depth = self._blocking_queue.size()
+                wait_start = time.perf_counter()
+
             if in_dynamic_mode():
                 data = core.eager.read_next_tensor_list(
                     self._reader.read_next_list()[0]
                 )
-                structure_info = self._structure_infos.get()
+                structure_info = self._get_structure_info()
                 data = _restore_batch(data, structure_info)
             else:
                 if self._return_list:
@@ -848,7 +1186,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     for i in range(len(data)):
                         data[i] = data[i]._move_to_list()
                     structs = [
-                        self._structure_infos.get()
+                        self._get_structure_info()
                         for _ in range(len(self._places))
                     ]
                     data = [_restore_batch(d, s) for d, s in zip(data, structs)]
@@ -860,6 +1198,11 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                 else:
                     data = self._reader.read_next()
             self._on_output_batch()
+            self._progress['num_batches_yielded'] += len(self._places)
+            if self._adaptive_tuner is not None:
+                self._on_adaptive_autotune(
+                    time.perf_counter() - wait_start, queue_depth
+                )
             benchmark().after_reader()
             return data
         except StopIteration:
@@ -871,7 +1214,45 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             if in_profiler_mode():
                 trace_event.end()
 
+    def _release_shm_ring_slots(self, slots):
+        for slot in slots:
+            if slot is not None:
+                worker_id, slot_id = slot
+                self._indices_queues[worker_id].put(_ShmRingRelease(slot_id))
+
     def _on_output_batch(self):
+        if self._shm_ring_size > 0:
+            # NOTE: tensors output in CPU place share memory with ring
+            # slots, which may still be used by users before getting the
+            # next batch, so slots are given back with one iteration lag
+            self._release_shm_ring_slots(self._shm_ring_output)
+            self._shm_ring_output = [
+                self._shm_ring_inflight.popleft()
+                for _ in range(len(self._places))
+                if len(self._shm_ring_inflight) > 0
+            ]
         for _ in range(len(self._places)):
             self._batches_outstanding -= 1
+            # NOTE: _outstanding_capacity may be decreased by adaptive
+            # autotune, skip putting indices until outstanding batches
+            # drop below the new capacity
+            if self._batches_outstanding < self._outstanding_capacity:
+                self._try_put_indices()
+
+    def _on_adaptive_autotune(self, wait_time, queue_depth):
+        if not self._adaptive_tuner.step(
+            wait_time, queue_depth, self._outstanding_capacity
+        ):
+            return
+        self._active_workers = self._adaptive_tuner.num_workers
+        self._prefetch_factor = self._adaptive_tuner.prefetch_factor
+        self._outstanding_capacity = self._prefetch_factor * max(
+            self._active_workers, len(self._places)
+        )
+        # fill up indices for the new activated workers or increased
+        # prefetch factor
+        while self._batches_outstanding < self._outstanding_capacity:
+            send_idx = self._send_idx
             self._try_put_indices()
+            if self._send_idx == send_idx:
+                break
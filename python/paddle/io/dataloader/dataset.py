@@ -26,6 +26,7 @@ from typing import (
     TypeVar,
 )
 
+import numpy as np
 from typing_extensions import Never, TypeVarTuple, Unpack
 
 import paddle
@@ -55,6 +56,16 @@ class Dataset(Generic[_T]):
     :code:`__len__`: return dataset sample number. This method is required
     by some implements of :code:`paddle.io.BatchSampler`
 
+    Subclasses can optionally implement following method:
+
+    :code:`__getitems__`: get a list of samples from dataset with a list of
+    indices. If defined, :code:`paddle.io.DataLoader` reads a whole
+    mini-batch with one :code:`__getitems__` call instead of calling
+    :code:`__getitem__` once per index, which allows datasets backed by
+    memory-mapped arrays or columnar files to read a batch in a single
+    vectorized slice. It should return samples in the same order as the
+    given indices.
+
     see :code:`paddle.io.DataLoader`.
 
     Examples:
@@ -336,6 +347,16 @@ class TensorDataset(Dataset["Tensor"]):
     def __getitem__(self, index: int) -> tuple[Tensor, ...]:
         return tuple(tensor[index] for tensor in self.tensors)
 
+    def __getitems__(self, indices: Sequence[int]) -> list[tuple[Tensor, ...]]:
+        # gather the whole batch from each tensor with one kernel call,
+        # then split it into samples along the 1st dimension
+        index = paddle.to_tensor(indices, dtype='int64')
+        fields = [
+            paddle.unbind(paddle.gather(tensor, index), axis=0)
+            for tensor in self.tensors
+        ]
+        return list(zip(*fields))
+
     def __len__(self) -> int:
         return self.tensors[0].shape[0]
 
@@ -348,6 +369,15 @@ def to_list(value):
     return [value]
 
 
+def _getitems(dataset: Dataset[_T], indices: Sequence[int]) -> list[_T]:
+    # read samples by `__getitems__` if dataset implements it, otherwise
+    # fallback to read samples one by one by `__getitem__`
+    getitems = getattr(dataset, '__getitems__', None)
+    if getitems is not None:
+        return getitems(indices)
+    return [dataset[idx] for idx in indices]
+
+
 class ComposeDataset(Dataset[Tuple[Unpack[_Ts]]]):
     """
     A Dataset which composes fields of multiple datasets.
@@ -414,6 +444,13 @@ class ComposeDataset(Dataset[Tuple[Unpack[_Ts]]]):
             sample.extend(to_list(dataset[idx]))
         return tuple(sample)
 
+    def __getitems__(self, indices: Sequence[int]) -> list[tuple[Unpack[_Ts]]]:
+        samples = [[] for _ in indices]
+        for dataset in self.datasets:
+            for sample, field in zip(samples, _getitems(dataset, indices)):
+                sample.extend(to_list(field))
+        return [tuple(sample) for sample in samples]
+
 
 class ChainDataset(IterableDataset[Any]):
     """
@@ -517,6 +554,9 @@ class Subset(Dataset[_T]):
     def __getitem__(self, idx: int) -> _T:
         return self.dataset[self.indices[idx]]
 
+    def __getitems__(self, indices: Sequence[int]) -> list[_T]:
+        return _getitems(self.dataset, [self.indices[idx] for idx in indices])
+
     def __len__(self) -> int:
         return len(self.indices)
 
@@ -715,3 +755,26 @@ class ConcatDataset(Dataset[_T]):
         else:
             sample_idx = idx - self.cumulative_sizes[dataset_idx - 1]
         return self.datasets[dataset_idx][sample_idx]
+
+    def __getitems__(self, indices: Sequence[int]) -> list[_T]:
+        indices = np.asarray(indices, dtype='int64').reshape([-1])
+        if np.any(indices < -len(self)):
+            raise ValueError(
+                "absolute value of index should not exceed dataset length"
+            )
+        indices = np.where(indices < 0, indices + len(self), indices)
+        dataset_ids = np.searchsorted(
+            self.cumulative_sizes, indices, side='right'
+        )
+        offsets = np.concatenate([[0], self.cumulative_sizes[:-1]])
+
+        # read samples from each sub-dataset in one call, then scatter
+        # them back to the order of given indices
+        samples = [None] * len(indices)
+        for dataset_idx in np.unique(dataset_ids):
+            positions = np.nonzero(dataset_ids == dataset_idx)[0]
+            sample_ids = indices[positions] - offsets[dataset_idx]
+            fields = _getitems(self.datasets[dataset_idx], sample_ids.tolist())
+            for pos, sample in zip(positions.tolist(), fields):
+                samples[pos] = sample
+        return samples
@@ -71,12 +71,20 @@ class _MapDatasetFetcher(_DatasetFetcher):
 
     def fetch(self, batch_indices, done_event=None):
         if self.auto_collate_batch:
-            data = []
-            for idx in batch_indices:
-                if done_event is None or not done_event.is_set():
-                    data.append(self.dataset[idx])
-                else:
+            # NOTE: if dataset implements `__getitems__`, read the whole
+            #       batch in one call, which allows datasets to read
+            #       samples with a vectorized slice
+            if getattr(self.dataset, '__getitems__', None) is not None:
+                if done_event is not None and done_event.is_set():
                     return None
+                data = self.dataset.__getitems__(batch_indices)
+            else:
+                data = []
+                for idx in batch_indices:
+                    if done_event is None or not done_event.is_set():
+                        data.append(self.dataset[idx])
+                    else:
+                        return None
 
         else:
             data = self.dataset[batch_indices]
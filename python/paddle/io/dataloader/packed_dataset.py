@@ -0,0 +1,271 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import mmap
+import os
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+import numpy as np
+
+from .dataset import Dataset
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+    from typing_extensions import Self
+
+# NOTE: [ packed record format ] A packed record dataset with prefix
+# `path` is stored as:
+#   1. shard files `{path}-{shard_id:05d}.shard`, records are written one
+#      after another into a shard, each record starts at an offset aligned
+#      to _RECORD_ALIGNMENT bytes, a new shard is started when the shard
+#      size exceeds `max_shard_size`.
+#   2. an index file `{path}.index.npy`, which is a numpy int64 array in
+#      shape of [num_records, 3], each row is (shard_id, offset, length)
+#      of a record.
+# Readers only need to load the index and map the shards, no directory
+# listing or file opening is needed for each sample.
+_RECORD_ALIGNMENT = 8
+_INDEX_SUFFIX = '.index.npy'
+
+
+def _shard_path(path: str, shard_id: int) -> str:
+    return f"{path}-{shard_id:05d}.shard"
+
+
+def _index_path(path: str) -> str:
+    return path + _INDEX_SUFFIX
+
+
+class PackedRecordWriter:
+    """
+    Writer of packed record dataset, which packs records into large shard
+    files with an offset index, the dataset can be read by
+    :ref:`api_paddle_io_PackedRecordDataset`.
+
+    A record is a bytes-like object, e.g. the encoded bytes of an image
+    file, or a C-contiguous numpy array, whose raw bytes are written.
+
+    Args:
+        path(str): path prefix of the dataset, shard files are named as
+            :code:`{path}-{shard_id:05d}.shard`, and the index file is
+            named as :code:`{path}.index.npy`.
+        max_shard_size(int, optional): max bytes of a shard file, a new
+            shard is started when the current shard exceeds this size, a
+            single record larger than this size still holds a whole shard.
+            Default 1 GB.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import os
+            >>> import tempfile
+            >>> import numpy as np
+            >>> from paddle.io import PackedRecordWriter, PackedRecordDataset
+
+            >>> path = os.path.join(tempfile.mkdtemp(), 'train')
+            >>> with PackedRecordWriter(path, max_shard_size=1024) as writer:
+            ...     for i in range(100):
+            ...         writer.write(np.full([16], i, dtype='int64'))
+
+            >>> dataset = PackedRecordDataset(
+            ...     path, transform=lambda r: r.view('int64'))
+            >>> print(len(dataset), dataset[3][0])
+            100 3
+    """
+
+    def __init__(self, path: str, max_shard_size: int = 1 << 30) -> None:
+        assert (
+            isinstance(max_shard_size, int) and max_shard_size > 0
+        ), f"max_shard_size should be a positive integer, but got {max_shard_size}"
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.path = path
+        self.max_shard_size = max_shard_size
+        self._index = []
+        self._shard_id = -1
+        self._shard_file = None
+        self._shard_size = 0
+        self._closed = False
+
+    def _open_shard(self) -> None:
+        if self._shard_file is not None:
+            self._shard_file.close()
+        self._shard_id += 1
+        self._shard_file = open(_shard_path(self.path, self._shard_id), 'wb')
+        self._shard_size = 0
+
+    def write(self, record: bytes | bytearray | memoryview | np.ndarray) -> int:
+        """
+        Write a record into dataset.
+
+        Args:
+            record(bytes|bytearray|memoryview|np.ndarray): the record.
+
+        Returns:
+            int: index of the record in dataset.
+        """
+        if self._closed:
+            raise ValueError("write to a closed PackedRecordWriter")
+        if isinstance(record, np.ndarray):
+            record = np.ascontiguousarray(record)
+        data = memoryview(record).cast('B')
+
+        padding = -self._shard_size % _RECORD_ALIGNMENT
+        if (
+            self._shard_file is None
+            or self._shard_size > 0
+            and self._shard_size + padding + data.nbytes > self.max_shard_size
+        ):
+            self._open_shard()
+            padding = 0
+        if padding > 0:
+            self._shard_file.write(b'\0' * padding)
+            self._shard_size += padding
+
+        self._index.append((self._shard_id, self._shard_size, data.nbytes))
+        self._shard_file.write(data)
+        self._shard_size += data.nbytes
+        return len(self._index) - 1
+
+    def close(self) -> None:
+        """
+        Close the current shard and write the index file, the dataset can
+        only be read after the writer is closed.
+        """
+        if self._closed:
+            return
+        if self._shard_file is not None:
+            self._shard_file.close()
+            self._shard_file = None
+        index = np.array(self._index, dtype=np.int64).reshape([-1, 3])
+        # write index to a temporary file and rename, so an incomplete
+        # index is never read
+        tmp_path = _index_path(self.path) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, index)
+        os.replace(tmp_path, _index_path(self.path))
+        self._closed = True
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class PackedRecordDataset(Dataset[Any]):
+    """
+    Map-style dataset reading a packed record dataset written by
+    :ref:`api_paddle_io_PackedRecordWriter`.
+
+    Shard files are memory mapped on the first access in each process, so
+    the dataset can be used by multi-process DataLoader, and each record
+    is returned as a read-only uint8 numpy array viewing the mapped
+    memory without copying. A :attr:`transform` can be set to decode the
+    record, e.g. decode image bytes or view the array as other dtype.
+
+    Args:
+        path(str): path prefix of the dataset, the same as the :attr:`path`
+            of :ref:`api_paddle_io_PackedRecordWriter`.
+        transform(Callable, optional): function applied on each record.
+            Default None.
+
+    Returns:
+        Dataset: a Dataset instance reading packed records.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import os
+            >>> import tempfile
+            >>> from paddle.io import PackedRecordWriter, PackedRecordDataset
+
+            >>> path = os.path.join(tempfile.mkdtemp(), 'train')
+            >>> with PackedRecordWriter(path) as writer:
+            ...     for i in range(10):
+            ...         writer.write(f'sample {i}'.encode())
+
+            >>> dataset = PackedRecordDataset(path)
+            >>> print(dataset[3].tobytes())
+            b'sample 3'
+    """
+
+    def __init__(
+        self,
+        path: str,
+        transform: Callable[[npt.NDArray[np.uint8]], Any] | None = None,
+    ) -> None:
+        index_path = _index_path(path)
+        if not os.path.exists(index_path):
+            raise ValueError(
+                f"index file {index_path} of packed record dataset not found"
+            )
+        self.path = path
+        self.transform = transform
+        self._index = np.load(index_path)
+        num_shards = int(self._index[:, 0].max()) + 1 if len(self) > 0 else 0
+        self._shard_paths = [
+            _shard_path(path, shard_id) for shard_id in range(num_shards)
+        ]
+        self._shards = None
+
+    def _map_shards(self) -> list[npt.NDArray[np.uint8]]:
+        shards = []
+        for shard_path in self._shard_paths:
+            with open(shard_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    shards.append(np.zeros([0], dtype=np.uint8))
+                    continue
+                # the mapping is kept alive by the numpy array after the
+                # file is closed
+                buf = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+            shards.append(np.frombuffer(buf, dtype=np.uint8))
+        return shards
+
+    def _records(self, rows: list[list[int]]) -> list[Any]:
+        if self._shards is None:
+            self._shards = self._map_shards()
+        records = []
+        for shard_id, offset, length in rows:
+            record = self._shards[shard_id][offset : offset + length]
+            if self.transform is not None:
+                record = self.transform(record)
+            records.append(record)
+        return records
+
+    def __getitem__(self, idx: int) -> Any:
+        return self._records([self._index[idx].tolist()])[0]
+
+    def __getitems__(self, indices: Sequence[int]) -> list[Any]:
+        # look up index rows of the whole batch at once
+        rows = self._index[np.asarray(indices, dtype=np.int64)].tolist()
+        return self._records(rows)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # mapped shards are not picklable, each process maps them again
+        state = self.__dict__.copy()
+        state['_shards'] = None
+        return state
@@ -168,13 +168,40 @@ class SequenceSampler(Sampler[int]):
 
     def __init__(self, data_source: Sized) -> None:
         self.data_source = data_source
+        self._num_samples_yielded = 0
+        self._resume_state = None
 
     def __iter__(self) -> Iterator[int]:
-        return iter(range(len(self.data_source)))
+        state, self._resume_state = self._resume_state, None
+        start = state['num_samples_yielded'] if state is not None else 0
+        self._num_samples_yielded = start
+        for index in range(start, len(self.data_source)):
+            self._num_samples_yielded += 1
+            yield index
 
     def __len__(self) -> int:
         return len(self.data_source)
 
+    def state_dict(self) -> dict[str, Any]:
+        """
+        Get the state of sampler, which contains the number of indices
+        yielded in current epoch.
+
+        Returns:
+            dict: the state of sampler.
+        """
+        return {'num_samples_yielded': self._num_samples_yielded}
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        """
+        Load the state of sampler, the next iteration will skip the
+        indices yielded before the state is saved.
+
+        Args:
+            state_dict(dict): the state got by :code:`state_dict`.
+        """
+        self._resume_state = dict(state_dict)
+
 
 class RandomSampler(Sampler[int]):
     """
@@ -240,6 +267,9 @@ class RandomSampler(Sampler[int]):
         self.replacement = replacement
         self._num_samples = num_samples
         self.generator = generator
+        self._rng_state = None
+        self._num_samples_yielded = 0
+        self._resume_state = None
 
         if not isinstance(self.replacement, bool):
             raise TypeError(
@@ -267,28 +297,60 @@ class RandomSampler(Sampler[int]):
 
     def __iter__(self) -> Iterator[int]:
         n = len(self.data_source)
+        state, self._resume_state = self._resume_state, None
+        start = state['num_samples_yielded'] if state is not None else 0
+        self._num_samples_yielded = start
         if self.generator:
             for i in range(self.num_samples):
                 try:
                     index = next(self.generator)
                 except StopIteration:
                     return
+                if i < start:
+                    continue
+                self._num_samples_yielded += 1
                 yield index
         else:
-            if self.replacement:
-                for index in np.random.choice(
-                    np.arange(n), self.num_samples, replace=True
-                ).tolist():
-                    yield index
-            else:
-                for index in np.random.choice(
-                    np.arange(n), self.num_samples, replace=False
-                ).tolist():
-                    yield index
+            # NOTE: record numpy random state before drawing indices of
+            # this epoch, resuming from this state draws the same indices
+            if state is not None and state['rng_state'] is not None:
+                np.random.set_state(state['rng_state'])
+            self._rng_state = np.random.get_state()
+            indices = np.random.choice(
+                np.arange(n), self.num_samples, replace=self.replacement
+            )
+            for index in indices[start:].tolist():
+                self._num_samples_yielded += 1
+                yield index
 
     def __len__(self) -> int:
         return self.num_samples
 
+    def state_dict(self) -> dict[str, Any]:
+        """
+        Get the state of sampler, which contains the numpy random state
+        before drawing indices of current epoch and the number of indices
+        yielded in current epoch.
+
+        Returns:
+            dict: the state of sampler.
+        """
+        return {
+            'rng_state': self._rng_state,
+            'num_samples_yielded': self._num_samples_yielded,
+        }
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        """
+        Load the state of sampler, the next iteration will restore the
+        numpy random state, draw the same indices as the epoch the state
+        is saved in, and skip the indices yielded before the state is saved.
+
+        Args:
+            state_dict(dict): the state got by :code:`state_dict`.
+        """
+        self._resume_state = dict(state_dict)
+
 
 def _weighted_sample(weights, num_samples, replacement=True):
     if isinstance(weights, core.LoDTensor):
@@ -0,0 +1,302 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Sequence
+
+import numpy as np
+
+from .dataset import IterableDataset
+from .worker import get_worker_info
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class ShardedIterableDataset(IterableDataset[Any]):
+    """
+    Streaming dataset which reads records from a list of shards, shards
+    are assigned to each (rank, worker) pair deterministically, so each
+    record is read only once in an epoch across all ranks and DataLoader
+    worker processes.
+
+    In each epoch, shards are optionally shuffled with :attr:`seed` and
+    the epoch number, then the shard at position ``i`` is read by the
+    global worker ``i % (num_replicas * num_workers)``, whose global id is
+    ``rank * num_workers + worker_id``. If there are fewer shards than
+    global workers, some workers read nothing, so it is recommended to
+    split data into shards much more than global workers.
+
+    Records can be shuffled approximately with a shuffle buffer: records
+    are read into a buffer of :attr:`shuffle_buffer_size`, and a random
+    one in the buffer is yielded each time when the buffer is full.
+
+    The reading position can be saved by :code:`state_dict` and loaded by
+    :code:`load_state_dict`, which records the epoch and a cursor of
+    (shard position, record offset) for each global worker. When the
+    dataset is read by :ref:`api_paddle_io_DataLoader` with
+    :code:`num_workers > 0`, cursors are updated in the workers, so the
+    state should be saved and loaded by :code:`DataLoader.state_dict` and
+    :code:`DataLoader.load_state_dict` instead, which collect the cursor
+    of each consumed batch from workers. Without the
+    shuffle buffer, resuming starts reading from the record at the cursor
+    directly. With the shuffle buffer, the records yielded before the
+    cursor are read again to rebuild the buffer but not yielded, which
+    yields the same records as the epoch is not interrupted.
+
+    Args:
+        shards(Sequence): shards of dataset, e.g. file paths.
+        reader(Callable): function to read a shard, which takes a shard
+            and returns an iterable of records.
+        shuffle(bool, optional): whether to shuffle shards in each epoch.
+            Default False.
+        shuffle_buffer_size(int, optional): buffer size to shuffle records,
+            records are not shuffled if it is no more than 1. Default 0.
+        seed(int, optional): random seed to shuffle shards and records, the
+            seed of epoch ``e`` is ``seed + e``. Default 0.
+        num_replicas(int, optional): rank number in distributed training,
+            default :code:`paddle.distributed.ParallelEnv().nranks`.
+        rank(int, optional): rank of current process, default
+            :code:`paddle.distributed.ParallelEnv().local_rank`.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import os
+            >>> import tempfile
+            >>> from paddle.io import DataLoader, ShardedIterableDataset
+
+            >>> root = tempfile.mkdtemp()
+            >>> shards = []
+            >>> for i in range(8):
+            ...     path = os.path.join(root, f'part-{i}.txt')
+            ...     with open(path, 'w') as f:
+            ...         f.write('\\n'.join(str(i * 10 + j) for j in range(10)))
+            ...     shards.append(path)
+
+            >>> def read_lines(path):
+            ...     with open(path) as f:
+            ...         for line in f:
+            ...             yield int(line)
+
+            >>> dataset = ShardedIterableDataset(
+            ...     shards, read_lines, shuffle=True, shuffle_buffer_size=16,
+            ...     num_replicas=1, rank=0)
+            >>> loader = DataLoader(dataset, batch_size=10, num_workers=2)
+            >>> print(sum(batch.shape[0] for batch in loader))
+            80
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[Any],
+        reader: Callable[[Any], Iterable[Any]],
+        shuffle: bool = False,
+        shuffle_buffer_size: int = 0,
+        seed: int = 0,
+        num_replicas: int | None = None,
+        rank: int | None = None,
+    ) -> None:
+        assert len(shards) > 0, "shards should not be empty"
+        assert callable(reader), "reader should be callable"
+        assert isinstance(
+            shuffle, bool
+        ), f"shuffle should be a boolean value, but got {type(shuffle)}"
+        assert (
+            isinstance(shuffle_buffer_size, int) and shuffle_buffer_size >= 0
+        ), "shuffle_buffer_size should be a non-negative integer"
+        self.shards = list(shards)
+        self.reader = reader
+        self.shuffle = shuffle
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.seed = seed
+
+        from paddle.distributed import ParallelEnv
+
+        if num_replicas is not None:
+            assert (
+                isinstance(num_replicas, int) and num_replicas > 0
+            ), "num_replicas should be a positive integer"
+            self.nranks = num_replicas
+        else:
+            self.nranks = ParallelEnv().nranks
+
+        if rank is not None:
+            assert (
+                isinstance(rank, int) and 0 <= rank < self.nranks
+            ), "rank should be a non-negative integer less than num_replicas"
+            self.local_rank = rank
+        else:
+            self.local_rank = ParallelEnv().local_rank
+
+        self.epoch = 0
+        self._cursors = {}
+        self._resume_state = None
+        self._resume_lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # lock can not be pickled to DataLoader worker processes
+        state = self.__dict__.copy()
+        del state['_resume_lock']
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._resume_lock = threading.Lock()
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        Sets the epoch number, which is used with :attr:`seed` to shuffle
+        shards and records. If not set, each iteration uses the same epoch
+        and yields the same order.
+
+        Args:
+            epoch(int): Epoch number.
+        """
+        self.epoch = epoch
+        self._cursors = {}
+
+    def _worker(self) -> tuple[int, int]:
+        worker_info = get_worker_info()
+        if worker_info is None:
+            return self.local_rank, self.nranks
+        global_id = self.local_rank * worker_info.num_workers + worker_info.id
+        return global_id, self.nranks * worker_info.num_workers
+
+    def _assigned_shards(self, global_id: int, num_global_workers: int) -> list:
+        positions = np.arange(len(self.shards))
+        if self.shuffle:
+            np.random.RandomState(self.seed + self.epoch).shuffle(positions)
+        return [
+            self.shards[p] for p in positions[global_id::num_global_workers]
+        ]
+
+    def _take_cursor(self, global_id: int) -> dict[str, int] | None:
+        # NOTE: DataLoader worker threads share the dataset, so each worker
+        #       takes only its own cursor, and the state is cleared after
+        #       all cursors are taken, so later epochs are not resumed
+        with self._resume_lock:
+            if self._resume_state is None:
+                return None
+            cursors = self._resume_state['cursors']
+            cursor = cursors.pop(global_id, None)
+            if not cursors:
+                self._resume_state = None
+            return cursor
+
+    def _read(
+        self, shards: list, shard_pos: int, offset: int
+    ) -> Iterator[tuple[int, int, Any]]:
+        # yield records with (shard position, offset) after it
+        for pos in range(shard_pos, len(shards)):
+            records = iter(self.reader(shards[pos]))
+            start = offset if pos == shard_pos else 0
+            if start > 0:
+                records = itertools.islice(records, start, None)
+            for i, record in enumerate(records, start + 1):
+                yield pos, i, record
+
+    def _shuffle(
+        self,
+        records: Iterator[tuple[int, int, Any]],
+        rng: np.random.RandomState,
+    ) -> Iterator[tuple[int, int, Any]]:
+        # the cursor of a shuffled record is the reading position when it
+        # is yielded, so resuming from it replays the buffer
+        buffer = []
+        for pos, offset, record in records:
+            buffer.append(record)
+            if len(buffer) < self.shuffle_buffer_size:
+                continue
+            i = rng.randint(len(buffer))
+            buffer[i], buffer[-1] = buffer[-1], buffer[i]
+            yield pos, offset, buffer.pop()
+        rng.shuffle(buffer)
+        for record in buffer:
+            yield None, None, record
+
+    def __iter__(self) -> Iterator[Any]:
+        global_id, num_global_workers = self._worker()
+        shards = self._assigned_shards(global_id, num_global_workers)
+
+        cursor = self._take_cursor(global_id)
+
+        if self.shuffle_buffer_size > 1:
+            rng = np.random.RandomState(
+                (self.seed + self.epoch) * num_global_workers + global_id
+            )
+            records = self._shuffle(self._read(shards, 0, 0), rng)
+            num_skip = cursor['num_yielded'] if cursor is not None else 0
+        else:
+            shard_pos, offset = 0, 0
+            if cursor is not None:
+                shard_pos, offset = cursor['shard_pos'], cursor['offset']
+            records = self._read(shards, shard_pos, offset)
+            num_skip = 0
+
+        num_yielded = cursor['num_yielded'] if cursor is not None else 0
+        self._cursors[global_id] = dict(
+            cursor or {'shard_pos': 0, 'offset': 0, 'num_yielded': 0}
+        )
+        for i, (pos, offset, record) in enumerate(records):
+            if i < num_skip:
+                continue
+            num_yielded += 1
+            if pos is None:
+                # draining the buffer, all records are read
+                pos, offset = len(shards), 0
+            self._cursors[global_id] = {
+                'shard_pos': pos,
+                'offset': offset,
+                'num_yielded': num_yielded,
+            }
+            yield record
+
+    def state_dict(self) -> dict[str, Any]:
+        """
+        Get the state of dataset, which contains the epoch and the cursor
+        of records yielded by each global worker in current process. If
+        called in a DataLoader worker, only the cursor of the worker is
+        contained.
+
+        Returns:
+            dict: the state of dataset.
+        """
+        cursors = self._cursors
+        if get_worker_info() is not None:
+            global_id, _ = self._worker()
+            cursors = {k: v for k, v in self._cursors.items() if k == global_id}
+        return {
+            'epoch': self.epoch,
+            'cursors': {k: dict(v) for k, v in cursors.items()},
+        }
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        """
+        Load the state of dataset, the next iteration of each global worker
+        will resume from its cursor in the state. Cursors of different
+        global workers can be merged into one state, e.g. states collected
+        from all ranks.
+
+        Args:
+            state_dict(dict): the state got by :code:`state_dict`.
+        """
+        self.epoch = state_dict['epoch']
+        self._cursors = {}
+        with self._resume_lock:
+            self._resume_state = {'cursors': dict(state_dict['cursors'])}
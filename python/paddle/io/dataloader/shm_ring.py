@@ -0,0 +1,184 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ctypes
+import os
+
+import numpy as np
+
+from ...framework import core
+
+# NOTE: [ shared memory ring ] In shared memory mode, each batch output
+# by workers is copied into a newly created memory map file, and the main
+# process maps the file again when unpickling the tensors, which costs a
+# pair of mmap/munmap and a page fault storm for each field of each batch.
+# With the shared memory ring, each worker preallocates a fixed number of
+# memory map slots sized from its first batch, writes collated batches
+# into the slots in place and only sends the slot id and field shapes
+# through the result queue. The main process maps each slot only once and
+# wraps the slot memory as tensors without copying. A slot is given back
+# to the worker after the batch that used it has been consumed.
+
+
+def _use_shm_ring():
+    return os.environ.get('FLAGS_dataloader_use_shm_ring', False) in [
+        1,
+        '1',
+        True,
+        'True',
+        'true',
+    ]
+
+
+class _ShmRingBatch:
+    """
+    Message sent through the result queue instead of a tensor list when
+    a batch is written into a shared memory ring slot.
+
+    Args:
+        worker_id(int): id of the worker which owns the slot.
+        slot_id(int): slot index in the worker's ring.
+        metas(list): shared memory meta info of each field in the slot,
+            the same as the output of `_share_filename`.
+        shapes(list): actual shape of each field of this batch.
+    """
+
+    def __init__(self, worker_id, slot_id, metas, shapes):
+        self.worker_id = worker_id
+        self.slot_id = slot_id
+        self.metas = metas
+        self.shapes = shapes
+
+
+class _ShmRingRelease:
+    """
+    Message sent to worker's indices queue to give a slot back to ring.
+    """
+
+    def __init__(self, slot_id):
+        self.slot_id = slot_id
+
+
+class _WorkerShmRing:
+    """
+    Shared memory ring in worker process, slots are allocated lazily from
+    the first batch, each slot holds one shared memory tensor per field.
+
+    Args:
+        worker_id(int): id of the worker owns this ring.
+        num_slots(int): slot number of the ring.
+    """
+
+    def __init__(self, worker_id, num_slots):
+        self._worker_id = worker_id
+        self._num_slots = num_slots
+        self._slots = None
+        self._metas = None
+        self._capacities = None
+        self._dtypes = None
+        self._free_slots = list(range(num_slots))
+        self._sent_slots = set()
+
+    def _init_slots(self, fields):
+        self._slots = []
+        self._metas = []
+        for _ in range(self._num_slots):
+            slot, metas = [], []
+            for field in fields:
+                tensor = core.LoDTensor()
+                tensor.set(np.empty_like(field), core.CPUPlace())
+                # move tensor to a memory map file, the file will be
+                # reused for all batches written to this slot
+                meta = tensor._share_filename(False)
+                slot.append(tensor)
+                metas.append(meta)
+            self._slots.append(slot)
+            self._metas.append(metas)
+        self._capacities = [field.nbytes for field in fields]
+        self._dtypes = [field.dtype for field in fields]
+
+    def _fit(self, fields):
+        if len(fields) != len(self._capacities):
+            return False
+        for field, capacity, dtype in zip(
+            fields, self._capacities, self._dtypes
+        ):
+            if field.dtype != dtype or field.nbytes > capacity:
+                return False
+        return True
+
+    def release(self, slot_id):
+        self._free_slots.append(slot_id)
+
+    def put(self, batch):
+        """
+        Write flattened batch into a free slot. Return a _ShmRingBatch
+        if batch is written into ring, or None if batch cannot be written
+        into ring and should be sent in the common way.
+        """
+        if len(batch) == 0 or not all(
+            isinstance(field, np.ndarray) and field.size > 0 for field in batch
+        ):
+            return None
+
+        if self._slots is None:
+            self._init_slots(batch)
+        if not self._fit(batch) or len(self._free_slots) == 0:
+            return None
+
+        slot_id = self._free_slots.pop(0)
+        for field, tensor in zip(batch, self._slots[slot_id]):
+            field = np.ascontiguousarray(field)
+            ctypes.memmove(tensor._ptr(), field.ctypes.data, field.nbytes)
+            # NOTE: keep the memory map file alive until the main process
+            # maps it, the main process decreases the reference after it
+            # maps the file only once for each slot, which is the same as
+            # tensor reduction in paddle.incubate.multiprocessing
+            if slot_id not in self._sent_slots:
+                tensor._shared_incref()
+        self._sent_slots.add(slot_id)
+        return _ShmRingBatch(
+            self._worker_id,
+            slot_id,
+            self._metas[slot_id],
+            [list(field.shape) for field in batch],
+        )
+
+
+class _MainShmRing:
+    """
+    Shared memory ring viewer in main process, which maps each slot file
+    once and wraps slot memory as tensors for each batch.
+    """
+
+    def __init__(self):
+        self._mapped = {}
+
+    def to_tensors(self, batch):
+        tensors = []
+        for meta, shape in zip(batch.metas, batch.shapes):
+            ipc_name = meta[0]
+            mapped = self._mapped.get(ipc_name)
+            if mapped is None:
+                mapped = core.LoDTensor._new_shared_filename(meta)
+                mapped._shared_decref()
+                self._mapped[ipc_name] = mapped
+            tensor = core.LoDTensor()
+            tensor._share_data_with(mapped)
+            tensor._set_dims(shape)
+            tensors.append(tensor)
+        return tensors
+
+    def clear(self):
+        self._mapped = {}
@@ -16,6 +16,7 @@ from __future__ import annotations
 import os
 import queue
 import sys
+import threading
 import traceback
 from typing import TYPE_CHECKING, Any
 
@@ -31,6 +32,7 @@ from ..multiprocess_utils import (
 )
 from .fetcher import _IterableDatasetFetcher, _MapDatasetFetcher
 from .flat import _flatten_batch
+from .shm_ring import _ShmRingRelease, _WorkerShmRing
 
 if TYPE_CHECKING:
     from paddle.io import Dataset
@@ -42,7 +44,8 @@ class _IterableDatasetStopIteration:
 
 
 class _ResumeIteration:
-    pass
+    def __init__(self, dataset_state=None):
+        self.dataset_state = dataset_state
 
 
 class _DatasetKind:
@@ -65,6 +68,16 @@ class _DatasetKind:
             raise NotImplementedError(f"unknown Dataset kind {kind}")
 
 
+def _iterable_dataset_state(dataset, dataset_kind):
+    # NOTE: state of IterableDataset is updated by the iterator running in
+    #       the worker, which is not visible to the main process, so it is
+    #       sent along with each batch and folded in main process when the
+    #       batch is consumed, see _DataLoaderIterBase._get_structure_info
+    if dataset_kind == _DatasetKind.ITER and hasattr(dataset, 'state_dict'):
+        return dataset.state_dict()
+    return None
+
+
 class ParentWatchDog:
     def __init__(self):
         self._parent_pid = os.getppid()
@@ -80,6 +93,10 @@ class ParentWatchDog:
 # for IteratorDataset in worker processes.
 _worker_info = None
 
+# worker information of worker threads in thread worker mode, each worker
+# thread holds its own worker information in the same process.
+_thread_worker_info = threading.local()
+
 
 def get_worker_info() -> WorkerInfo:
     """
@@ -157,6 +174,9 @@ def get_worker_info() -> WorkerInfo:
             [[5]])
 
     """
+    worker_info = getattr(_thread_worker_info, 'info', None)
+    if worker_info is not None:
+        return worker_info
     return _worker_info
 
 
@@ -293,6 +313,8 @@ def _worker_loop(
     use_shared_memory,
     base_seed,
     shm_cache_size=0,
+    shm_ring_size=0,
+    dataset_state=None,
 ):
     try:
         # NOTE: [ mmap files clear ] When the child process exits unexpectedly,
@@ -328,15 +350,23 @@ def _worker_loop(
         )
 
         init_exception = None
+        fetcher = None
         try:
             if init_fn is not None:
                 init_fn(worker_id)
+            if dataset_state is not None:
+                dataset.load_state_dict(dataset_state)
             fetcher = _DatasetKind.create_fetcher(
                 dataset_kind, dataset, auto_collate_batch, collate_fn, drop_last
             )
         except:
             init_exception = _WorkerException(worker_id)
 
+        # see [ shared memory ring ] in shm_ring.py
+        shm_ring = None
+        if use_shared_memory and shm_ring_size > 0:
+            shm_ring = _WorkerShmRing(worker_id, shm_ring_size)
+
         iterator_drained = False
         parent_watch_dog = ParentWatchDog()
 
@@ -349,9 +379,27 @@ def _worker_loop(
             if isinstance(data, _ResumeIteration):
                 out_queue.put((data, None, None))
                 iterator_drained = False
-                fetcher = _DatasetKind.create_fetcher(
-                    dataset_kind, dataset, auto_collate_batch, collate_fn, True
-                )
+                # NOTE: fetcher of map-style dataset is stateless and kept
+                #       across epochs, only iterator of IterableDataset
+                #       needs to be recreated
+                if dataset_kind == _DatasetKind.ITER or fetcher is None:
+                    try:
+                        if data.dataset_state is not None:
+                            dataset.load_state_dict(data.dataset_state)
+                        fetcher = _DatasetKind.create_fetcher(
+                            dataset_kind,
+                            dataset,
+                            auto_collate_batch,
+                            collate_fn,
+                            drop_last,
+                        )
+                    except:
+                        init_exception = _WorkerException(worker_id)
+                continue
+
+            if isinstance(data, _ShmRingRelease):
+                if shm_ring is not None:
+                    shm_ring.release(data.slot_id)
                 continue
 
             # None as poison piil, so worker event should be set
@@ -391,7 +439,16 @@ def _worker_loop(
                 if isinstance(batch, _WorkerException):
                     out_queue.put((idx, batch, None))
                 batch, structure = _flatten_batch(batch)
-                if use_shared_memory:
+                structure = (
+                    structure,
+                    _iterable_dataset_state(dataset, dataset_kind),
+                )
+                ring_batch = (
+                    shm_ring.put(batch) if shm_ring is not None else None
+                )
+                if ring_batch is not None:
+                    out_queue.put((idx, ring_batch, structure))
+                elif use_shared_memory:
 
                     def numpy2lodtensor(arr):
                         lodtensor = core.Tensor()
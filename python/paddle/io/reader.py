@@ -24,6 +24,7 @@ from typing import (
     Any,
     AnyStr,
     Callable,
+    Literal,
     Protocol,
     TypeVar,
     overload,
@@ -38,11 +39,14 @@ from ..base.framework import (
 )
 from ..framework import core, in_dynamic_mode
 from .dataloader import BatchSampler, IterableDataset, Subset
+from .dataloader.autotune import _AdaptiveAutoTuner
 from .dataloader.batch_sampler import _InfiniteIterableSampler
 from .dataloader.dataloader_iter import (
     _DataLoaderIterMultiProcess,
     _DataLoaderIterSingleProcess,
+    _DataLoaderIterThread,
     _DatasetKind,
+    _iterator_state_dict,
 )
 
 if TYPE_CHECKING:
@@ -89,6 +93,11 @@ USE_PINNED_MEMORY = None
 # AutoTune Flags
 USE_AUTOTUNE = False
 TUNING_STEPS = 500
+# Adaptive AutoTune Flags
+USE_ADAPTIVE_AUTOTUNE = False
+ADAPTIVE_MAX_NUM_WORKERS = None
+ADAPTIVE_MAX_PREFETCH_FACTOR = None
+ADAPTIVE_TUNING_INTERVAL = 50
 
 
 def set_autotune_config(use_autotune, tuning_steps=500):
@@ -98,6 +107,22 @@ def set_autotune_config(use_autotune, tuning_steps=500):
     TUNING_STEPS = tuning_steps
 
 
+def set_adaptive_autotune_config(
+    use_adaptive_autotune,
+    max_num_workers=None,
+    max_prefetch_factor=None,
+    tuning_interval=50,
+):
+    global USE_ADAPTIVE_AUTOTUNE
+    USE_ADAPTIVE_AUTOTUNE = use_adaptive_autotune
+    global ADAPTIVE_MAX_NUM_WORKERS
+    ADAPTIVE_MAX_NUM_WORKERS = max_num_workers
+    global ADAPTIVE_MAX_PREFETCH_FACTOR
+    ADAPTIVE_MAX_PREFETCH_FACTOR = max_prefetch_factor
+    global ADAPTIVE_TUNING_INTERVAL
+    ADAPTIVE_TUNING_INTERVAL = tuning_interval
+
+
 def use_pinned_memory(*args):
     global USE_PINNED_MEMORY
     if len(args) == 0:
@@ -351,13 +376,29 @@ class DataLoader:
             as True only when the shared memory space on your machine(e.g.
             space of '/dev/shm' on Linux operating system) is large enough.
             Shared memory will only be enabled in multi-process mode(num_workers
-            > 0). Default True.
+            > 0). If environment variable :code:`FLAGS_dataloader_use_shm_ring`
+            is set, each worker writes batches into a ring of preallocated
+            shared memory slots which are reused across batches, and the
+            output CPU tensors share memory with the slots, which are only
+            valid until the next batch is read. Default True.
         timeout(int, optional): the timeout value for getting data form output queue
             of subprocesses. Default 0.
         worker_init_fn(Callable|None, optional): init function which will be called with
             worker id on each subprocess starting if not set as None. Default
             None.
-        persistent_workers(bool, optional): whether to keep the workers in the DataLoader. Default False.
+        persistent_workers(bool, optional): whether to keep the workers in the DataLoader
+            across epochs, worker processes, their dataset copies and states
+            initialized by :attr:`worker_init_fn` (e.g. opened files) are
+            reused by following epochs instead of being restarted, for both
+            map-style and iterable datasets. Default False.
+        worker_mode(str, optional): how workers are run when :attr:`num_workers`
+            > 0, can be 'process' or 'thread'. In 'process' mode, each worker
+            is a subprocess. In 'thread' mode, each worker is a thread in main
+            process, batches are handed over by reference without inter-process
+            communication, which is faster for datasets whose loading releases
+            the GIL, e.g. numpy/cv2/PIL based transforms. :attr:`use_shared_memory`
+            and :attr:`persistent_workers` are ignored, and workers share the
+            random state of main process in 'thread' mode. Default 'process'.
 
     Returns:
         DataLoader: an iterable object for data iterating, each element of the generated data is a Tensor.
@@ -463,6 +504,7 @@ class DataLoader:
         timeout: int = 0,
         worker_init_fn: Callable[[int], None] | None = None,
         persistent_workers: bool = False,
+        worker_mode: Literal['process', 'thread'] = 'process',
     ) -> None:
         self.return_list = return_list
         self.collate_fn = collate_fn
@@ -487,8 +529,15 @@ class DataLoader:
         self.places = _convert_places(places)
 
         assert num_workers >= 0, "num_workers should be a non-negative value"
-        if num_workers > 0 and (
-            sys.platform == 'darwin' or sys.platform == 'win32'
+        assert worker_mode in [
+            'process',
+            'thread',
+        ], f"worker_mode should be 'process' or 'thread', but got {worker_mode}"
+        self.worker_mode = worker_mode
+        if (
+            num_workers > 0
+            and worker_mode == 'process'
+            and (sys.platform == 'darwin' or sys.platform == 'win32')
         ):
             warnings.warn(
                 "DataLoader with multi-process mode is not supported on MacOs and Windows currently."
@@ -500,7 +549,7 @@ class DataLoader:
         assert prefetch_factor > 0, "prefetch_factor should be a positive value"
 
         self.use_shared_memory = use_shared_memory
-        if use_shared_memory and num_workers == 0:
+        if use_shared_memory and (num_workers == 0 or worker_mode == 'thread'):
             self.use_shared_memory = False
 
         assert timeout >= 0, "timeout should be a non-negative value"
@@ -558,7 +607,51 @@ class DataLoader:
 
         self._persistent_workers = persistent_workers
         self._iterator = None
+        self._progress = None
+        self._resume_state = None
         self.num_workers = AuToTune(self).__call__()
+        self._adaptive_tuner = self._create_adaptive_tuner()
+
+    def _create_adaptive_tuner(self):
+        # NOTE: worker number decides how IterableDataset is split among
+        # workers, so adaptive autotune only supports map-style dataset
+        if (
+            not USE_ADAPTIVE_AUTOTUNE
+            or self.num_workers == 0
+            or self.worker_mode != 'process'
+            or self.dataset_kind != _DatasetKind.MAP
+        ):
+            return None
+        max_num_workers = ADAPTIVE_MAX_NUM_WORKERS or max(
+            multiprocessing.cpu_count() // 2, 1
+        )
+        max_prefetch_factor = (
+            ADAPTIVE_MAX_PREFETCH_FACTOR or 2 * self.prefetch_factor
+        )
+        return _AdaptiveAutoTuner(
+            num_workers=self.num_workers,
+            max_num_workers=max(max_num_workers, self.num_workers),
+            prefetch_factor=self.prefetch_factor,
+            max_prefetch_factor=max(max_prefetch_factor, self.prefetch_factor),
+            interval=ADAPTIVE_TUNING_INTERVAL,
+        )
+
+    def autotune_metrics(self) -> list[dict[str, Any]]:
+        """
+        Get the decisions made by adaptive autotune of DataLoader, which
+        can be enabled by :code:`paddle.incubate.autotune.set_config` with
+        :code:`{"dataloader": {"adaptive": True}}`.
+
+        Returns:
+            list[dict]: one record for each tuning window, which contains
+            the step, the ratio of time waiting for data, the ratio of
+            blocking queue depth, and active num_workers and
+            prefetch_factor after the window. Empty list will be returned
+            if adaptive autotune is not enabled.
+        """
+        if self._adaptive_tuner is None:
+            return []
+        return list(self._adaptive_tuner.metrics)
 
     def __len__(self) -> int:
         if self.dataset_kind == _DatasetKind.ITER:
@@ -571,15 +664,112 @@ class DataLoader:
 
     def __iter__(self) -> _DataLoaderIterBase:
         if self.num_workers == 0:
-            return _DataLoaderIterSingleProcess(self)
+            iterator = _DataLoaderIterSingleProcess(self)
+        elif self.worker_mode == 'thread':
+            iterator = _DataLoaderIterThread(self)
         elif self._persistent_workers:
             if self._iterator is None:
                 self._iterator = _DataLoaderIterMultiProcess(self)
             else:
-                self._iterator._reset()
-            return self._iterator
+                self._iterator._reset(self._resume_state)
+            iterator = self._iterator
         else:
-            return _DataLoaderIterMultiProcess(self)
+            iterator = _DataLoaderIterMultiProcess(self)
+        self._resume_state = None
+        return iterator
+
+    def state_dict(self) -> dict[str, Any]:
+        """
+        Get the state of the latest iterator of DataLoader, which can be
+        saved with checkpoint and loaded by :code:`load_state_dict` to
+        resume data loading from the next batch after the last consumed
+        one. IterableDataset is supported only if it implements
+        :code:`state_dict` and :code:`load_state_dict`, e.g.
+        :ref:`api_paddle_io_ShardedIterableDataset`.
+
+        The state only contains the number of batches consumed in current
+        epoch and the state of batch sampler, e.g. the numpy random state
+        used by :ref:`api_paddle_io_RandomSampler` to shuffle indices. For
+        IterableDataset, the state of dataset got in the worker after each
+        consumed batch is contained instead, states of different workers
+        are merged key by key. Batches prefetched but not consumed are not
+        saved and will be loaded again after resuming.
+
+        Returns:
+            dict: the state of DataLoader.
+
+        Examples:
+            .. code-block:: python
+
+                >>> import numpy as np
+                >>> from paddle.io import Dataset, DataLoader
+
+                >>> class RandomDataset(Dataset):  # type: ignore[type-arg]
+                ...     def __init__(self, num_samples):
+                ...         self.num_samples = num_samples
+                ...
+                ...     def __getitem__(self, idx):
+                ...         return np.array([idx]).astype('int64')
+                ...
+                ...     def __len__(self):
+                ...         return self.num_samples
+                ...
+                >>> loader = DataLoader(RandomDataset(100), batch_size=10,
+                ...                     shuffle=True)
+                >>> for i, data in enumerate(loader):
+                ...     if i == 2:
+                ...         state = loader.state_dict()
+                ...         break
+
+                >>> new_loader = DataLoader(RandomDataset(100), batch_size=10,
+                ...                         shuffle=True)
+                >>> new_loader.load_state_dict(state)
+                >>> print(len(list(new_loader)))
+                7
+        """
+        if self.dataset_kind == _DatasetKind.ITER:
+            if not hasattr(self.dataset, 'state_dict'):
+                raise ValueError(
+                    "state_dict of IterableDataset without state_dict not supported"
+                )
+            dataset_state = None
+            if self._progress is not None:
+                dataset_state = copy.deepcopy(self._progress['dataset_state'])
+            return {
+                'num_batches_yielded': (
+                    0
+                    if self._progress is None
+                    else self._progress['num_batches_yielded']
+                ),
+                'sampler_state': None,
+                'dataset_state': dataset_state,
+            }
+        if self._progress is None:
+            return {'num_batches_yielded': 0, 'sampler_state': None}
+        return _iterator_state_dict(
+            self.batch_sampler if self.auto_collate_batch else None,
+            self._progress,
+        )
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        """
+        Load the state got by :code:`state_dict`, the next iteration of
+        DataLoader will start from the batch after the last consumed one
+        when the state is saved. For IterableDataset, the state of dataset
+        is loaded by its :code:`load_state_dict` when the next iteration
+        starts, by the dataset copy in each worker process if
+        :attr:`num_workers` > 0 in process worker mode, so only the next
+        iteration is resumed.
+
+        Args:
+            state_dict(dict): the state of DataLoader.
+        """
+        if self.dataset_kind == _DatasetKind.ITER:
+            if not hasattr(self.dataset, 'load_state_dict'):
+                raise ValueError(
+                    "load_state_dict of IterableDataset without load_state_dict not supported"
+                )
+        self._resume_state = dict(state_dict)
 
     def __call__(self) -> _DataLoaderIterBase:
         return self.__iter__()
@@ -0,0 +1,150 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# The automatic dynamic shape of `paddle.jit.to_static` , which is enabled by
+# setting the environment variable `PADDLE_JIT_DYNAMIC_SHAPE_THRESHOLD` or
+# calling `set_dynamic_shape_threshold`. Once a dimension of an input has
+# been seen with `threshold` distinct sizes, it is marked as -1 in the
+# `CacheKey` of all following calls, so a generalized program is built once
+# and reused for all sizes, instead of a program for each size. Inputs can
+# be padded to a few bucket boundaries by `pad_to_bucket` in addition, so
+# that the sizes seen by a program are bounded by the number of buckets.
+
+from __future__ import annotations
+
+import bisect
+import os
+
+import paddle
+from paddle.static import InputSpec
+from paddle.utils import flatten, pack_sequence_as
+
+from . import logging_utils
+
+__all__ = []
+
+DYNAMIC_SHAPE_THRESHOLD_ENV = "PADDLE_JIT_DYNAMIC_SHAPE_THRESHOLD"
+
+_threshold = None
+
+
+def set_dynamic_shape_threshold(threshold):
+    """
+    Set the number of distinct sizes of a dimension before it is marked as
+    dynamic, 0 to disable it and None to use the environment variable
+    `PADDLE_JIT_DYNAMIC_SHAPE_THRESHOLD` .
+    """
+    global _threshold
+    _threshold = threshold
+
+
+def get_dynamic_shape_threshold():
+    if _threshold is not None:
+        return _threshold
+    return int(os.environ.get(DYNAMIC_SHAPE_THRESHOLD_ENV, "0"))
+
+
+class DynamicShapePolicy:
+    """
+    Records the sizes of each dimension of the inputs of a `StaticFunction` ,
+    and generalizes the dimensions with too many distinct sizes to -1.
+    """
+
+    def __init__(self):
+        # {(index, name, axis): distinct sizes}
+        self._sizes = {}
+        self._dynamic_dims = set()
+
+    def generalize(self, input_args_with_spec, input_kwargs_with_spec):
+        """
+        Returns the input specs with the dynamic dimensions replaced by -1,
+        the specs are not changed in place.
+        """
+        threshold = get_dynamic_shape_threshold()
+        if threshold <= 0:
+            return input_args_with_spec, input_kwargs_with_spec
+
+        structure = (input_args_with_spec, input_kwargs_with_spec)
+        specs = []
+        for index, spec in enumerate(flatten(structure)):
+            if isinstance(spec, InputSpec):
+                spec = self._generalize_spec(index, spec, threshold)
+            specs.append(spec)
+        return pack_sequence_as(structure, specs)
+
+    def _generalize_spec(self, index, spec, threshold):
+        shape = list(spec.shape)
+        for axis, size in enumerate(shape):
+            if size == -1:
+                continue
+            dim = (index, spec.name, axis)
+            if dim not in self._dynamic_dims:
+                sizes = self._sizes.setdefault(dim, set())
+                sizes.add(size)
+                if len(sizes) < threshold:
+                    continue
+                self._dynamic_dims.add(dim)
+                del self._sizes[dim]
+                logging_utils.log(
+                    2,
+                    f"Mark axis {axis} of input `{spec.name}` as dynamic after {threshold} distinct sizes.",
+                )
+            shape[axis] = -1
+        if shape == list(spec.shape):
+            return spec
+        return InputSpec(shape, spec.dtype, spec.name, spec.stop_gradient)
+
+    @property
+    def dynamic_dims(self):
+        """
+        The (name, axis) of the dimensions which are marked as dynamic.
+        """
+        return sorted((name, axis) for _, name, axis in self._dynamic_dims)
+
+
+def pad_to_bucket(x, buckets, axis=0, value=0):
+    """
+    Pad `x` along `axis` to the smallest boundary in `buckets` that is not
+    less than its size, so that a function called with inputs of various
+    sizes only sees the sizes in `buckets` . `x` is returned as is if its
+    size is larger than all boundaries.
+
+    Args:
+        x(Tensor): The tensor to pad.
+        buckets(list[int]): The bucket boundaries in ascending order.
+        axis(int): The axis to pad, default 0.
+        value(float): The value to pad, default 0.
+
+    Returns:
+        Tensor, the padded tensor.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> from paddle.jit.dy2static.dynamic_shape import pad_to_bucket
+            >>> x = paddle.ones([2, 5])
+            >>> pad_to_bucket(x, [4, 8, 16], axis=1).shape
+            [2, 8]
+    """
+    axis = axis if axis >= 0 else axis + len(x.shape)
+    size = x.shape[axis]
+    position = bisect.bisect_left(buckets, size)
+    if position == len(buckets) or buckets[position] == size:
+        return x
+    pad = [0] * (2 * len(x.shape))
+    pad[2 * axis + 1] = buckets[position] - size
+    return paddle.nn.functional.pad(
+        x, pad, mode="constant", value=value, pad_from_left_axis=True
+    )
@@ -0,0 +1,552 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# The persistent cache of programs built by `paddle.jit.to_static`, which is
+# enabled by setting the environment variable `PADDLE_JIT_CACHE_DIR` or
+# calling `set_cache_dir`. Each entry is a directory named by the hash of
+#
+#   - the source files of the non-paddle modules reached from the function
+#     and the classes of the layer, see `_source_files` ,
+#   - the closure cells, defaults and referenced globals of the function
+#     and of the functions referenced by it recursively,
+#   - the non-tensor attributes of the layer and its sublayers, e.g. the
+#     probability of `Dropout` or the epsilon of `LayerNorm` ,
+#   - the input specs and non-tensor arguments of the `CacheKey`,
+#   - the options and flags that affect the program,
+#   - the names, shapes and dtypes of parameters of the layer,
+#   - the version of Paddle,
+#
+# which contains the serialized main program and the metadata to restore
+# the inputs, outputs and parameters of `ConcreteProgram`. An entry is
+# written to a temporary directory first and renamed, so concurrent
+# processes never read a partial entry. Anything which can not be hashed
+# stably, such as objects whose repr contains their address and which have
+# no attributes to hash instead, or layers with forward hooks, disables the
+# cache for the key, and the program is built by tracing as usual.
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import sys
+import sysconfig
+import tempfile
+import types
+
+import numpy as np
+
+import paddle
+import paddle.pir.core as ir_static
+from paddle.base import core, framework
+from paddle.framework import use_pir_api
+from paddle.pir import Value
+from paddle.utils import flatten, pack_sequence_as
+
+from . import logging_utils
+
+__all__ = []
+
+CACHE_DIR_ENV = "PADDLE_JIT_CACHE_DIR"
+# Bump it when the layout of entries is changed.
+CACHE_FORMAT_VERSION = 1
+
+_META_FILE = "meta.pkl"
+_PROGRAM_FILE = "program"
+
+# The bookkeeping attributes of `Layer` , which do not affect the program or
+# are hashed separately, e.g. parameters and sublayers.
+_LAYER_INTERNAL_ATTRS = {
+    "_full_name",
+    "_helper",
+    "_built",
+    "_init_in_dynamic_mode",
+    "_parameters",
+    "_buffers",
+    "_non_persistable_buffer_names_set",
+    "_sub_layers",
+    "_loaddict_holder",
+    "_op_recorder",
+    "_forward_pre_hooks",
+    "_forward_post_hooks",
+    "_state_dict_hooks",
+    "_original_funcs",
+}
+# The max depth of nested objects to hash.
+_MAX_DEPTH = 8
+
+_cache_dir = None
+
+
+def set_cache_dir(path):
+    """
+    Set the directory of the persistent cache, None to disable it. It
+    overrides the environment variable `PADDLE_JIT_CACHE_DIR` .
+    """
+    global _cache_dir
+    _cache_dir = path
+
+
+def get_cache_dir():
+    if _cache_dir is not None:
+        return _cache_dir
+    return os.environ.get(CACHE_DIR_ENV) or None
+
+
+class _Unstable(Exception):
+    pass
+
+
+def _stable_repr(obj):
+    text = repr(obj)
+    # the address of an object changes between processes
+    if " at 0x" in text:
+        raise _Unstable(text)
+    return text
+
+
+def _spec_repr(spec):
+    # The builtin hash of str and bytes is salted in each process, so the
+    # specs are hashed by their text instead of `make_hashable` .
+    if isinstance(spec, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(spec).tobytes())
+        return f"ndarray({spec.dtype}, {spec.shape}, {digest.hexdigest()})"
+    if isinstance(spec, (list, tuple)):
+        items = ", ".join(_spec_repr(item) for item in spec)
+        return f"{type(spec).__name__}({items})"
+    if isinstance(spec, dict):
+        items = ", ".join(
+            f"{_stable_repr(key)}: {_spec_repr(value)}"
+            for key, value in spec.items()
+        )
+        return f"{{{items}}}"
+    return _stable_repr(spec)
+
+
+def _code_repr(code):
+    consts = ", ".join(
+        _code_repr(c) if isinstance(c, types.CodeType) else _stable_repr(c)
+        for c in code.co_consts
+    )
+    digest = hashlib.sha256(code.co_code).hexdigest()
+    return f"code({code.co_name}, {digest}, [{consts}])"
+
+
+def _global_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _object_repr(obj, modules, depth=0, visiting=None):
+    # A text of `obj` which is the same in different processes, objects
+    # are hashed by their attributes if their repr contains the address.
+    # The names of modules reached are added to `modules` , whose source
+    # files are hashed by `_source_files` .
+    from .program_translator import StaticFunction
+
+    if depth > _MAX_DEPTH:
+        raise _Unstable(f"{type(obj)} is nested too deep.")
+    visiting = set() if visiting is None else visiting
+    if id(obj) in visiting:
+        return "<cycle>"
+
+    def nested(value):
+        return _object_repr(value, modules, depth + 1, visiting)
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        return repr(obj)
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return _spec_repr(obj) if isinstance(obj, np.ndarray) else repr(obj)
+    if isinstance(obj, (core.eager.Tensor, framework.Variable, Value)):
+        return f"Tensor({tuple(obj.shape)}, {obj.dtype})"
+    if isinstance(obj, paddle.nn.Layer):
+        # sublayers are hashed by `_layer_attributes`
+        return f"Layer({type(obj).__qualname__})"
+    if isinstance(obj, types.ModuleType):
+        modules.add(obj.__name__)
+        return f"module({obj.__name__})"
+    if isinstance(obj, type):
+        modules.add(obj.__module__)
+        return f"{obj.__module__}.{obj.__qualname__}"
+    if isinstance(obj, types.CodeType):
+        return _code_repr(obj)
+    if isinstance(obj, StaticFunction):
+        return nested(obj._dygraph_function)
+    if isinstance(obj, types.MethodType):
+        return (
+            f"method({nested(obj.__func__)}, {type(obj.__self__).__qualname__})"
+        )
+    if isinstance(obj, types.BuiltinFunctionType):
+        modules.add(obj.__module__)
+        return f"{obj.__module__}.{obj.__qualname__}"
+
+    visiting.add(id(obj))
+    try:
+        if isinstance(obj, types.FunctionType):
+            modules.add(obj.__module__)
+            cells = []
+            for cell in obj.__closure__ or ():
+                try:
+                    cells.append(nested(cell.cell_contents))
+                except ValueError:
+                    cells.append("<empty>")
+            # the globals are hashed at the same depth as the function, so
+            # a chain of helpers calling each other is not nested too deep
+            global_values = sorted(
+                f"{name}: {_object_repr(obj.__globals__[name], modules, depth, visiting)}"
+                for name in _global_names(obj.__code__)
+                if name in obj.__globals__
+            )
+            return (
+                f"function({obj.__module__}.{obj.__qualname__}, "
+                f"{_code_repr(obj.__code__)}, "
+                f"{nested(obj.__defaults__)}, {nested(obj.__kwdefaults__)}, "
+                f"[{', '.join(cells)}], {{{', '.join(global_values)}}})"
+            )
+        if isinstance(obj, (list, tuple)):
+            items = ", ".join(nested(item) for item in obj)
+            return f"{type(obj).__name__}({items})"
+        if isinstance(obj, (set, frozenset)):
+            items = ", ".join(sorted(nested(item) for item in obj))
+            return f"{type(obj).__name__}({items})"
+        if isinstance(obj, dict):
+            items = sorted(
+                f"{nested(key)}: {nested(value)}" for key, value in obj.items()
+            )
+            return f"{type(obj).__name__}({', '.join(items)})"
+        text = repr(obj)
+        if " at 0x" not in text:
+            return text
+        if not hasattr(obj, "__dict__"):
+            raise _Unstable(text)
+        return f"{type(obj).__qualname__}({nested(vars(obj))})"
+    finally:
+        visiting.discard(id(obj))
+
+
+def _function_context(function, modules):
+    # The values captured by the function and the functions referenced by
+    # it, which are baked into the program but not covered by the source.
+    return _object_repr(getattr(function, "__func__", function), modules)
+
+
+def _layer_attributes(class_instance, modules):
+    attributes = []
+    for name, layer in class_instance.named_sublayers(include_self=True):
+        if layer._forward_pre_hooks or layer._forward_post_hooks:
+            raise _Unstable(f"{name} has forward hooks.")
+        attrs = {
+            key: value
+            for key, value in vars(layer).items()
+            if key not in _LAYER_INTERNAL_ATTRS
+        }
+        attributes.append(
+            f"{name}: {type(layer).__qualname__}"
+            f"{_object_repr(attrs, modules)}"
+        )
+        for cls in type(layer).__mro__:
+            modules.add(cls.__module__)
+    return attributes
+
+
+def _source_files(modules):
+    # The source files of the modules reached from the function and the
+    # layer. The globals of user modules are walked recursively, so the
+    # helpers in other modules, which are called by the helpers in these
+    # modules, are covered as well. The framework itself is covered by the
+    # version and the installed packages are not walked.
+    # the standard library and installed packages
+    installed_roots = tuple(
+        os.path.realpath(root) + os.sep
+        for root in {
+            sysconfig.get_path(key)
+            for key in ("stdlib", "platstdlib", "purelib", "platlib")
+        }
+        if root
+    )
+    files = set()
+    pending = list(modules)
+    visited = set()
+    while pending:
+        name = pending.pop()
+        if name is None or name in visited or name.split(".")[0] == "paddle":
+            continue
+        visited.add(name)
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        path = getattr(module, "__file__", None)
+        # builtin modules and namespace packages have no file
+        if path is None:
+            continue
+        files.add(os.path.abspath(path))
+        if os.path.realpath(path).startswith(installed_roots):
+            continue
+        for key, value in list(vars(module).items()):
+            # e.g. __loader__ and __builtins__
+            if key.startswith("__"):
+                continue
+            if isinstance(value, types.ModuleType):
+                pending.append(value.__name__)
+            elif isinstance(value, (type, types.FunctionType)):
+                pending.append(getattr(value, "__module__", None))
+            else:
+                pending.append(type(value).__module__)
+    return sorted(files)
+
+
+def _parameters(class_instance):
+    if class_instance is None:
+        return {}
+    tensors = {}
+    for tensor in [*class_instance.parameters(), *class_instance.buffers()]:
+        tensors[tensor.name] = tensor
+    return tensors
+
+
+def _entry_key(cache_key):
+    function = cache_key.function_spec.dygraph_function
+    class_instance = cache_key.class_instance
+    hasher = hashlib.sha256()
+
+    def update(*items):
+        for item in items:
+            hasher.update(_stable_repr(item).encode())
+
+    update(
+        CACHE_FORMAT_VERSION,
+        paddle.version.full_version,
+        paddle.version.commit,
+        use_pir_api(),
+        getattr(function, "__qualname__", None),
+    )
+    hasher.update(inspect.getsource(function).encode())
+    modules = {getattr(function, "__module__", None)}
+    hasher.update(_function_context(function, modules).encode())
+
+    hasher.update(_spec_repr(cache_key.input_args_with_spec).encode())
+    hasher.update(_spec_repr(cache_key.input_kwargs_with_spec).encode())
+
+    tracer = framework._dygraph_tracer()
+    kwargs = cache_key.kwargs
+    update(
+        kwargs.get("with_hook", False),
+        kwargs.get("is_train", False),
+        kwargs.get("backend"),
+        kwargs["build_strategy"].build_cinn_pass,
+        cache_key._pir_flags,
+        core._is_fwd_prim_enabled(),
+        core._is_bwd_prim_enabled(),
+        tracer._amp_level if tracer is not None else None,
+        tracer._amp_dtype if tracer is not None else None,
+    )
+    if class_instance is not None:
+        update(
+            type(class_instance).__qualname__,
+            class_instance.training,
+            _layer_attributes(class_instance, modules),
+            [
+                (name, tuple(t.shape), str(t.dtype), t.stop_gradient)
+                for name, t in sorted(_parameters(class_instance).items())
+            ],
+        )
+    for path in _source_files(modules):
+        with open(path, "rb") as f:
+            hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def _value_positions(program):
+    positions = []
+    for op_index, op in enumerate(program.global_block().ops):
+        for result_index in range(op.num_results()):
+            positions.append(
+                ((op_index, result_index), op.result(result_index))
+            )
+    return positions
+
+
+def _encode_value(value, positions):
+    for position, result in positions:
+        if result.is_same(value):
+            return ("value", position)
+    raise _Unstable(f"{value} is not in the global block.")
+
+
+def _encode(structure, positions):
+    # Variables and values of the program are replaced by their locations,
+    # other leaves are kept if they can be pickled.
+    leaves = []
+    for leaf in flatten(structure):
+        if isinstance(leaf, Value):
+            leaves.append(_encode_value(leaf, positions))
+        elif isinstance(leaf, framework.Variable):
+            leaves.append(("variable", leaf.name))
+        elif isinstance(leaf, (core.eager.Tensor, paddle.nn.Layer)):
+            raise _Unstable(f"{type(leaf)} in inputs or outputs.")
+        else:
+            pickle.dumps(leaf)
+            leaves.append(("object", leaf))
+    return leaves
+
+
+def _decode(structure, leaves, main_program):
+    values = []
+    ops = main_program.global_block().ops if use_pir_api() else None
+    for kind, leaf in leaves:
+        if kind == "value":
+            op_index, result_index = leaf
+            values.append(ops[op_index].result(result_index))
+        elif kind == "variable":
+            values.append(main_program.global_block().var(leaf))
+        else:
+            values.append(leaf)
+    return pack_sequence_as(structure, values)
+
+
+def _skeleton(structure):
+    # the structure without leaves, which is pickled with the leaves
+    return pack_sequence_as(structure, [None] * len(flatten(structure)))
+
+
+def save_program(cache_key, concrete_program):
+    """
+    Save the `concrete_program` built for `cache_key` to the persistent
+    cache, do nothing if the cache is disabled or the program can not be
+    restored from the cache.
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return
+    try:
+        entry_key = _entry_key(cache_key)
+    except (_Unstable, OSError, TypeError, ValueError):
+        return
+    entry_dir = os.path.join(cache_dir, entry_key)
+    if os.path.exists(entry_dir):
+        return
+
+    main_program = concrete_program.main_program
+    class_instance = cache_key.class_instance
+    inputs = list(concrete_program.inputs)
+    if class_instance is not None:
+        inputs = inputs[1:]
+    try:
+        if use_pir_api():
+            positions = _value_positions(main_program)
+            params, param_values = concrete_program.parameters
+            param_values = _encode(list(param_values), positions)
+        else:
+            positions = None
+            params, param_values = concrete_program.parameters, None
+        live_params = _parameters(class_instance)
+        for param in params:
+            if live_params.get(param.name) is not param:
+                raise _Unstable(f"{param.name} is not a parameter of layer.")
+        input_leaves = _encode(inputs, positions)
+        output_leaves = _encode(concrete_program.outputs, positions)
+    except (_Unstable, pickle.PicklingError, TypeError, AttributeError):
+        return
+    meta = {
+        "format_version": CACHE_FORMAT_VERSION,
+        "inputs": (_skeleton(inputs), input_leaves),
+        "outputs": (_skeleton(concrete_program.outputs), output_leaves),
+        "parameters": [param.name for param in params],
+        "parameter_values": param_values,
+    }
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{entry_key}.", dir=cache_dir)
+    try:
+        program_path = os.path.join(tmp_dir, _PROGRAM_FILE)
+        if use_pir_api():
+            core.serialize_pir_program(main_program, program_path, 1)
+        else:
+            main_program.desc.flush()
+            with open(program_path, "wb") as f:
+                f.write(main_program.desc.serialize_to_string())
+        with open(os.path.join(tmp_dir, _META_FILE), "wb") as f:
+            pickle.dump(meta, f)
+        os.rename(tmp_dir, entry_dir)
+        logging_utils.log(2, f"Saved the program to the cache: {entry_dir}")
+    except OSError:
+        # saved by another process at the same time
+        pass
+    finally:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load_program(cache_key):
+    """
+    Load the program of `cache_key` from the persistent cache.
+
+    Returns:
+        dict|None: The inputs, outputs, parameters and main_program of the
+        `ConcreteProgram` , or None if it is not cached.
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    try:
+        entry_dir = os.path.join(cache_dir, _entry_key(cache_key))
+    except (_Unstable, OSError, TypeError, ValueError):
+        return None
+    if not os.path.isdir(entry_dir):
+        return None
+
+    class_instance = cache_key.class_instance
+    try:
+        with open(os.path.join(entry_dir, _META_FILE), "rb") as f:
+            meta = pickle.load(f)
+        if meta["format_version"] != CACHE_FORMAT_VERSION:
+            return None
+        live_params = _parameters(class_instance)
+        params = [live_params[name] for name in meta["parameters"]]
+
+        program_path = os.path.join(entry_dir, _PROGRAM_FILE)
+        if use_pir_api():
+            main_program = ir_static.Program()
+            core.deserialize_pir_program(program_path, main_program, 1)
+            param_values = _decode(
+                [None] * len(meta["parameter_values"]),
+                meta["parameter_values"],
+                main_program,
+            )
+            parameters = (params, param_values)
+        else:
+            with open(program_path, "rb") as f:
+                main_program = framework.Program.parse_from_string(f.read())
+            parameters = params
+        inputs = _decode(*meta["inputs"], main_program)
+        outputs = _decode(*meta["outputs"], main_program)
+    except Exception as e:
+        # a broken entry is ignored and the program is built again
+        logging_utils.warn(f"Failed to load the program from {entry_dir}: {e}")
+        return None
+
+    if class_instance is not None:
+        inputs = [class_instance, *inputs]
+    logging_utils.log(2, f"Loaded the program from the cache: {entry_dir}")
+    return {
+        "inputs": inputs,
+        "outputs": outputs,
+        "parameters": parameters,
+        "main_program": main_program,
+    }
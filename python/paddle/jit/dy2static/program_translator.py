@@ -16,11 +16,13 @@ from __future__ import annotations
 
 import collections
 import inspect
+import os
 import threading
 import warnings
 import weakref
 from typing import TYPE_CHECKING, Any, Callable, Generic, TypeVar
 
+import numpy as np
 from typing_extensions import ParamSpec, Self
 
 import paddle
@@ -39,7 +41,8 @@ from paddle.pir import Value
 from paddle.pir.core import _convert_into_value, static_op_arg_cast_guard
 from paddle.utils import flatten, gast
 
-from . import error, logging_utils
+from . import error, logging_utils, persistent_cache
+from .dynamic_shape import DynamicShapePolicy
 from .function_spec import (
     FunctionSpec,
     _hash_spec_names,
@@ -86,6 +89,19 @@ __all__ = []
 # Once exceeding the threshold, we will raise warning to users to make sure the conversion is as expected.
 MAX_TRACED_PROGRAM_COUNT = 10
 
+# The capacity of the ProgramCache of each function, the least recently used programs are evicted once the number of
+# programs or their estimated bytes exceeds it. 0 means unlimited, which is the default.
+PROGRAM_CACHE_MAX_ENTRIES = int(
+    os.environ.get("PADDLE_JIT_PROGRAM_CACHE_MAX_ENTRIES", "0")
+)
+PROGRAM_CACHE_MAX_BYTES = (
+    int(os.environ.get("PADDLE_JIT_PROGRAM_CACHE_MAX_MB", "0")) << 20
+)
+# The estimated bytes of each op in the main program, including the forward and backward programs derived from it.
+ESTIMATED_BYTES_PER_OP = 4096
+# The number of latest retraces whose reasons are kept in the report of ProgramCache.
+MAX_RETRACE_RECORDS = 16
+
 CONVERSION_OPTIONS = "__jst_not_to_static"
 
 
@@ -372,6 +388,7 @@ class StaticFunction(Generic[_InputT, _RetT]):
         self._input_spec = input_spec
         self._function_spec = FunctionSpec(function, input_spec)
         self._program_cache = ProgramCache()
+        self._shape_policy = DynamicShapePolicy()
         self._descriptor_cache = weakref.WeakKeyDictionary()
         # Note: Hold a reference to ProgramTranslator for switching `enable_to_static`.
         self._program_trans = ProgramTranslator()
@@ -860,6 +877,14 @@ class ASTStaticFunction(StaticFunction[_InputT, _RetT]):
             input_args_with_spec,
             input_kwargs_with_spec,
         ) = self._function_spec.args_to_input_spec(args, kwargs)
+        # the dimensions of inputs with too many sizes are generalized to -1
+        if self._input_spec is None and not is_prim_infer:
+            (
+                input_args_with_spec,
+                input_kwargs_with_spec,
+            ) = self._shape_policy.generalize(
+                input_args_with_spec, input_kwargs_with_spec
+            )
 
         # 2. generate cache key
         cache_key = CacheKey(
@@ -1371,6 +1396,31 @@ class ConcreteProgram:
             **kwargs,
         )
 
+    @staticmethod
+    @switch_to_static_graph
+    def from_cached_program(cache_key, cached_program):
+        """
+        Builds the ConcreteProgram from the program loaded from the persistent
+        cache without tracing, see `persistent_cache.load_program` .
+        """
+        if use_pir_api():
+            startup_program = ir_static.Program()
+        else:
+            startup_program = framework.Program()
+        main_program = cached_program["main_program"]
+        main_program.random_seed = (
+            paddle.static.default_main_program().random_seed
+        )
+        return ConcreteProgram(
+            inputs=cached_program["inputs"],
+            outputs=cached_program["outputs"],
+            parameters=cached_program["parameters"],
+            function=cache_key.function_spec.dygraph_function,
+            main_program=main_program,
+            startup_program=startup_program,
+            **cache_key.kwargs,
+        )
+
 
 def _program_hash(program):
     """
@@ -1548,23 +1598,125 @@ class PirAutoRecomputeHooker(PirPartialProgramLayerHook):
         return whole_program, forward_end_idx, src_vars
 
 
+def _estimate_program_bytes(program):
+    if isinstance(program, framework.Program):
+        num_ops = sum(len(block.ops) for block in program.blocks)
+    else:
+        num_ops = program.num_ops()
+    return num_ops * ESTIMATED_BYTES_PER_OP
+
+
+def _short_repr(value, limit=80):
+    text = repr(value)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _diff_specs(prefix, old, new, diffs):
+    """
+    Append the fields different between the specs of two cache keys.
+    """
+    from paddle.static import InputSpec
+
+    if isinstance(old, InputSpec) and isinstance(new, InputSpec):
+        for field in ['shape', 'dtype', 'name', 'stop_gradient']:
+            old_value, new_value = getattr(old, field), getattr(new, field)
+            if old_value != new_value:
+                diffs.append(
+                    f"{prefix}.{field}: {_short_repr(old_value)} -> {_short_repr(new_value)}"
+                )
+    elif (
+        isinstance(old, (list, tuple))
+        and isinstance(new, (list, tuple))
+        and len(old) == len(new)
+    ):
+        for i, (old_item, new_item) in enumerate(zip(old, new)):
+            _diff_specs(f"{prefix}[{i}]", old_item, new_item, diffs)
+    elif (
+        isinstance(old, dict)
+        and isinstance(new, dict)
+        and old.keys() == new.keys()
+    ):
+        for key in old:
+            _diff_specs(f"{prefix}[{key!r}]", old[key], new[key], diffs)
+    else:
+        if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+            equal = np.array_equal(old, new)
+        else:
+            try:
+                equal = type(old) is type(new) and bool(old == new)
+            except Exception:
+                equal = False
+        if not equal:
+            diffs.append(f"{prefix}: {_short_repr(old)} -> {_short_repr(new)}")
+
+
+def diff_cache_keys(old, new):
+    """
+    Get the fields different between two cache keys of the same function,
+    which explains why a program is retraced.
+    """
+    diffs = []
+    _diff_specs(
+        "args", old.input_args_with_spec, new.input_args_with_spec, diffs
+    )
+    _diff_specs(
+        "kwargs", old.input_kwargs_with_spec, new.input_kwargs_with_spec, diffs
+    )
+    for name in ['is_train', 'with_hook']:
+        old_value = old.kwargs.get(name, False)
+        new_value = new.kwargs.get(name, False)
+        if old_value != new_value:
+            diffs.append(f"{name}: {old_value} -> {new_value}")
+    if old._pir_flags != new._pir_flags:
+        diffs.append(f"pir_flags: {old._pir_flags} -> {new._pir_flags}")
+    if old.class_instance is not new.class_instance:
+        diffs.append("class_instance")
+    return diffs
+
+
 class ProgramCache:
     """
     Wrapper class for the program functions defined by dygraph function.
+
+    Programs are kept in least recently used order. Once the number of
+    programs exceeds `max_entries` or their estimated bytes exceeds
+    `max_bytes` , the least recently used programs are evicted, and traced
+    again when they are used. 0 means unlimited, and the default values are
+    `PROGRAM_CACHE_MAX_ENTRIES` and `PROGRAM_CACHE_MAX_BYTES` .
     """
 
-    def __init__(self):
+    def __init__(self, max_entries=None, max_bytes=None):
         # {hash_id : (concrete_program, partial_layer)}
         self._caches = collections.OrderedDict()
+        # {hash_id : (cache_key, estimated bytes)}
+        self._entries = {}
         # trace mostly recent used program
         self._recent_key = None
         self._recent_cache_key = None
+        self.max_entries = (
+            PROGRAM_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.max_bytes = (
+            PROGRAM_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        )
+        self._function_name = None
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._retraces = 0
+        self._evictions = 0
+        self._retrace_records = collections.deque(maxlen=MAX_RETRACE_RECORDS)
 
     def _build_once(self, cache_key):
         # TODO(Aurelius84): Need a gloabl FLAGS to enable/disable to_prim
         enable_prim = cache_key.kwargs['build_strategy'].build_cinn_pass
 
-        if use_pir_api():
+        cached_program = persistent_cache.load_program(cache_key)
+        if cached_program is not None:
+            concrete_program = ConcreteProgram.from_cached_program(
+                cache_key, cached_program
+            )
+        elif use_pir_api():
             concrete_program = ConcreteProgram.pir_from_func_spec(
                 func_spec=cache_key.function_spec,
                 input_spec=cache_key.input_args_with_spec,
@@ -1580,6 +1732,10 @@ class ProgramCache:
                 class_instance=cache_key.class_instance,
                 **cache_key.kwargs,
             )
+        if cached_program is None and (
+            use_pir_api() or not ProgramTranslator.get_instance()._amp_records
+        ):
+            persistent_cache.save_program(cache_key, concrete_program)
 
         backend = cache_key.kwargs['backend']
         if (
@@ -1624,20 +1780,79 @@ class ProgramCache:
                 f'type(item) should be CacheKey, but received {type_name(item)}'
             )
         item_id = hash(item)
+        recent_cache_key = self._recent_cache_key
         self._recent_cache_key = item
         self._recent_key = item_id
-        if item_id not in self._caches:
-            self._caches[item_id] = self._build_once(item)
-            # Note: raise warnings if number of traced program is more than `max_tracing_count`
-            current_tracing_count = len(self._caches)
-            if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
-                logging_utils.warn(
-                    f"Current traced program number: {current_tracing_count} > `max_tracing_count`:{MAX_TRACED_PROGRAM_COUNT}. Too much cached programs will bring expensive overhead. "
-                    "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors."
-                )
+        if item_id in self._caches:
+            self._hits += 1
+            self._caches.move_to_end(item_id)
+            return self._caches[item_id]
+
+        self._misses += 1
+        if self._function_name is None:
+            self._function_name = getattr(
+                item.function_spec.dygraph_function,
+                '__qualname__',
+                type_name(item.function_spec.dygraph_function),
+            )
+        if recent_cache_key is not None:
+            # The program is traced again for the different cache key, the fields caused it are recorded to find out
+            # the unexpected retraces.
+            self._retraces += 1
+            # The same key is traced again if its program is evicted or cleared.
+            reasons = diff_cache_keys(recent_cache_key, item) or [
+                "evicted or cleared"
+            ]
+            self._retrace_records.append(reasons)
+            logging_utils.log(
+                2,
+                f"Retrace function `{self._function_name}` because of: {reasons}",
+            )
+        self._caches[item_id] = self._build_once(item)
+        nbytes = _estimate_program_bytes(self._caches[item_id][0].main_program)
+        self._entries[item_id] = (item, nbytes)
+        self._total_bytes += nbytes
+        self._evict()
+        # Note: raise warnings if number of traced program is more than `max_tracing_count`
+        current_tracing_count = len(self._caches)
+        if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
+            logging_utils.warn(
+                f"Current traced program number: {current_tracing_count} > `max_tracing_count`:{MAX_TRACED_PROGRAM_COUNT}. Too much cached programs will bring expensive overhead. "
+                "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors. "
+                "Set `PADDLE_JIT_PROGRAM_CACHE_MAX_ENTRIES` to limit the number of cached programs."
+            )
 
         return self._caches[item_id]
 
+    def _evict(self):
+        # The most recently used program is never evicted.
+        while len(self._caches) > 1 and (
+            (self.max_entries > 0 and len(self._caches) > self.max_entries)
+            or (self.max_bytes > 0 and self._total_bytes > self.max_bytes)
+        ):
+            item_id, _ = self._caches.popitem(last=False)
+            _, nbytes = self._entries.pop(item_id)
+            self._total_bytes -= nbytes
+            self._evictions += 1
+
+    def report(self):
+        """
+        Get the statistics of the cache, including the number of hits,
+        misses, retraces and evictions, the number and estimated bytes of
+        cached programs, and the fields of cache keys which caused the
+        latest retraces.
+        """
+        return {
+            'function': self._function_name,
+            'hits': self._hits,
+            'misses': self._misses,
+            'retraces': self._retraces,
+            'evictions': self._evictions,
+            'entries': len(self._caches),
+            'estimated_bytes': self._total_bytes,
+            'retrace_reasons': list(self._retrace_records),
+        }
+
     def get_program_without_cache(self, cache_key):
         return self._build_once(cache_key=cache_key)
 
@@ -1668,6 +1883,8 @@ class ProgramCache:
 
     def clear(self):
         self._caches = collections.OrderedDict()
+        self._entries = {}
+        self._total_bytes = 0
 
 
 class PrimHooker(PartialProgramLayerHook):
@@ -16,22 +16,28 @@ from __future__ import annotations
 
 import gc
 import traceback
-from typing import TYPE_CHECKING, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, List, Tuple
 
 from ...profiler import EventGuard, event_register
 from ...psdb import NO_FALLBACK_CODES
 from ...utils import (
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
+    ENV_SOT_ASYNC_COMPILE,
+    ENV_SOT_ENABLE_GUARD_TREE,
     BreakGraphError,
     FallbackError,
     InnerError,
     Singleton,
+    compile_lock,
     is_strict_mode,
     log,
     log_do,
 )
 from ..custom_code import CustomCode
 from .guard import Guard
+from .guard_tree import GuardTree
 from .opcode_executor import OpcodeExecutor, OpcodeExecutorBase
 
 if TYPE_CHECKING:
@@ -43,6 +49,54 @@ GuardedFunctions = List[GuardedFunction]
 dummy_guard: Guard = lambda frame: True
 dummy_guard.expr = "lambda frame: True"
 dummy_guard.lambda_expr = "lambda frame: True"
+dummy_guard.stringified_guards = []
+
+
+def snapshot_containers(value: Any, memo: dict[int, Any]) -> Any:
+    """
+    Copies the builtin containers in value recursively, other objects are
+    shared, e.g. tensors and layers, whose identities may be guarded.
+    """
+    if id(value) in memo:
+        return memo[id(value)]
+    if type(value) in (list, set):
+        copied = type(value)()
+        memo[id(value)] = copied
+        items = [snapshot_containers(item, memo) for item in value]
+        if type(value) is list:
+            copied.extend(items)
+        else:
+            copied.update(items)
+        return copied
+    if type(value) in (dict, OrderedDict):
+        copied = type(value)()
+        memo[id(value)] = copied
+        for key, item in list(value.items()):
+            copied[key] = snapshot_containers(item, memo)
+        return copied
+    if type(value) is tuple:
+        copied = tuple(snapshot_containers(item, memo) for item in value)
+        memo[id(value)] = copied
+        return copied
+    return value
+
+
+class FrameSnapshot:
+    """
+    The inputs of a frame taken before it runs, which is translated in the
+    background while the frame itself runs eagerly. The builtin containers
+    of locals are copied, so that the translation does not see the
+    mutations of the eager run, which changes the guards derived from them.
+    The globals are not copied, since the translation stores objects used
+    by the generated code in them.
+    """
+
+    def __init__(self, frame: types.FrameType):
+        self.f_code = frame.f_code
+        self.f_locals = snapshot_containers(dict(frame.f_locals), {})
+        self.f_globals = frame.f_globals
+        self.f_builtins = frame.f_builtins
+        self.f_back = None
 
 
 class OpcodeExecutorCache(metaclass=Singleton):
@@ -52,17 +106,24 @@ class OpcodeExecutorCache(metaclass=Singleton):
 
     Attributes:
         cache (dict): A dictionary that maps code objects to tuples of a cache getter function and a list of guarded functions.
+        guard_trees (dict): A dictionary that maps code objects to the GuardTree of their guarded functions.
         translate_count (int): The count of how many instructions have been translated. It is used to test whether the cache hits.
+        translate_futures (dict): A dictionary that maps code objects to the translations running in the background if SOT_ASYNC_COMPILE is set.
     """
 
     MAX_CACHE_SIZE = 20
     cache: dict[types.CodeType, GuardedFunctions]
+    guard_trees: dict[types.CodeType, GuardTree]
     translate_count: int
+    translate_futures: dict[types.CodeType, Future]
     code_symbolic_inputs: dict[types.CodeType, dict[str, dict[int, int]]]
 
     def __init__(self):
         self.cache = {}
+        self.guard_trees = {}
         self.translate_count = 0
+        self.translate_futures = {}
+        self.translate_worker = None
         self.code_symbolic_inputs = {}
 
     def get_symbolic_inputs(self, code: types.CodeType):
@@ -73,14 +134,22 @@ class OpcodeExecutorCache(metaclass=Singleton):
         """
         Clears the cache and resets the translate count.
         """
+        self.wait_translations()
+        self.translate_futures.clear()
         self.cache.clear()
+        self.guard_trees.clear()
         self.translate_count = 0
         self.code_symbolic_inputs.clear()
 
     def __call__(self, frame: types.FrameType, **kwargs) -> CustomCode:
         code: types.CodeType = frame.f_code
+        if ENV_SOT_ASYNC_COMPILE.get():
+            self.install_translated(code)
         if code not in self.cache:
             log(2, f"[Cache]: Firstly call {code}\n")
+            if ENV_SOT_ASYNC_COMPILE.get():
+                self.cache[code] = []
+                return self.translate_async(frame, **kwargs)
             new_custom_code, guard_fn = self.translate(frame, **kwargs)
             self.cache[code] = [(new_custom_code, guard_fn)]
             return new_custom_code
@@ -106,6 +175,9 @@ class OpcodeExecutorCache(metaclass=Singleton):
             log(2, "[Cache]: Exceed max cache size, skip it\n")
             return CustomCode(None, False)
 
+        if ENV_SOT_ENABLE_GUARD_TREE.get():
+            return self.lookup_guard_tree(frame, guarded_fns, **kwargs)
+
         for custom_code, guard_fn in guarded_fns:
             try:
                 with EventGuard("try guard"):
@@ -134,10 +206,99 @@ class OpcodeExecutorCache(metaclass=Singleton):
                 continue
 
         log(2, "[Cache]: all guards missed\n")
+        if ENV_SOT_ASYNC_COMPILE.get():
+            return self.translate_async(frame, **kwargs)
+        new_custom_code, guard_fn = self.translate(frame, **kwargs)
+        guarded_fns.append((new_custom_code, guard_fn))
+        return new_custom_code
+
+    def get_guard_tree(
+        self, code: types.CodeType, guarded_fns: GuardedFunctions
+    ) -> GuardTree:
+        """
+        Returns the GuardTree of the code object, which is updated with the
+        guarded functions appended since the last lookup.
+        """
+        guard_tree = self.guard_trees.setdefault(code, GuardTree())
+        for custom_code, guard_fn in guarded_fns[len(guard_tree) :]:
+            guard_tree.add(custom_code, guard_fn)
+        return guard_tree
+
+    def lookup_guard_tree(
+        self, frame: types.FrameType, guarded_fns: GuardedFunctions, **kwargs
+    ) -> CustomCode:
+        """
+        Looks up the cache like `lookup` , but dispatches the frame by the
+        GuardTree of all guarded functions in one pass.
+        """
+        guard_tree = self.get_guard_tree(frame.f_code, guarded_fns)
+        with EventGuard("try guard tree"):
+            index = guard_tree.lookup(frame)
+        if index is not None:
+            custom_code, guard_fn = guarded_fns[index]
+            log(
+                2,
+                f"[Cache]: Cache hit, Guard is \n{getattr(guard_fn, 'expr', 'None')}\n",
+            )
+            return custom_code
+
+        for _, guard_fn in guarded_fns:
+            log_do(4, self.analyse_guard_global_object(guard_fn))
+            log(
+                2,
+                f"[Cache]: Cache miss, Guard is \n{getattr(guard_fn, 'expr', 'None')}\n",
+            )
+            log_do(2, self.analyse_guard_error(guard_fn, frame))
+        log(2, "[Cache]: all guards missed\n")
+        if ENV_SOT_ASYNC_COMPILE.get():
+            return self.translate_async(frame, **kwargs)
         new_custom_code, guard_fn = self.translate(frame, **kwargs)
         guarded_fns.append((new_custom_code, guard_fn))
         return new_custom_code
 
+    def translate_async(self, frame: types.FrameType, **kwargs) -> CustomCode:
+        """
+        Translates the frame in the background and runs it eagerly, the
+        translated code is installed by `install_translated` in a later call.
+        At most one translation of a code object is running at a time, the
+        frames missed during it are run eagerly as well.
+        """
+        code = frame.f_code
+        if code not in self.translate_futures:
+            if self.translate_worker is None:
+                self.translate_worker = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="sot_translate"
+                )
+            self.translate_futures[code] = self.translate_worker.submit(
+                self.translate_in_background, FrameSnapshot(frame), kwargs
+            )
+        log(2, f"[Cache]: Translate {code} in background, run it eagerly\n")
+        return CustomCode(None, True)
+
+    def translate_in_background(
+        self, frame: FrameSnapshot, kwargs: dict
+    ) -> tuple[CustomCode, Guard]:
+        with compile_lock:
+            return self.translate(frame, **kwargs)
+
+    def install_translated(self, code: types.CodeType):
+        """
+        Installs the result of the finished background translation of the
+        code object, and raises the error of the translation if it failed.
+        """
+        future = self.translate_futures.get(code)
+        if future is None or not future.done():
+            return
+        del self.translate_futures[code]
+        new_custom_code, guard_fn = future.result()
+        self.cache.setdefault(code, []).append((new_custom_code, guard_fn))
+
+    def wait_translations(self, timeout: float | None = None):
+        """
+        Waits for all background translations to finish.
+        """
+        wait(list(self.translate_futures.values()), timeout=timeout)
+
     def before_translate_hook(self, frame: types.FrameType):
         if not ENV_SOT_ALLOW_DYNAMIC_SHAPE.get():
             return
@@ -77,6 +77,7 @@ def make_guard(stringified_guards: list[StringifiedExpression]) -> Guard:
         if not num_guards:
             guard = lambda frame: True
             guard.expr = "lambda frame: True"
+            guard.stringified_guards = []
             return guard
 
         def analyse_expressions(stringified_exprs, tmp_names):
@@ -114,6 +115,8 @@ def make_guard(stringified_guards: list[StringifiedExpression]) -> Guard:
         log(3, f"[Guard]: {lambda_string}\n")
         guard.lambda_expr = lambda_string
         guard.expr = func_string
+        # used by GuardTree to share sub-expressions between guards
+        guard.stringified_guards = list(stringified_guards)
         assert callable(guard), "guard must be callable."
 
         return guard
@@ -126,7 +129,7 @@ def support_weak_ref(obj):
 
 
 def check_guard(
-    fn: Callable[[CheckGuardInputT], list[StringifiedExpression]]
+    fn: Callable[[CheckGuardInputT], list[StringifiedExpression]],
 ) -> Callable[[CheckGuardInputT], list[StringifiedExpression]]:
     def wrapper(self: CheckGuardInputT) -> list[StringifiedExpression]:
         assert (
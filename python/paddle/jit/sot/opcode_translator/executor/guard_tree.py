@@ -0,0 +1,267 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import ast
+from typing import TYPE_CHECKING, Any, Callable, Tuple
+
+if TYPE_CHECKING:
+    import types
+
+    from ..custom_code import CustomCode
+    from .guard import Guard
+
+# NOTE: [How does GuardTree dispatch?]
+# Every guard made by `make_guard` is a conjunction of stringified guards. A
+# guard of the form `{expr} == {literal}` is a switch on the value of
+# `expr` , e.g. the type id, length or `MetaInfo.guard_str()` of a variable,
+# and any other guard is a switch on its boolean value. The same `expr` of
+# different entries is evaluated once, and the entries are dispatched by a
+# dict lookup on its value, so the cost of a lookup is proportional to the
+# number of distinct sub-expressions instead of the number of entries.
+#
+# The tree keeps the semantics of trying guards one by one: the first entry
+# whose guards are all satisfied is returned, and a guard which raises an
+# error is not satisfied.
+
+Conjunct = Tuple["GuardTest", Any]
+
+# The literal of entries without the test in a switch.
+_NO_TEST = object()
+
+
+class GuardTest:
+    """
+    A sub-expression of guards, which is shared by all entries of the tree.
+
+    Args:
+        key: The key to identify the same sub-expression of different guards.
+        fn: The function to evaluate the sub-expression from a frame.
+    """
+
+    __slots__ = ("key", "fn")
+
+    def __init__(self, key: Any, fn: Callable[[types.FrameType], Any]):
+        self.key = key
+        self.fn = fn
+
+    def __repr__(self):
+        return f"GuardTest({self.key[1]})"
+
+
+class GuardTreeNode:
+    """
+    A node of the tree, which switches on the value of `test` , or a leaf
+    if `test` is None, whose `index` is the matched entry or None.
+    """
+
+    __slots__ = ("test", "branches", "default", "index")
+
+    def __init__(
+        self,
+        test: GuardTest | None = None,
+        branches: dict[Any, GuardTreeNode] | None = None,
+        default: GuardTreeNode | None = None,
+        index: int | None = None,
+    ):
+        self.test = test
+        self.branches = branches
+        self.default = default
+        self.index = index
+
+    def match_unhashable(self, value: Any) -> GuardTreeNode:
+        for literal, child in self.branches.items():
+            try:
+                if value == literal:
+                    return child
+            except Exception:
+                continue
+        return self.default
+
+
+def _referenced_free_vars(node: ast.AST, free_vars: dict[str, Any]):
+    names = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+    return {name: free_vars[name] for name in names if name in free_vars}
+
+
+def _switch_literal(node: ast.AST):
+    """
+    Returns the literal of guard `{expr} == {literal}` , or raises ValueError
+    if the guard is not a switch.
+    """
+    if not (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and isinstance(node.ops[0], ast.Eq)
+    ):
+        raise ValueError("not a switch")
+    literal = ast.literal_eval(node.comparators[0])
+    hash(literal)
+    return literal
+
+
+class GuardTree:
+    """
+    A decision tree of the guards of all translated entries of a code object,
+    which dispatches a frame to the first matched entry in one pass.
+    """
+
+    def __init__(self):
+        self.entries: list[tuple[CustomCode, Guard]] = []
+        self.tests: dict[Any, GuardTest] = {}
+        self.conjuncts: list[list[Conjunct]] = []
+        self.root: GuardTreeNode | None = GuardTreeNode()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def make_test(
+        self, kind: str, expr: str, free_vars: dict[str, Any]
+    ) -> GuardTest:
+        key = (
+            kind,
+            expr,
+            tuple(sorted((k, id(v)) for k, v in free_vars.items())),
+        )
+        if key not in self.tests:
+            source = f"({expr})" if kind == "value" else f"bool({expr})"
+            fn = eval(f"lambda frame: {source}", dict(free_vars))
+            self.tests[key] = GuardTest(key, fn)
+        return self.tests[key]
+
+    def opaque_guard(self, guard_fn: Guard) -> list[Conjunct]:
+        # A guard without stringified guards is a switch on its result.
+        key = ("guard", id(guard_fn), ())
+        if key not in self.tests:
+            self.tests[key] = GuardTest(
+                key, lambda frame: bool(guard_fn(frame))
+            )
+        return [(self.tests[key], True)]
+
+    def parse_guard(self, guard_fn: Guard) -> list[Conjunct]:
+        stringified_guards = getattr(guard_fn, "stringified_guards", None)
+        if stringified_guards is None:
+            return self.opaque_guard(guard_fn)
+
+        conjuncts = []
+        for str_expr in stringified_guards:
+            expr = str_expr.inlined_expr
+            tree = ast.parse(expr, mode="eval").body
+            if isinstance(tree, ast.BoolOp) and isinstance(tree.op, ast.And):
+                nodes = tree.values
+            else:
+                nodes = [tree]
+            for node in nodes:
+                try:
+                    literal = _switch_literal(node)
+                    node = node.left
+                    kind = "value"
+                except (ValueError, TypeError, SyntaxError):
+                    literal = True
+                    kind = "bool"
+                test = self.make_test(
+                    kind,
+                    ast.get_source_segment(expr, node),
+                    _referenced_free_vars(node, str_expr.free_vars),
+                )
+                conjuncts.append((test, literal))
+        return conjuncts
+
+    def add(self, custom_code: CustomCode, guard_fn: Guard):
+        """
+        Add an entry after all existing entries, the tree is rebuilt lazily
+        in the next lookup.
+        """
+        try:
+            conjuncts = self.parse_guard(guard_fn)
+        except Exception:
+            conjuncts = self.opaque_guard(guard_fn)
+        self.entries.append((custom_code, guard_fn))
+        self.conjuncts.append(conjuncts)
+        self.root = None
+
+    def build(self) -> GuardTreeNode:
+        root = GuardTreeNode()
+        worklist = [(root, list(enumerate(self.conjuncts)))]
+        while worklist:
+            node, entries = worklist.pop()
+            if not entries:
+                continue
+            index, conjuncts = entries[0]
+            if not conjuncts:
+                node.index = index
+                continue
+
+            # Switch on the first test of the first entry, entries without
+            # the test are kept in all branches.
+            test = conjuncts[0][0]
+            literals: dict[Any, None] = {}
+            splits = []
+            for index, conjuncts in entries:
+                entry_literals = {
+                    lit: None for t, lit in conjuncts if t is test
+                }
+                rest = [c for c in conjuncts if c[0] is not test]
+                if len(entry_literals) > 1:
+                    # can never be satisfied
+                    continue
+                literals.update(entry_literals)
+                splits.append(
+                    (index, next(iter(entry_literals), _NO_TEST), rest)
+                )
+
+            node.test = test
+            node.branches = {}
+            node.default = GuardTreeNode()
+            for literal in literals:
+                child = GuardTreeNode()
+                node.branches[literal] = child
+                worklist.append(
+                    (
+                        child,
+                        [
+                            (index, rest)
+                            for index, lit, rest in splits
+                            if lit is _NO_TEST or lit == literal
+                        ],
+                    )
+                )
+            worklist.append(
+                (
+                    node.default,
+                    [(i, rest) for i, lit, rest in splits if lit is _NO_TEST],
+                )
+            )
+        return root
+
+    def lookup(self, frame: types.FrameType) -> int | None:
+        """
+        Returns the index of the first entry whose guard is satisfied by the
+        frame, or None if all guards are missed.
+        """
+        node = self.root
+        if node is None:
+            node = self.root = self.build()
+        while node.test is not None:
+            try:
+                value = node.test.fn(frame)
+            except Exception:
+                node = node.default
+                continue
+            try:
+                node = node.branches.get(value, node.default)
+            except TypeError:
+                node = node.match_unhashable(value)
+        return node.index
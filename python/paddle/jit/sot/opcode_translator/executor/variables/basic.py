@@ -34,6 +34,7 @@ from ....infer_meta import (
 from ....symbolic.statement_ir import Symbol
 from ....utils import (
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
+    ENV_SOT_DYNAMIC_SHAPE_THRESHOLD,
     BreakGraphError,
     ConstTypes,
     FallbackError,
@@ -762,7 +763,9 @@ class SymbolicVariable(VariableBase):
             symbolic_input[value] += 1
             if symbolic_input[value] >= STATIC_DIM_FREQ_THRESHOLD:
                 return False
-            if len(symbolic_input.keys()) > 1:
+            if len(symbolic_input.keys()) >= max(
+                ENV_SOT_DYNAMIC_SHAPE_THRESHOLD.get(), 2
+            ):
                 return True
             return False
         return False
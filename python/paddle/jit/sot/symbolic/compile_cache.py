@@ -30,6 +30,7 @@ from ..utils import (
     GraphLogger,
     Singleton,
     StepInfoManager,
+    compile_lock,
     log,
     log_do,
     map_if,
@@ -97,10 +98,11 @@ class FallbackWrapper:
             input_spec = convert_meta_to_input_spec(
                 [self.SIR.symbol_meta_map[symbol] for symbol in self.SIR.inputs]
             )
-            (
-                self.concrete_program,
-                self.partial_program,
-            ) = self.compiled_fn.get_concrete_program(input_spec)
+            with compile_lock:
+                (
+                    self.concrete_program,
+                    self.partial_program,
+                ) = self.compiled_fn.get_concrete_program(input_spec)
             self.partial_program.training = self.is_training
         if use_pir_api():
             return len(self.partial_program.program.program.global_block().ops)
@@ -129,7 +131,9 @@ class FallbackWrapper:
                 ),
             )
             if self.partial_program is None:
-                with EventGuard("FallbackWrapper: get_concrete_program"):
+                with EventGuard(
+                    "FallbackWrapper: get_concrete_program"
+                ), compile_lock:
                     (
                         self.concrete_program,
                         self.partial_program,
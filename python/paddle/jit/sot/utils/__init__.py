@@ -18,11 +18,17 @@ from .envs import (  # noqa: F401
     ENV_COST_MODEL,
     ENV_MIN_GRAPH_SIZE,
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
+    ENV_SOT_ASYNC_COMPILE,
+    ENV_SOT_DYNAMIC_SHAPE_THRESHOLD,
+    ENV_SOT_ENABLE_GUARD_TREE,
     ENV_SOT_EXPORT,
     ENV_SOT_LOG_LEVEL,
     ENV_SOT_WITH_CONTROL_FLOW,
     ENV_STRICT_MODE,
+    async_compile_guard,
     cost_model_guard,
+    dynamic_shape_threshold_guard,
+    enable_guard_tree_guard,
     min_graph_size_guard,
     strict_mode_guard,
     with_allow_dynamic_shape_guard,
@@ -53,6 +59,7 @@ from .utils import (  # noqa: F401
     SotUndefinedVar,
     StepInfoManager,
     StepState,
+    compile_lock,
     count_if,
     current_tmp_name_records,
     execute_time,
@@ -35,6 +35,16 @@ ENV_SOT_EXPORT = StringEnvironmentVariable("SOT_EXPORT", "")
 ENV_SOT_ALLOW_DYNAMIC_SHAPE = BooleanEnvironmentVariable(
     "SOT_ALLOW_DYNAMIC_SHAPE", False
 )
+# The number of distinct values (at least 2) of an input int or a dimension of
+# input tensor before it is marked as symbolic, only works if
+# SOT_ALLOW_DYNAMIC_SHAPE is set.
+ENV_SOT_DYNAMIC_SHAPE_THRESHOLD = IntegerEnvironmentVariable(
+    "SOT_DYNAMIC_SHAPE_THRESHOLD", 2
+)
+ENV_SOT_ENABLE_GUARD_TREE = BooleanEnvironmentVariable(
+    "SOT_ENABLE_GUARD_TREE", True
+)
+ENV_SOT_ASYNC_COMPILE = BooleanEnvironmentVariable("SOT_ASYNC_COMPILE", False)
 
 
 @contextmanager
@@ -71,3 +81,21 @@ def with_export_guard(value: str):
 def with_allow_dynamic_shape_guard(value: bool):
     with EnvironmentVariableGuard(ENV_SOT_ALLOW_DYNAMIC_SHAPE, value):
         yield
+
+
+@contextmanager
+def enable_guard_tree_guard(value: bool):
+    with EnvironmentVariableGuard(ENV_SOT_ENABLE_GUARD_TREE, value):
+        yield
+
+
+@contextmanager
+def dynamic_shape_threshold_guard(value: int):
+    with EnvironmentVariableGuard(ENV_SOT_DYNAMIC_SHAPE_THRESHOLD, value):
+        yield
+
+
+@contextmanager
+def async_compile_guard(value: bool):
+    with EnvironmentVariableGuard(ENV_SOT_ASYNC_COMPILE, value):
+        yield
@@ -29,6 +29,7 @@ from weakref import WeakValueDictionary
 import numpy as np
 
 import paddle
+from paddle.base.dygraph.base import _static_graph_lock
 from paddle.utils import flatten, map_structure
 
 from .envs import (
@@ -107,6 +108,13 @@ def current_tmp_name_records():
     return _tmp_name_records
 
 
+# Held while translating a frame in the background or building the program of
+# a compiled function, both of which switch the global state of static graph.
+# It is the lock held by `switch_to_static_graph` , so the lazily built
+# programs of partial programs are serialized with the translation as well.
+compile_lock = _static_graph_lock
+
+
 class ResumeFnNameFactory(metaclass=Singleton):
     def __init__(self) -> None:
         self.gen = NameGenerator('resume_')
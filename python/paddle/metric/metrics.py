@@ -32,6 +32,7 @@ if TYPE_CHECKING:
     import numpy.typing as npt
 
     from paddle import Tensor
+    from paddle.distributed.communication.group import Group
 
 
 __all__ = []
@@ -41,6 +42,28 @@ def _is_numpy_(var):
     return isinstance(var, (np.ndarray, np.generic))
 
 
+def _check_update_input(value, name):
+    if isinstance(value, paddle.Tensor) or _is_numpy_(value):
+        return value
+    raise ValueError(f"The '{name}' must be a numpy ndarray or Tensor.")
+
+
+def _as_tensor_on(value, place):
+    if isinstance(value, paddle.Tensor):
+        return value
+    return paddle.to_tensor(value, place=place)
+
+
+def _concat_batches(batches):
+    if all(isinstance(b, paddle.Tensor) for b in batches):
+        return paddle.concat(list(batches))
+    return np.concatenate([np.array(b) for b in batches])
+
+
+def _add_device_stat(total, stat):
+    return stat if total is None else total + stat
+
+
 class Metric(metaclass=abc.ABCMeta):
     r"""
     Base class for metric, encapsulates metric logic and APIs
@@ -191,6 +214,93 @@ class Metric(metaclass=abc.ABCMeta):
         """
         return args
 
+    def update_many(self, *args: Sequence[Any]) -> None:
+        """
+        Update states with a sequence of mini-batches at once, which is
+        useful for offline evaluation on saved predictions.
+
+        Each argument is a sequence holding the corresponding argument of
+        :code:`update` for each mini-batch, e.g.
+        :code:`update_many([pred1, pred2], [label1, label2])` is the same as
+        :code:`update(pred1, label1)` followed by :code:`update(pred2, label2)`.
+        Metrics whose states are additive over samples update the states
+        once with the concatenated mini-batches.
+        """
+        for batch in zip(*args):
+            self.update(*batch)
+
+    def get_states(self) -> list[npt.NDArray[Any]] | None:
+        """
+        Returns the states of metric as a list of numpy arrays, which are
+        additive, i.e. the states of a metric updated with two parts of
+        data is the sum of the states updated with each part, such as
+        counts and histograms. Returns None if the metric does not support
+        merging states, which is the default.
+
+        Metrics overriding it should also override :code:`set_states`, so
+        the states can be merged by :code:`merge` and :code:`all_reduce`.
+        """
+        return None
+
+    def set_states(self, states: Sequence[npt.NDArray[Any]]) -> None:
+        """
+        Set the states of metric, which are in the same format as
+        :code:`get_states`.
+        """
+        raise NotImplementedError(
+            f"function 'set_states' not implemented in {self.__class__.__name__}."
+        )
+
+    def merge(self, other: Metric) -> None:
+        """
+        Merge the states of another metric of the same kind into this
+        metric, e.g. metrics of different data shards, after which
+        :code:`accumulate` computes the metric over all the data.
+
+        Args:
+            other (Metric): The metric to merge.
+        """
+        states, other_states = self.get_states(), other.get_states()
+        if states is None or other_states is None:
+            raise NotImplementedError(
+                f"{self.__class__.__name__} does not support merging states."
+            )
+        self.set_states([a + b for a, b in zip(states, other_states)])
+
+    def all_reduce(self, group: Group | None = None) -> None:
+        """
+        Sum the states of metric over all ranks in distributed evaluation,
+        after which :code:`accumulate` computes the metric over the data of
+        all ranks. Only the compact states are communicated, instead of the
+        predictions and labels of each sample.
+
+        Args:
+            group (Group, optional): The communication group, default is
+                the global group.
+        """
+        states = self.get_states()
+        if states is None:
+            raise NotImplementedError(
+                f"{self.__class__.__name__} does not support merging states."
+            )
+        states = [np.asarray(s) for s in states]
+        # reduce all states with one collective
+        buffer = paddle.to_tensor(
+            np.concatenate([s.astype('float64').reshape([-1]) for s in states])
+        )
+        paddle.distributed.all_reduce(buffer, group=group)
+        buffer = buffer.numpy()
+
+        reduced, offset = [], 0
+        for s in states:
+            reduced.append(
+                buffer[offset : offset + s.size]
+                .reshape(s.shape)
+                .astype(s.dtype)
+            )
+            offset += s.size
+        self.set_states(reduced)
+
 
 class Accuracy(Metric):
     """
@@ -327,6 +437,23 @@ class Accuracy(Metric):
         self.total = [0.0] * len(self.topk)
         self.count = [0] * len(self.topk)
 
+    def get_states(self) -> list[npt.NDArray[Any]]:
+        """
+        Returns the correct count and total count of each top-k.
+        """
+        return [
+            np.array(self.total, dtype='float64'),
+            np.array(self.count, dtype='int64'),
+        ]
+
+    def set_states(self, states: Sequence[npt.NDArray[Any]]) -> None:
+        """
+        Set the correct count and total count of each top-k.
+        """
+        total, count = states
+        self.total = [float(t) for t in total]
+        self.count = [int(c) for c in count]
+
     def accumulate(self) -> list[float]:
         """
         Computes and returns the accumulated metric.
@@ -361,6 +488,10 @@ class Precision(Metric):
     Noted that this class manages the precision score only for binary
     classification task.
 
+    If the inputs of :code:`update` are Tensors, the counts are computed
+    and accumulated on the device of the inputs, and only fetched when
+    :code:`accumulate` is called or the states are read.
+
     Args:
         name (str, optional): String name of the metric instance.
             Default is `precision`.
@@ -417,17 +548,42 @@ class Precision(Metric):
             >>> model.fit(data, batch_size=16)
     """
 
-    tp: int
-    fp: int
-
     def __init__(
         self, name: str = 'precision', *args: Any, **kwargs: Any
     ) -> None:
         super().__init__(*args, **kwargs)
-        self.tp = 0  # true positive
-        self.fp = 0  # false positive
+        self._tp = 0  # true positive
+        self._fp = 0  # false positive
+        self._device_stat = None  # [tp, fp] of Tensor inputs
         self._name = name
 
+    def _sync_device_stat(self) -> None:
+        if self._device_stat is not None:
+            tp, fp = self._device_stat.tolist()
+            self._device_stat = None
+            self._tp += tp
+            self._fp += fp
+
+    @property
+    def tp(self) -> int:
+        self._sync_device_stat()
+        return self._tp
+
+    @tp.setter
+    def tp(self, value: int) -> None:
+        self._sync_device_stat()
+        self._tp = value
+
+    @property
+    def fp(self) -> int:
+        self._sync_device_stat()
+        return self._fp
+
+    @fp.setter
+    def fp(self, value: int) -> None:
+        self._sync_device_stat()
+        self._fp = value
+
     def update(
         self,
         preds: npt.NDArray[np.float32 | np.float64] | Tensor,
@@ -444,34 +600,64 @@ class Precision(Metric):
                 the shape should keep the same as preds.
                 The data type is 'int32' or 'int64'.
         """
+        preds = _check_update_input(preds, 'preds')
+        labels = _check_update_input(labels, 'labels')
+
+        # a prediction is positive if it is rounded to 1 by floor(x + 0.5)
         if isinstance(preds, paddle.Tensor):
-            preds = np.array(preds)
-        elif not _is_numpy_(preds):
-            raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
-
-        if isinstance(labels, paddle.Tensor):
-            labels = np.array(labels)
-        elif not _is_numpy_(labels):
-            raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
-
-        sample_num = labels.shape[0]
-        preds = np.floor(preds + 0.5).astype("int32")
-
-        for i in range(sample_num):
-            pred = preds[i]
-            label = labels[i]
-            if pred == 1:
-                if pred == label:
-                    self.tp += 1
-                else:
-                    self.fp += 1
+            preds = preds.reshape([-1])
+            labels = _as_tensor_on(labels, preds.place).reshape([-1])
+            positive = (preds >= 0.5) & (preds < 1.5)
+            tp = (positive & (labels == 1)).astype('int64').sum()
+            fp = positive.astype('int64').sum() - tp
+            self._device_stat = _add_device_stat(
+                self._device_stat, paddle.stack([tp, fp])
+            )
+        else:
+            preds = np.array(preds).reshape([-1])
+            labels = np.array(labels).reshape([-1])
+            positive = (preds >= 0.5) & (preds < 1.5)
+            tp = int(np.count_nonzero(positive & (labels == 1)))
+            self._tp += tp
+            self._fp += int(np.count_nonzero(positive)) - tp
+
+    def update_many(
+        self,
+        preds: Sequence[npt.NDArray[np.float32 | np.float64] | Tensor],
+        labels: Sequence[npt.NDArray[np.int32 | np.int64] | Tensor],
+    ) -> None:
+        """
+        Update the states with a sequence of mini-batches at once.
+
+        Args:
+            preds (list[numpy.ndarray|Tensor]): The prediction results of
+                each mini-batch, the same as :attr:`preds` of ``update``.
+            labels (list[numpy.ndarray|Tensor]): The ground truth of each
+                mini-batch, the same as :attr:`labels` of ``update``.
+        """
+        if len(preds) > 0:
+            self.update(_concat_batches(preds), _concat_batches(labels))
 
     def reset(self) -> None:
         """
         Resets all of the metric state.
         """
-        self.tp = 0
-        self.fp = 0
+        self._tp = 0
+        self._fp = 0
+        self._device_stat = None
+
+    def get_states(self) -> list[npt.NDArray[Any]]:
+        """
+        Returns the true positive and false positive counts.
+        """
+        return [np.array([self.tp, self.fp], dtype='int64')]
+
+    def set_states(self, states: Sequence[npt.NDArray[Any]]) -> None:
+        """
+        Set the true positive and false positive counts.
+        """
+        self._device_stat = None
+        self._tp, self._fp = (int(v) for v in states[0])
 
     def accumulate(self) -> float:
         """
@@ -502,6 +688,10 @@ class Recall(Metric):
     Noted that this class manages the recall score only for
     binary classification task.
 
+    If the inputs of :code:`update` are Tensors, the counts are computed
+    and accumulated on the device of the inputs, and only fetched when
+    :code:`accumulate` is called or the states are read.
+
     Args:
         name (str, optional): String name of the metric instance.
             Default is `recall`.
@@ -558,15 +748,40 @@ class Recall(Metric):
             >>> model.fit(data, batch_size=16)
     """
 
-    tp: int
-    fn: int
-
     def __init__(self, name: str = 'recall', *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self.tp = 0  # true positive
-        self.fn = 0  # false negative
+        self._tp = 0  # true positive
+        self._fn = 0  # false negative
+        self._device_stat = None  # [tp, fn] of Tensor inputs
         self._name = name
 
+    def _sync_device_stat(self) -> None:
+        if self._device_stat is not None:
+            tp, fn = self._device_stat.tolist()
+            self._device_stat = None
+            self._tp += tp
+            self._fn += fn
+
+    @property
+    def tp(self) -> int:
+        self._sync_device_stat()
+        return self._tp
+
+    @tp.setter
+    def tp(self, value: int) -> None:
+        self._sync_device_stat()
+        self._tp = value
+
+    @property
+    def fn(self) -> int:
+        self._sync_device_stat()
+        return self._fn
+
+    @fn.setter
+    def fn(self, value: int) -> None:
+        self._sync_device_stat()
+        self._fn = value
+
     def update(
         self,
         preds: npt.NDArray[np.float32 | np.float64] | Tensor,
@@ -583,27 +798,46 @@ class Recall(Metric):
                 the shape should keep the same as preds.
                 Shape: [batch_size, 1], Dtype: 'int32' or 'int64'.
         """
+        preds = _check_update_input(preds, 'preds')
+        labels = _check_update_input(labels, 'labels')
+
+        # a prediction is positive if it is rounded to 1 by rint, which
+        # rounds half to even
         if isinstance(preds, paddle.Tensor):
-            preds = np.array(preds)
-        elif not _is_numpy_(preds):
-            raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
-
-        if isinstance(labels, paddle.Tensor):
-            labels = np.array(labels)
-        elif not _is_numpy_(labels):
-            raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
-
-        sample_num = labels.shape[0]
-        preds = np.rint(preds).astype("int32")
-
-        for i in range(sample_num):
-            pred = preds[i]
-            label = labels[i]
-            if label == 1:
-                if pred == label:
-                    self.tp += 1
-                else:
-                    self.fn += 1
+            preds = preds.reshape([-1])
+            labels = _as_tensor_on(labels, preds.place).reshape([-1])
+            relevant = labels == 1
+            hit = (preds > 0.5) & (preds < 1.5)
+            tp = (relevant & hit).astype('int64').sum()
+            fn = relevant.astype('int64').sum() - tp
+            self._device_stat = _add_device_stat(
+                self._device_stat, paddle.stack([tp, fn])
+            )
+        else:
+            preds = np.array(preds).reshape([-1])
+            labels = np.array(labels).reshape([-1])
+            relevant = labels == 1
+            hit = (preds > 0.5) & (preds < 1.5)
+            tp = int(np.count_nonzero(relevant & hit))
+            self._tp += tp
+            self._fn += int(np.count_nonzero(relevant)) - tp
+
+    def update_many(
+        self,
+        preds: Sequence[npt.NDArray[np.float32 | np.float64] | Tensor],
+        labels: Sequence[npt.NDArray[np.int32 | np.int64] | Tensor],
+    ) -> None:
+        """
+        Update the states with a sequence of mini-batches at once.
+
+        Args:
+            preds (list[numpy.ndarray|Tensor]): The prediction results of
+                each mini-batch, the same as :attr:`preds` of ``update``.
+            labels (list[numpy.ndarray|Tensor]): The ground truth of each
+                mini-batch, the same as :attr:`labels` of ``update``.
+        """
+        if len(preds) > 0:
+            self.update(_concat_batches(preds), _concat_batches(labels))
 
     def accumulate(self) -> float:
         """
@@ -619,8 +853,22 @@ class Recall(Metric):
         """
         Resets all of the metric state.
         """
-        self.tp = 0
-        self.fn = 0
+        self._tp = 0
+        self._fn = 0
+        self._device_stat = None
+
+    def get_states(self) -> list[npt.NDArray[Any]]:
+        """
+        Returns the true positive and false negative counts.
+        """
+        return [np.array([self.tp, self.fn], dtype='int64')]
+
+    def set_states(self, states: Sequence[npt.NDArray[Any]]) -> None:
+        """
+        Set the true positive and false negative counts.
+        """
+        self._device_stat = None
+        self._tp, self._fn = (int(v) for v in states[0])
 
     def name(self) -> str:
         """
@@ -633,7 +881,10 @@ class Auc(Metric):
     """
     The auc metric is for binary classification.
     Refer to https://en.wikipedia.org/wiki/Receiver_operating_characteristic#Area_under_the_curve.
-    Please notice that the auc metric is implemented with python, which may be a little bit slow.
+    The predictions are counted into buckets of thresholds with
+    vectorized operations, if the inputs of :code:`update` are Tensors, the
+    buckets are accumulated on the device of the inputs, and only fetched
+    when :code:`accumulate` is called.
 
     The `auc` function creates four local variables, `true_positives`,
     `true_negatives`, `false_positives` and `false_negatives` that are used to
@@ -724,8 +975,17 @@ class Auc(Metric):
         _num_pred_buckets = num_thresholds + 1
         self._stat_pos = np.zeros(_num_pred_buckets)
         self._stat_neg = np.zeros(_num_pred_buckets)
+        # [neg buckets, pos buckets] of Tensor inputs
+        self._device_stat = None
         self._name = name
 
+    def _sync_device_stat(self) -> None:
+        if self._device_stat is not None:
+            stat = self._device_stat.numpy().reshape([2, -1])
+            self._device_stat = None
+            self._stat_neg += stat[0]
+            self._stat_pos += stat[1]
+
     def update(
         self,
         preds: npt.NDArray[np.float32 | np.float64] | Tensor,
@@ -742,24 +1002,56 @@ class Auc(Metric):
                 (batch_size, 1), labels[i] is either o or 1,
                 representing the label of the instance i.
         """
-        if isinstance(labels, paddle.Tensor):
-            labels = np.array(labels)
-        elif not _is_numpy_(labels):
-            raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
+        labels = _check_update_input(labels, 'labels')
+        preds = _check_update_input(preds, 'preds')
 
+        num_buckets = self._num_thresholds + 1
         if isinstance(preds, paddle.Tensor):
+            labels = _as_tensor_on(labels, preds.place).reshape([-1])
+            # bucket index is truncated, which is checked on host for
+            # numpy inputs, and clipped here to avoid a sync
+            bins = (preds[:, 1] * self._num_thresholds).astype('int64')
+            bins = bins.clip(0, self._num_thresholds)
+            bins = bins + (labels != 0).astype('int64') * num_buckets
+            # NOTE: scatter add into the buckets instead of bincount, whose
+            # GPU kernel copies the min and max of inputs to host
+            if self._device_stat is None:
+                self._device_stat = _as_tensor_on(
+                    np.zeros([2 * num_buckets], dtype='int64'), preds.place
+                )
+            if bins.shape[0] > 0:
+                self._device_stat = paddle.index_add(
+                    self._device_stat, bins, 0, paddle.ones_like(bins)
+                )
+        else:
+            labels = np.array(labels).reshape([-1])
             preds = np.array(preds)
-        elif not _is_numpy_(preds):
-            raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
-
-        for i, lbl in enumerate(labels):
-            value = preds[i, 1]
-            bin_idx = int(value * self._num_thresholds)
-            assert bin_idx <= self._num_thresholds
-            if lbl:
-                self._stat_pos[bin_idx] += 1.0
-            else:
-                self._stat_neg[bin_idx] += 1.0
+            bins = (preds[:, 1] * self._num_thresholds).astype('int64')
+            assert bins.size == 0 or (
+                bins.min() >= 0 and bins.max() <= self._num_thresholds
+            )
+            positive = labels != 0
+            self._stat_pos += np.bincount(bins[positive], minlength=num_buckets)
+            self._stat_neg += np.bincount(
+                bins[~positive], minlength=num_buckets
+            )
+
+    def update_many(
+        self,
+        preds: Sequence[npt.NDArray[np.float32 | np.float64] | Tensor],
+        labels: Sequence[npt.NDArray[np.int32 | np.int64] | Tensor],
+    ) -> None:
+        """
+        Update the auc curve with a sequence of mini-batches at once.
+
+        Args:
+            preds (list[numpy.ndarray|Tensor]): The predictions of each
+                mini-batch, the same as :attr:`preds` of ``update``.
+            labels (list[numpy.ndarray|Tensor]): The labels of each
+                mini-batch, the same as :attr:`labels` of ``update``.
+        """
+        if len(preds) > 0:
+            self.update(_concat_batches(preds), _concat_batches(labels))
 
     @staticmethod
     def trapezoid_area(x1: float, x2: float, y1: float, y2: float) -> float:
@@ -772,20 +1064,22 @@ class Auc(Metric):
         Return:
             float: the area under auc curve
         """
-        tot_pos = 0.0
-        tot_neg = 0.0
-        auc = 0.0
-
-        idx = self._num_thresholds
-        while idx >= 0:
-            tot_pos_prev = tot_pos
-            tot_neg_prev = tot_neg
-            tot_pos += self._stat_pos[idx]
-            tot_neg += self._stat_neg[idx]
-            auc += self.trapezoid_area(
-                tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+        self._sync_device_stat()
+        # walk thresholds from high to low, each bucket adds a trapezoid
+        # between the previous and current (tot_neg, tot_pos) points
+        tot_pos = np.cumsum(self._stat_pos[::-1])
+        tot_neg = np.cumsum(self._stat_neg[::-1])
+        tot_pos_prev = np.concatenate([[0.0], tot_pos[:-1]])
+        tot_neg_prev = np.concatenate([[0.0], tot_neg[:-1]])
+        auc = float(
+            np.sum(
+                self.trapezoid_area(
+                    tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+                )
             )
-            idx -= 1
+        )
+        tot_pos = float(tot_pos[-1])
+        tot_neg = float(tot_neg[-1])
 
         return (
             auc / tot_pos / tot_neg if tot_pos > 0.0 and tot_neg > 0.0 else 0.0
@@ -798,6 +1092,25 @@ class Auc(Metric):
         _num_pred_buckets = self._num_thresholds + 1
         self._stat_pos = np.zeros(_num_pred_buckets)
         self._stat_neg = np.zeros(_num_pred_buckets)
+        self._device_stat = None
+
+    def get_states(self) -> list[npt.NDArray[Any]]:
+        """
+        Returns the histograms of positive and negative predictions over
+        the threshold buckets.
+        """
+        self._sync_device_stat()
+        return [self._stat_pos.copy(), self._stat_neg.copy()]
+
+    def set_states(self, states: Sequence[npt.NDArray[Any]]) -> None:
+        """
+        Set the histograms of positive and negative predictions.
+        """
+        stat_pos, stat_neg = states
+        assert len(stat_pos) == len(stat_neg) == self._num_thresholds + 1
+        self._device_stat = None
+        self._stat_pos = np.array(stat_pos, dtype='float64')
+        self._stat_neg = np.array(stat_neg, dtype='float64')
 
     def name(self) -> str:
         """
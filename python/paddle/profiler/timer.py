@@ -12,8 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import csv
+import json
+import math
+import os
+import threading
 import timeit
 from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 
 class Stack:
@@ -301,6 +307,309 @@ class TimerHook(Hook):
         )
 
 
+class Histogram:
+    """
+    A histogram of costs with fixed memory. Costs are counted in buckets
+    whose bounds grow exponentially from `min_value` to `max_value` by
+    `growth`, so the relative error of percentiles is at most `growth - 1`,
+    and recording a cost is O(1).
+    """
+
+    def __init__(self, min_value=1e-6, max_value=1e3, growth=2**0.125):
+        self._min_value = min_value
+        self._log_growth = math.log(growth)
+        self._num_buckets = (
+            int(math.ceil(math.log(max_value / min_value) / self._log_growth))
+            + 1
+        )
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * self._num_buckets
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        if value > self._min_value:
+            # bucket i counts costs in (min * growth^(i-1), min * growth^i]
+            index = min(
+                int(math.log(value / self._min_value) / self._log_growth) + 1,
+                self._num_buckets - 1,
+            )
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """
+        Get the q-th percentile, which is the upper bound of the bucket it
+        falls in.
+        """
+
+        if self.count == 0:
+            return 0
+        rank = q / 100.0 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if count > 0 and cumulative >= rank:
+                return min(
+                    self._min_value * math.exp(self._log_growth * index),
+                    self.max,
+                )
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else 0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class TelemetryExporter:
+    """
+    As the base class of exporters of the telemetry. The snapshot exported
+    is a dict with "step", "rank", "metrics" and "stragglers", in which
+    "metrics" maps the name of a cost to its count, avg, p50, p99 and max
+    in seconds of the last interval.
+    """
+
+    def export(self, snapshot):
+        pass
+
+    def close(self):
+        pass
+
+
+class CSVExporter(TelemetryExporter):
+    """
+    Append a row of each metric of snapshots to a CSV file.
+    """
+
+    fields = ['step', 'rank', 'metric', 'count', 'avg', 'p50', 'p99', 'max']
+
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, snapshot):
+        write_header = not os.path.exists(self.path)
+        with open(self.path, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(self.fields)
+            for name, summary in snapshot['metrics'].items():
+                writer.writerow(
+                    [snapshot['step'], snapshot['rank'], name]
+                    + [summary[field] for field in self.fields[3:]]
+                )
+
+
+class JSONExporter(TelemetryExporter):
+    """
+    Append snapshots to a file as JSON lines.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, snapshot):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(snapshot) + '\n')
+
+
+class HTTPExporter(TelemetryExporter):
+    """
+    Serve the latest snapshot as JSON on a local HTTP endpoint, which is
+    served by a daemon thread. A free port is chosen if `port` is 0, which
+    can be got by `exporter.port` .
+    """
+
+    def __init__(self, port=0, host='127.0.0.1'):
+        self._snapshot = {}
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(exporter._snapshot).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def export(self, snapshot):
+        self._snapshot = snapshot
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TelemetryHook(Hook):
+    """
+    A hook for always-on timing of steps with low overhead. The reader cost
+    and batch cost of each step are recorded in fixed-memory histograms,
+    as well as costs recorded by `Benchmark.record_cost` , such as
+    "h2d_cost" and "optimizer_cost". Costs are measured on the host without
+    synchronizing devices.
+
+    Every `interval` steps, the summaries of the histograms are exported
+    by `exporters` and the histograms are reset. In distributed training,
+    the p50 batch costs of all ranks are gathered at the same time, and the
+    ranks whose p50 batch cost is larger than `straggler_threshold` times
+    the median of all ranks are reported as stragglers.
+
+    Like `TimerHook` , nothing is recorded while the timing is paused by
+    `Benchmark.check_if_need_record` , e.g. during evaluation in training,
+    and the timing of steps restarts after `begin` , `end` and the pause.
+    The first step is timed from its first reading of data, or not recorded
+    if there is no reading.
+    """
+
+    def __init__(self, exporters=None, interval=100, straggler_threshold=1.2):
+        self.exporters = list(exporters or [])
+        self.interval = interval
+        self.straggler_threshold = straggler_threshold
+        self.histograms = OrderedDict(
+            (name, Histogram())
+            for name in [
+                'reader_cost',
+                'batch_cost',
+                'h2d_cost',
+                'optimizer_cost',
+            ]
+        )
+        self.total_steps = 0
+        self.last_snapshot = None
+        self.start_time = None
+        self.start_reader = timeit.default_timer()
+
+    @staticmethod
+    def _need_record(benchmark):
+        return (
+            benchmark.current_event is None
+            or benchmark.current_event.need_record
+        )
+
+    def begin(self, benchmark):
+        self.start_time = timeit.default_timer()
+
+    def end(self, benchmark):
+        self.start_time = timeit.default_timer()
+
+    def before_reader(self, benchmark):
+        self.start_reader = timeit.default_timer()
+        if self.start_time is None:
+            self.start_time = self.start_reader
+
+    def after_reader(self, benchmark):
+        if not self._need_record(benchmark):
+            return
+        self.histograms['reader_cost'].record(
+            timeit.default_timer() - self.start_reader
+        )
+
+    def after_step(self, benchmark):
+        if not self._need_record(benchmark):
+            return
+        now = timeit.default_timer()
+        if self.start_time is None:
+            self.start_time = now
+            return
+        self.histograms['batch_cost'].record(now - self.start_time)
+        self.start_time = now
+        self.total_steps += 1
+        if self.total_steps % self.interval == 0:
+            self.flush()
+
+    def record(self, name, cost):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.record(cost)
+
+    def summary(self):
+        return {
+            name: histogram.summary()
+            for name, histogram in self.histograms.items()
+            if histogram.count > 0
+        }
+
+    def flush(self):
+        """
+        Export the summaries of the current interval and reset histograms.
+        In distributed training, it should be called by all ranks.
+        """
+
+        import paddle.distributed as dist
+
+        metrics = self.summary()
+        snapshot = {
+            'step': self.total_steps,
+            'rank': dist.get_rank(),
+            'metrics': metrics,
+            'stragglers': self._detect_stragglers(metrics),
+        }
+        for exporter in self.exporters:
+            exporter.export(snapshot)
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.last_snapshot = snapshot
+        return snapshot
+
+    def _detect_stragglers(self, metrics):
+        import paddle.distributed as dist
+
+        if dist.get_world_size() <= 1 or not dist.is_initialized():
+            return []
+        batch_cost = metrics.get('batch_cost', {}).get('p50', 0)
+        batch_costs = []
+        dist.all_gather_object(batch_costs, batch_cost)
+        median = sorted(batch_costs)[len(batch_costs) // 2]
+        return [
+            rank
+            for rank, cost in enumerate(batch_costs)
+            if cost > median * self.straggler_threshold
+        ]
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+
+class _CostTimer:
+    def __init__(self, benchmark, name):
+        self._benchmark = benchmark
+        self._name = name
+
+    def __enter__(self):
+        self._start = timeit.default_timer()
+        return self
+
+    def __exit__(self, *args):
+        self._benchmark.record_cost(
+            self._name, timeit.default_timer() - self._start
+        )
+
+
 class TimeAverager:
     """
     Record the cost of every step and count the average.
@@ -396,6 +705,42 @@ class Benchmark:
         self.current_event.reset()
         return message
 
+    def enable_telemetry(
+        self, exporters=None, interval=100, straggler_threshold=1.2
+    ):
+        """
+        Enable the always-on timing of steps, which is recorded when `step`
+        is called, see `TelemetryHook` for the arguments. It returns the
+        hook, whose `summary` gives the summaries of the current interval.
+        """
+
+        self.disable_telemetry()
+        hook = TelemetryHook(exporters, interval, straggler_threshold)
+        self.hooks['telemetry_hook'] = hook
+        return hook
+
+    def disable_telemetry(self):
+        hook = self.hooks.pop('telemetry_hook', None)
+        if hook is not None:
+            hook.close()
+
+    def record_cost(self, name, cost):
+        """
+        Record a cost in seconds, such as "h2d_cost" or "optimizer_cost",
+        if the telemetry is enabled.
+        """
+
+        hook = self.hooks.get('telemetry_hook')
+        if hook is not None:
+            hook.record(name, cost)
+
+    def timing(self, name):
+        """
+        A context manager recording the cost of its body as `name` .
+        """
+
+        return _CostTimer(self, name)
+
     def begin(self):
         for hook in self.hooks.values():
             hook.begin(self)
@@ -439,7 +784,10 @@ class Benchmark:
                 == reader.__dict__['_dataset']
             ):
                 self.current_event.need_record = True
-                self.hooks['timer_hook'].start_time = timeit.default_timer()
+                start_time = timeit.default_timer()
+                self.hooks['timer_hook'].start_time = start_time
+                if 'telemetry_hook' in self.hooks:
+                    self.hooks['telemetry_hook'].start_time = start_time
 
 
 _benchmark_ = Benchmark()
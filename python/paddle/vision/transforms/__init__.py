@@ -12,6 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .batch_transforms import (
+    BaseBatchTransform,
+    BatchCenterCrop,
+    BatchColorJitter,
+    BatchCompose,
+    BatchNormalize,
+    BatchRandomCrop,
+    BatchRandomHorizontalFlip,
+    BatchRandomResizedCrop,
+    BatchRandomVerticalFlip,
+    BatchResize,
+)
 from .functional import (
     adjust_brightness,
     adjust_contrast,
@@ -94,4 +106,14 @@ __all__ = [
     'adjust_hue',
     'normalize',
     'erase',
+    'BaseBatchTransform',
+    'BatchCompose',
+    'BatchResize',
+    'BatchCenterCrop',
+    'BatchRandomCrop',
+    'BatchRandomResizedCrop',
+    'BatchRandomHorizontalFlip',
+    'BatchRandomVerticalFlip',
+    'BatchNormalize',
+    'BatchColorJitter',
 ]
@@ -0,0 +1,601 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import math
+import numbers
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Callable, Literal
+
+import numpy as np
+from typing_extensions import TypeAlias
+
+import paddle
+
+from . import functional_tensor as F_t
+from .transforms import _check_input
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from paddle import Tensor
+    from paddle._typing import Size2
+
+    _BatchInput: TypeAlias = Tensor | npt.NDArray[Any]
+
+__all__ = []
+
+# NOTE: [ batch transforms ] Transforms in this file are applied on a whole
+# collated batch of images in shape of (N, C, H, W) or (N, H, W, C), random
+# parameters are drawn for each sample with numpy at once and applied with
+# broadcasting paddle operators, so the cost of augmentation scales with
+# the batch size instead of the number of python calls. They can be used as
+# a post-collate stage of DataLoader by BatchCompose.
+
+
+def _to_float(img):
+    return img if paddle.is_floating_point(img) else img.astype('float32')
+
+
+def _restore_dtype(img, dtype):
+    if dtype == paddle.uint8:
+        return img.round().clip(0, 255).astype(dtype)
+    return img.astype(dtype)
+
+
+def _max_value(img):
+    return 1.0 if paddle.is_floating_point(img) else 255.0
+
+
+def _sample_shape(img, values):
+    return paddle.to_tensor(values, dtype='float32', place=img.place).reshape(
+        [-1, 1, 1, 1]
+    )
+
+
+class BaseBatchTransform:
+    """
+    Base class of batch transforms, which transforms a batch of images in
+    numpy.ndarray or paddle.Tensor with the same type returned.
+
+    Subclasses should implement :code:`_apply_batch`, which takes a
+    paddle.Tensor in shape of (N, C, H, W) and returns the transformed one.
+
+    Args:
+        data_format (str, optional): Data format of each image in batch,
+            'CHW' for batch in shape of (N, C, H, W), and 'HWC' for batch in
+            shape of (N, H, W, C). Default: 'CHW'.
+    """
+
+    def __init__(self, data_format: Literal['CHW', 'HWC'] = 'CHW') -> None:
+        assert data_format in (
+            'CHW',
+            'HWC',
+        ), f"data_format should be 'CHW' or 'HWC', but got {data_format}"
+        self.data_format = data_format
+
+    def _apply_batch(self, images: Tensor) -> Tensor:
+        raise NotImplementedError
+
+    def __call__(self, images: _BatchInput) -> _BatchInput:
+        is_numpy = isinstance(images, np.ndarray)
+        img = paddle.to_tensor(images) if is_numpy else images
+        assert (
+            img.ndim == 4
+        ), f"batch transforms expect 4-D images, but got {img.ndim}-D input"
+        if self.data_format == 'HWC':
+            img = img.transpose([0, 3, 1, 2])
+        img = self._apply_batch(img)
+        if self.data_format == 'HWC':
+            img = img.transpose([0, 2, 3, 1])
+        return img.numpy() if is_numpy else img
+
+
+class BatchCompose:
+    """
+    Compose batch transforms as a post-collate stage, which can be used as
+    :attr:`collate_fn` of :ref:`api_paddle_io_DataLoader`, the samples are
+    collated first and the transforms are applied on the collated images.
+
+    Args:
+        transforms (list|tuple): List of batch transforms to compose.
+        collate_fn (Callable, optional): function to collate samples into a
+            batch, default :code:`paddle.io.dataloader.collate.default_collate_fn`.
+        index (int, optional): index of images in a collated batch if the
+            batch is a list or tuple, e.g. 0 for (image, label) samples.
+            Default: 0.
+
+    Returns:
+        A callable object of BatchCompose.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import paddle
+            >>> from paddle.io import DataLoader, Dataset
+            >>> from paddle.vision.transforms import (
+            ...     BatchCompose, BatchNormalize, BatchRandomHorizontalFlip)
+
+            >>> class RandomDataset(Dataset):  # type: ignore[type-arg]
+            ...     def __getitem__(self, idx):
+            ...         image = np.random.randint(0, 256, [3, 32, 32], 'uint8')
+            ...         label = np.array([idx]).astype('int64')
+            ...         return image, label
+            ...
+            ...     def __len__(self):
+            ...         return 16
+            ...
+            >>> transform = BatchCompose([
+            ...     BatchRandomHorizontalFlip(0.5),
+            ...     BatchNormalize(mean=127.5, std=127.5),
+            ... ])
+            >>> loader = DataLoader(RandomDataset(), batch_size=8,
+            ...                     collate_fn=transform)
+            >>> for image, label in loader:
+            ...     print(image.shape, image.dtype)
+            ...     break
+            [8, 3, 32, 32] paddle.float32
+    """
+
+    def __init__(
+        self,
+        transforms: Sequence[Callable[[Any], Any]],
+        collate_fn: Callable[[Any], Any] | None = None,
+        index: int = 0,
+    ) -> None:
+        self.transforms = list(transforms)
+        self.collate_fn = collate_fn
+        self.index = index
+
+    def __call__(self, batch: Any) -> Any:
+        if self.collate_fn is None:
+            from paddle.io.dataloader.collate import default_collate_fn
+
+            batch = default_collate_fn(batch)
+        else:
+            batch = self.collate_fn(batch)
+
+        if isinstance(batch, (list, tuple)):
+            images = batch[self.index]
+        else:
+            images = batch
+        for t in self.transforms:
+            images = t(images)
+        if isinstance(batch, (list, tuple)):
+            batch = list(batch)
+            batch[self.index] = images
+            return batch
+        return images
+
+
+class BatchResize(BaseBatchTransform):
+    """
+    Resize a batch of images to the given size.
+
+    Args:
+        size (int|list|tuple): Target size. If size is a sequence like
+            (h, w), output size will be matched to this. If size is an int,
+            smaller edge of the image will be matched to this number, i.e,
+            if height > width, then image will be rescaled to
+            (size * height / width, size).
+        interpolation (str, optional): Interpolation method, can be
+            'nearest', 'bilinear' or 'bicubic'. Default: 'bilinear'.
+        data_format (str, optional): Same as ``BaseBatchTransform``.
+            Default: 'CHW'.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from paddle.vision.transforms import BatchResize
+
+            >>> images = np.random.rand(4, 3, 64, 48).astype('float32')
+            >>> print(BatchResize(32)(images).shape)
+            (4, 3, 42, 32)
+    """
+
+    def __init__(
+        self,
+        size: int | Size2,
+        interpolation: Literal['nearest', 'bilinear', 'bicubic'] = 'bilinear',
+        data_format: Literal['CHW', 'HWC'] = 'CHW',
+    ) -> None:
+        super().__init__(data_format)
+        assert isinstance(size, int) or (
+            isinstance(size, Sequence) and len(size) == 2
+        ), f"size should be an int or a sequence of 2 ints, but got {size}"
+        self.size = size
+        self.interpolation = interpolation
+
+    def _apply_batch(self, images):
+        h, w = images.shape[-2:]
+        if isinstance(self.size, int):
+            if w <= h:
+                size = (int(self.size * h / w), self.size)
+            else:
+                size = (self.size, int(self.size * w / h))
+        else:
+            size = tuple(self.size)
+        if size == (h, w):
+            return images
+        out = paddle.nn.functional.interpolate(
+            _to_float(images),
+            size=size,
+            mode=self.interpolation,
+            align_corners=False,
+        )
+        return _restore_dtype(out, images.dtype)
+
+
+class BatchCenterCrop(BaseBatchTransform):
+    """
+    Crop the center of a batch of images.
+
+    Args:
+        size (int|list|tuple): Output size (h, w) of the crop, a square crop
+            (size, size) is made if size is an int.
+        data_format (str, optional): Same as ``BaseBatchTransform``.
+            Default: 'CHW'.
+    """
+
+    def __init__(
+        self,
+        size: int | Size2,
+        data_format: Literal['CHW', 'HWC'] = 'CHW',
+    ) -> None:
+        super().__init__(data_format)
+        self.size = (size, size) if isinstance(size, int) else tuple(size)
+
+    def _apply_batch(self, images):
+        h, w = images.shape[-2:]
+        th, tw = self.size
+        assert th <= h and tw <= w, "crop size should not exceed image size"
+        top, left = (h - th) // 2, (w - tw) // 2
+        return images[:, :, top : top + th, left : left + tw]
+
+
+class BatchRandomCrop(BaseBatchTransform):
+    """
+    Crop a batch of images at a random location for each image, the crop
+    is gathered for the whole batch at once.
+
+    Args:
+        size (int|list|tuple): Output size (h, w) of the crop, a square crop
+            (size, size) is made if size is an int.
+        data_format (str, optional): Same as ``BaseBatchTransform``.
+            Default: 'CHW'.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from paddle.vision.transforms import BatchRandomCrop
+
+            >>> images = np.random.rand(4, 3, 64, 48).astype('float32')
+            >>> print(BatchRandomCrop(32)(images).shape)
+            (4, 3, 32, 32)
+    """
+
+    def __init__(
+        self,
+        size: int | Size2,
+        data_format: Literal['CHW', 'HWC'] = 'CHW',
+    ) -> None:
+        super().__init__(data_format)
+        self.size = (size, size) if isinstance(size, int) else tuple(size)
+
+    def _get_param(self, n, h, w):
+        th, tw = self.size
+        assert th <= h and tw <= w, "crop size should not exceed image size"
+        top = np.random.randint(0, h - th + 1, size=n)
+        left = np.random.randint(0, w - tw + 1, size=n)
+        return top, left
+
+    def _apply_batch(self, images):
+        n, c, h, w = images.shape
+        th, tw = self.size
+        top, left = self._get_param(n, h, w)
+        rows = top[:, None] + np.arange(th)[None, :]
+        cols = left[:, None] + np.arange(tw)[None, :]
+        rows = paddle.to_tensor(rows.reshape([n, 1, th, 1]), place=images.place)
+        cols = paddle.to_tensor(cols.reshape([n, 1, 1, tw]), place=images.place)
+        images = paddle.take_along_axis(
+            images, rows.expand([n, c, th, w]), axis=2
+        )
+        return paddle.take_along_axis(
+            images, cols.expand([n, c, th, tw]), axis=3
+        )
+
+
+class BatchRandomResizedCrop(BaseBatchTransform):
+    """
+    Crop a random size and aspect ratio of each image in a batch and resize
+    the crops to the given size, the same as
+    :ref:`api_paddle_vision_transforms_RandomResizedCrop` for each image.
+    Crops of the whole batch are sampled with one affine grid.
+
+    Args:
+        size (int|list|tuple): Target size of output image, with (height,
+            width) shape.
+        scale (list|tuple, optional): Scale range of the cropped image before
+            resizing, relatively to the origin image. Default: (0.08, 1.0).
+        ratio (list|tuple, optional): Range of aspect ratio of the origin
+            aspect ratio cropped. Default: (0.75, 1.33).
+        interpolation (str, optional): Interpolation method, can be
+            'nearest' or 'bilinear'. Default: 'bilinear'.
+        data_format (str, optional): Same as ``BaseBatchTransform``.
+            Default: 'CHW'.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from paddle.vision.transforms import BatchRandomResizedCrop
+
+            >>> images = np.random.rand(4, 3, 64, 48).astype('float32')
+            >>> print(BatchRandomResizedCrop(32)(images).shape)
+            (4, 3, 32, 32)
+    """
+
+    def __init__(
+        self,
+        size: int | Size2,
+        scale: Sequence[float] = (0.08, 1.0),
+        ratio: Sequence[float] = (3.0 / 4, 4.0 / 3),
+        interpolation: Literal['nearest', 'bilinear'] = 'bilinear',
+        data_format: Literal['CHW', 'HWC'] = 'CHW',
+    ) -> None:
+        super().__init__(data_format)
+        self.size = (size, size) if isinstance(size, int) else tuple(size)
+        assert scale[0] <= scale[1], "scale should be of kind (min, max)"
+        assert ratio[0] <= ratio[1], "ratio should be of kind (min, max)"
+        self.scale = scale
+        self.ratio = ratio
+        self.interpolation = interpolation
+
+    def _get_param(self, n, height, width, attempts=10):
+        area = height * width
+        target_area = np.random.uniform(*self.scale, size=[n, attempts]) * area
+        log_ratio = tuple(math.log(x) for x in self.ratio)
+        aspect_ratio = np.exp(np.random.uniform(*log_ratio, size=[n, attempts]))
+        w = np.round(np.sqrt(target_area * aspect_ratio)).astype('int64')
+        h = np.round(np.sqrt(target_area / aspect_ratio)).astype('int64')
+        valid = (w > 0) & (w <= width) & (h > 0) & (h <= height)
+
+        # fallback to central crop if all attempts fail
+        in_ratio = float(width) / float(height)
+        if in_ratio < min(self.ratio):
+            fw, fh = width, int(round(width / min(self.ratio)))
+        elif in_ratio > max(self.ratio):
+            fw, fh = int(round(height * max(self.ratio))), height
+        else:
+            fw, fh = width, height
+
+        # take the first valid attempt of each image
+        first = valid.argmax(axis=1)
+        found = valid[np.arange(n), first]
+        h = np.where(found, h[np.arange(n), first], fh)
+        w = np.where(found, w[np.arange(n), first], fw)
+        top = np.where(
+            found,
+            np.floor(np.random.rand(n) * (height - h + 1)).astype('int64'),
+            (height - h) // 2,
+        )
+        left = np.where(
+            found,
+            np.floor(np.random.rand(n) * (width - w + 1)).astype('int64'),
+            (width - w) // 2,
+        )
+        return top, left, h, w
+
+    def _apply_batch(self, images):
+        n, c, height, width = images.shape
+        top, left, h, w = self._get_param(n, height, width)
+        # affine theta mapping normalized output coordinates to the crop
+        # box in normalized input coordinates, align_corners=False
+        theta = np.zeros([n, 2, 3], dtype='float32')
+        theta[:, 0, 0] = w / width
+        theta[:, 0, 2] = (2 * left + w) / width - 1
+        theta[:, 1, 1] = h / height
+        theta[:, 1, 2] = (2 * top + h) / height - 1
+        theta = paddle.to_tensor(theta, place=images.place)
+        grid = paddle.nn.functional.affine_grid(
+            theta, [n, c, *self.size], align_corners=False
+        )
+        out = paddle.nn.functional.grid_sample(
+            _to_float(images),
+            grid,
+            mode=self.interpolation,
+            padding_mode='border',
+            align_corners=False,
+        )
+        return _restore_dtype(out, images.dtype)
+
+
+class _BatchRandomFlip(BaseBatchTransform):
+    _axis = -1
+
+    def __init__(
+        self, prob: float = 0.5, data_format: Literal['CHW', 'HWC'] = 'CHW'
+    ) -> None:
+        super().__init__(data_format)
+        assert 0 <= prob <= 1, "probability must be between 0 and 1"
+        self.prob = prob
+
+    def _apply_batch(self, images):
+        mask = np.random.rand(images.shape[0]) < self.prob
+        if not mask.any():
+            return images
+        mask = paddle.to_tensor(mask, place=images.place).reshape([-1, 1, 1, 1])
+        return paddle.where(mask, images.flip(axis=[self._axis]), images)
+
+
+class BatchRandomHorizontalFlip(_BatchRandomFlip):
+    """
+    Horizontally flip each image in a batch with a given probability.
+
+    Args:
+        prob (float, optional): Probability of each image being flipped.
+            Default: 0.5.
+        data_format (str, optional): Same as ``BaseBatchTransform``.
+            Default: 'CHW'.
+    """
+
+    _axis = -1
+
+
+class BatchRandomVerticalFlip(_BatchRandomFlip):
+    """
+    Vertically flip each image in a batch with a given probability.
+
+    Args:
+        prob (float, optional): Probability of each image being flipped.
+            Default: 0.5.
+        data_format (str, optional): Same as ``BaseBatchTransform``.
+            Default: 'CHW'.
+    """
+
+    _axis = -2
+
+
+class BatchNormalize(BaseBatchTransform):
+    """
+    Normalize a batch of images with mean and standard deviation, the
+    output is float32.
+
+    Args:
+        mean (int|float|list|tuple, optional): Sequence of means for each
+            channel. Default: 0.0.
+        std (int|float|list|tuple, optional): Sequence of standard
+            deviations for each channel. Default: 1.0.
+        data_format (str, optional): Same as ``BaseBatchTransform``.
+            Default: 'CHW'.
+    """
+
+    def __init__(
+        self,
+        mean: float | Sequence[float] = 0.0,
+        std: float | Sequence[float] = 1.0,
+        data_format: Literal['CHW', 'HWC'] = 'CHW',
+    ) -> None:
+        super().__init__(data_format)
+        if isinstance(mean, numbers.Number):
+            mean = [mean]
+        if isinstance(std, numbers.Number):
+            std = [std]
+        self.mean = mean
+        self.std = std
+
+    def _apply_batch(self, images):
+        mean = paddle.to_tensor(
+            self.mean, dtype='float32', place=images.place
+        ).reshape([1, -1, 1, 1])
+        std = paddle.to_tensor(
+            self.std, dtype='float32', place=images.place
+        ).reshape([1, -1, 1, 1])
+        return (images.astype('float32') - mean) / std
+
+
+class BatchColorJitter(BaseBatchTransform):
+    """
+    Randomly change the brightness, contrast, saturation and hue of each
+    RGB image in a batch, the factors are chosen for each image.
+
+    Different from :ref:`api_paddle_vision_transforms_ColorJitter`, which
+    applies the adjustments in a random order for each image, adjustments
+    are applied in the fixed order of brightness, contrast, saturation and
+    hue to the whole batch.
+
+    Args:
+        brightness (float, optional): How much to jitter brightness.
+            Chosen uniformly from [max(0, 1 - brightness), 1 + brightness].
+            Default: 0.
+        contrast (float, optional): How much to jitter contrast.
+            Chosen uniformly from [max(0, 1 - contrast), 1 + contrast].
+            Default: 0.
+        saturation (float, optional): How much to jitter saturation.
+            Chosen uniformly from [max(0, 1 - saturation), 1 + saturation].
+            Default: 0.
+        hue (float, optional): How much to jitter hue.
+            Chosen uniformly from [-hue, hue]. Should have 0<= hue <= 0.5.
+            Default: 0.
+        data_format (str, optional): Same as ``BaseBatchTransform``.
+            Default: 'CHW'.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from paddle.vision.transforms import BatchColorJitter
+
+            >>> images = np.random.randint(0, 256, [4, 3, 32, 32], 'uint8')
+            >>> out = BatchColorJitter(0.4, 0.4, 0.4, 0.1)(images)
+            >>> print(out.shape, out.dtype)
+            (4, 3, 32, 32) uint8
+    """
+
+    def __init__(
+        self,
+        brightness: float = 0,
+        contrast: float = 0,
+        saturation: float = 0,
+        hue: float = 0,
+        data_format: Literal['CHW', 'HWC'] = 'CHW',
+    ) -> None:
+        super().__init__(data_format)
+        self.brightness = _check_input(brightness, 'brightness')
+        self.contrast = _check_input(contrast, 'contrast')
+        self.saturation = _check_input(saturation, 'saturation')
+        self.hue = _check_input(
+            hue, 'hue', center=0, bound=(-0.5, 0.5), clip_first_on_zero=False
+        )
+
+    def _apply_batch(self, images):
+        n = images.shape[0]
+        dtype = images.dtype
+        max_value = _max_value(images)
+        img = _to_float(images)
+
+        if self.brightness is not None:
+            factor = np.random.uniform(*self.brightness, size=n)
+            img = (img * _sample_shape(img, factor)).clip(0, max_value)
+
+        if self.contrast is not None:
+            factor = np.random.uniform(*self.contrast, size=n)
+            mean = F_t.to_grayscale(img).mean(axis=[1, 2, 3], keepdim=True)
+            img = paddle.lerp(mean, img, _sample_shape(img, factor)).clip(
+                0, max_value
+            )
+
+        if self.saturation is not None:
+            factor = np.random.uniform(*self.saturation, size=n)
+            gray = F_t.to_grayscale(img)
+            img = paddle.lerp(gray, img, _sample_shape(img, factor)).clip(
+                0, max_value
+            )
+
+        if self.hue is not None:
+            factor = np.random.uniform(*self.hue, size=n)
+            h, s, v = F_t._rgb_to_hsv(img / max_value).unbind(axis=-3)
+            h = h + _sample_shape(img, factor).squeeze(1)
+            h = h - h.floor()
+            img = F_t._hsv_to_rgb(paddle.stack([h, s, v], axis=-3)) * max_value
+
+        return _restore_dtype(img, dtype)
@@ -21,7 +21,16 @@ import numpy as np
 
 import paddle
 import paddle.distributed as dist
-from paddle.distributed.checkpoint.load_state_dict import get_checkpoint_files
+from paddle.distributed.checkpoint import writer
+from paddle.distributed.checkpoint.load_state_dict import (
+    MmapStorageFile,
+    ReadItem,
+    get_checkpoint_files,
+    get_storage_byte_ranges,
+    get_transfer_batches,
+    load_storage_file,
+)
+from paddle.distributed.checkpoint.metadata import LocalTensorIndex
 from paddle.distributed.checkpoint.utils import (
     flatten_state_dict,
     unflatten_state_dict,
@@ -180,6 +189,186 @@ class TestDistCheckpointUtils(test_base.CommunicationTestDistBase):
 
         ckpt_dir_tmp.cleanup()
 
+    def test_get_transfer_batches(self):
+        def read_item(key, rank, dtype, lengths):
+            return ReadItem(
+                LocalTensorIndex(key, (0,)),
+                rank,
+                dtype,
+                (0,),
+                (0,),
+                lengths,
+            )
+
+        read_items = [
+            read_item("w0", 0, "float32", (4,)),
+            read_item("w1", 1, "float32", (4,)),
+            read_item("w2", 1, "float32", (8,)),
+            read_item("w3", 1, "float16", (2,)),
+            read_item("w4", 2, "float32", (0,)),
+            read_item("w5", 0, "float32", (16,)),
+        ]
+        load_infos = {
+            LocalTensorIndex(f"w{i}", (0,)): (0, "0_0.distcp") for i in range(6)
+        }
+        # items loaded locally or with no element are not transferred
+        batches = get_transfer_batches(read_items, load_infos)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(
+            [(b.src, b.dst, b.dtype, b.numel) for b in batches[0]],
+            [(0, 1, "float32", 12), (0, 1, "float16", 2)],
+        )
+        self.assertEqual(
+            [
+                item.local_tensor_index.tensor_key
+                for item in batches[0][0].items
+            ],
+            ["w1", "w2"],
+        )
+
+        # each rank sends or receives at most 32 bytes in a batch
+        batches = get_transfer_batches(
+            read_items, load_infos, max_bytes_per_rank=32
+        )
+        self.assertEqual(
+            [[(b.dtype, b.numel) for b in batch] for batch in batches],
+            [[("float32", 4)], [("float32", 8)], [("float16", 2)]],
+        )
+
+    def test_mmap_storage_file(self):
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        ckpt_dir = ckpt_dir_tmp.name
+        state_dict = {
+            "w1": paddle.arange(32, dtype="float32").reshape([4, 8]),
+            "w2": paddle.to_tensor(3, dtype="int64"),
+        }
+        dist.save_state_dict(state_dict, ckpt_dir)
+
+        metadata_files, local_load_files = get_checkpoint_files(
+            ckpt_dir, use_cache=False
+        )
+        metadata_list = [
+            paddle.load(os.path.join(ckpt_dir, metadata_file))
+            for metadata_file in metadata_files
+        ]
+        file_to_byte_ranges = get_storage_byte_ranges(metadata_list)
+        self.assertEqual(list(file_to_byte_ranges.keys()), ["0_0.distcp"])
+        byte_ranges, _ = file_to_byte_ranges["0_0.distcp"]
+        self.assertEqual(byte_ranges["w1"], (0, 128))
+        self.assertEqual(byte_ranges["w2"], (128, 8))
+
+        storage_file = load_storage_file(
+            ckpt_dir, "0_0.distcp", file_to_byte_ranges
+        )
+        self.assertIsInstance(storage_file, MmapStorageFile)
+        self.assertTrue("w1" in storage_file)
+        np.testing.assert_equal(
+            storage_file.read("w1", (1, 2), (2, 3)).numpy(),
+            state_dict["w1"].numpy()[1:3, 2:5],
+        )
+        np.testing.assert_equal(storage_file.read("w2", (), ()).numpy(), 3)
+
+        # load the whole file without byte ranges
+        self.assertIsInstance(
+            load_storage_file(ckpt_dir, "0_0.distcp", {}), dict
+        )
+
+        state_dict_to_load = {
+            "w1": paddle.zeros([4, 8], dtype="float32"),
+            "w2": paddle.to_tensor(0, dtype="int64"),
+        }
+        dist.load_state_dict(state_dict_to_load, ckpt_dir)
+        for key, value in state_dict.items():
+            np.testing.assert_equal(
+                state_dict_to_load[key].numpy(), value.numpy()
+            )
+        ckpt_dir_tmp.cleanup()
+
+    def test_split_data_files(self):
+        state_dict = {
+            "w1": paddle.rand([4, 8]),
+            "w2": paddle.rand([8]),
+            "w3": paddle.rand([2, 8]),
+        }
+        parts = writer.split_state_dict(state_dict, file_size_limit=128)
+        self.assertEqual(
+            [list(part.keys()) for part in parts], [["w1"], ["w2", "w3"]]
+        )
+        self.assertEqual(writer.split_state_dict({}), [{}])
+        self.assertEqual(
+            writer.get_part_file_name("0_1.distcp", 0), "0_1.distcp"
+        )
+        self.assertEqual(
+            writer.get_part_file_name("0_1.distcp", 2), "0_1.2.distcp"
+        )
+
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        ckpt_dir = ckpt_dir_tmp.name
+        file_size_limit = writer.FILE_SIZE_LIMIT
+        writer.FILE_SIZE_LIMIT = 128
+        try:
+            dist.save_state_dict(state_dict, ckpt_dir)
+        finally:
+            writer.FILE_SIZE_LIMIT = file_size_limit
+        _, local_load_files = get_checkpoint_files(ckpt_dir, use_cache=False)
+        self.assertEqual(
+            sorted(local_load_files), ["0_0.1.distcp", "0_0.distcp"]
+        )
+
+        state_dict_to_load = {
+            key: paddle.zeros_like(value) for key, value in state_dict.items()
+        }
+        dist.load_state_dict(state_dict_to_load, ckpt_dir)
+        for key, value in state_dict.items():
+            np.testing.assert_equal(
+                state_dict_to_load[key].numpy(), value.numpy()
+            )
+        ckpt_dir_tmp.cleanup()
+
+    def test_incremental_save(self):
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        base_dir = os.path.join(ckpt_dir_tmp.name, "step_1")
+        ckpt_dir = os.path.join(ckpt_dir_tmp.name, "step_2")
+        state_dict = {
+            "w1": paddle.arange(32, dtype="float32").reshape([4, 8]),
+            "w2": paddle.to_tensor(3, dtype="int64"),
+        }
+        dist.save_state_dict(state_dict, base_dir, incremental=True)
+        state_dict["w2"] = paddle.to_tensor(4, dtype="int64")
+        dist.save_state_dict(
+            state_dict, ckpt_dir, incremental=True, base_path=base_dir
+        )
+
+        metadata = paddle.load(os.path.join(ckpt_dir, "0.metadata"))
+        self.assertEqual(
+            metadata.storage_metadata[LocalTensorIndex("w1", (0, 0))],
+            os.path.join("..", "step_1", "0_0.distcp"),
+        )
+        self.assertEqual(
+            metadata.storage_metadata[LocalTensorIndex("w2", ())],
+            "0_0.distcp",
+        )
+        self.assertEqual(len(metadata.storage_hashes), 2)
+        # only the changed tensor is written
+        self.assertEqual(
+            list(load_storage_file(ckpt_dir, "0_0.distcp", {}).keys()),
+            ["w2"],
+        )
+
+        state_dict_to_load = {
+            "w1": paddle.zeros([4, 8], dtype="float32"),
+            "w2": paddle.to_tensor(0, dtype="int64"),
+        }
+        dist.load_state_dict(state_dict_to_load, ckpt_dir)
+        for key, value in state_dict.items():
+            np.testing.assert_equal(
+                state_dict_to_load[key].numpy(), value.numpy()
+            )
+
+        with self.assertRaises(AssertionError):
+            dist.save_state_dict(state_dict, ckpt_dir, base_path=base_dir)
+        ckpt_dir_tmp.cleanup()
+
 
 if __name__ == "__main__":
     unittest.main()
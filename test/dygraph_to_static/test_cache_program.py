@@ -20,6 +20,7 @@ from dygraph_to_static_utils import (
     Dy2StTestBase,
     enable_to_static_guard,
     test_ast_only,
+    test_legacy_and_pir,
     test_legacy_and_pt_and_pir,
 )
 from test_fetch_feed import Linear, Pool2D
@@ -179,5 +180,56 @@ class TestToOutputWithCache(Dy2StTestBase):
         self.assertEqual(ret.numpy(), 5050)
 
 
+def scale_func(x, scale):
+    return x * scale
+
+
+class TestProgramCacheCapacity(Dy2StTestBase):
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_lru_eviction(self):
+        static_func = paddle.jit.to_static(scale_func)
+        program_cache = static_func.program_cache
+        program_cache.max_entries = 2
+        x = paddle.ones([2, 3])
+        for scale in [1, 2, 1, 3, 1]:
+            out = static_func(x, scale)
+            np.testing.assert_allclose(out.numpy(), x.numpy() * scale)
+
+        report = program_cache.report()
+        self.assertEqual(report['function'], 'scale_func')
+        self.assertEqual(report['entries'], 2)
+        # scale=1 is kept as the most recently used, scale=2 is evicted
+        self.assertEqual(report['hits'], 2)
+        self.assertEqual(report['misses'], 3)
+        self.assertEqual(report['evictions'], 1)
+        self.assertGreater(report['estimated_bytes'], 0)
+
+        program_cache.max_entries = 0
+        program_cache.max_bytes = 1
+        static_func(x, 4)
+        # the most recently used program is never evicted
+        self.assertEqual(program_cache.report()['entries'], 1)
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_retrace_reasons(self):
+        static_func = paddle.jit.to_static(scale_func)
+        static_func(paddle.ones([2, 3]), 1)
+        static_func(paddle.ones([4, 3]), 1)
+        static_func(paddle.ones([4, 3], dtype='float64'), 2)
+
+        report = static_func.program_cache.report()
+        self.assertEqual(report['retraces'], 2)
+        self.assertEqual(
+            report['retrace_reasons'][0], ['args[0].shape: (2, 3) -> (4, 3)']
+        )
+        self.assertEqual(len(report['retrace_reasons'][1]), 2)
+        self.assertTrue(
+            report['retrace_reasons'][1][0].startswith('args[0].dtype')
+        )
+        self.assertEqual(report['retrace_reasons'][1][1], 'args[1]: 1 -> 2')
+
+
 if __name__ == '__main__':
     unittest.main()
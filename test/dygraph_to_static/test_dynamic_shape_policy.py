@@ -0,0 +1,113 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+from dygraph_to_static_utils import (
+    Dy2StTestBase,
+    test_ast_only,
+    test_legacy_and_pir,
+)
+
+import paddle
+from paddle.jit.dy2static import dynamic_shape
+from paddle.static import InputSpec
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear = paddle.nn.Linear(8, 4)
+
+    def forward(self, x):
+        return paddle.mean(self.linear(x), axis=1)
+
+
+class TestDynamicShapePolicy(Dy2StTestBase):
+    def tearDown(self):
+        dynamic_shape.set_dynamic_shape_threshold(None)
+
+    def run_seq_lens(self, seq_lens):
+        paddle.seed(2024)
+        net = Net()
+        static_net = paddle.jit.to_static(net)
+        for seq_len in seq_lens:
+            x = paddle.randn([2, seq_len, 8])
+            np.testing.assert_allclose(
+                static_net(x).numpy(), net(x).numpy(), rtol=1e-5, atol=1e-6
+            )
+        return static_net
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_generalize(self):
+        dynamic_shape.set_dynamic_shape_threshold(2)
+        static_net = self.run_seq_lens([3, 5, 7, 9, 3])
+        # a program for the first size and a generalized one for the others
+        self.assertEqual(static_net.forward.get_traced_count(), 2)
+        self.assertEqual(
+            static_net.forward._shape_policy.dynamic_dims,
+            [('_jst.0.x.0', 1)],
+        )
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_disabled(self):
+        dynamic_shape.set_dynamic_shape_threshold(0)
+        static_net = self.run_seq_lens([3, 5, 7, 9, 3])
+        self.assertEqual(static_net.forward.get_traced_count(), 4)
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_pad_to_bucket(self):
+        dynamic_shape.set_dynamic_shape_threshold(0)
+        paddle.seed(2024)
+        static_net = paddle.jit.to_static(Net())
+        for seq_len in [3, 5, 7, 9, 17]:
+            x = dynamic_shape.pad_to_bucket(
+                paddle.randn([2, seq_len, 8]), [4, 8, 16], axis=1
+            )
+            static_net(x)
+        self.assertEqual(static_net.forward.get_traced_count(), 4)
+
+
+class TestPadToBucket(unittest.TestCase):
+    def test_pad(self):
+        x = paddle.ones([2, 5])
+        out = dynamic_shape.pad_to_bucket(x, [4, 8], axis=-1, value=-1)
+        self.assertEqual(out.shape, [2, 8])
+        np.testing.assert_array_equal(out[:, :5].numpy(), x.numpy())
+        np.testing.assert_array_equal(out[:, 5:].numpy(), -np.ones([2, 3]))
+        # the size on a boundary or larger than all boundaries is kept
+        self.assertIs(dynamic_shape.pad_to_bucket(x, [5, 8], axis=1), x)
+        self.assertIs(dynamic_shape.pad_to_bucket(x, [4], axis=1), x)
+
+    def test_policy(self):
+        dynamic_shape.set_dynamic_shape_threshold(3)
+        try:
+            policy = dynamic_shape.DynamicShapePolicy()
+            shapes = []
+            for seq_len in [3, 4, 3, 5, 6]:
+                (spec,), _ = policy.generalize(
+                    [InputSpec([2, seq_len], 'float32', 'x')], {}
+                )
+                shapes.append(spec.shape)
+        finally:
+            dynamic_shape.set_dynamic_shape_threshold(None)
+        self.assertEqual(shapes, [(2, 3), (2, 4), (2, 3), (2, -1), (2, -1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
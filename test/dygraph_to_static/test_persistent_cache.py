@@ -0,0 +1,204 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from dygraph_to_static_utils import (
+    Dy2StTestBase,
+    test_ast_only,
+    test_legacy_and_pir,
+)
+
+import paddle
+from paddle.jit.dy2static import persistent_cache
+from paddle.jit.dy2static.program_translator import ConcreteProgram
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear = paddle.nn.Linear(10, 3)
+
+    def forward(self, x, scale=2):
+        out = self.linear(x) * scale
+        return out, paddle.mean(out)
+
+
+class DropoutNet(paddle.nn.Layer):
+    def __init__(self, p):
+        super().__init__()
+        self.linear = paddle.nn.Linear(10, 3)
+        self.dropout = paddle.nn.Dropout(p, mode='downscale_in_infer')
+
+    def forward(self, x):
+        return self.dropout(self.linear(x))
+
+
+def make_scale_fn(scale):
+    def scale_fn(x):
+        return x * scale
+
+    return scale_fn
+
+
+class TestPersistentCache(Dy2StTestBase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        persistent_cache.set_cache_dir(self.temp_dir.name)
+        self.x = paddle.to_tensor(np.random.random([4, 10]).astype('float32'))
+
+    def tearDown(self):
+        persistent_cache.set_cache_dir(None)
+        self.temp_dir.cleanup()
+
+    def build_func(self):
+        if paddle.framework.use_pir_api():
+            return 'pir_from_func_spec'
+        return 'from_func_spec'
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_warm_start(self):
+        net = paddle.jit.to_static(Net())
+        out, loss = net(self.x)
+        entries = os.listdir(self.temp_dir.name)
+        self.assertEqual(len(entries), 1)
+
+        # a new cache key is traced and saved
+        net(self.x, scale=3)
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 2)
+
+        # programs are loaded from the cache without tracing
+        net.forward.program_cache.clear()
+        with mock.patch.object(
+            ConcreteProgram,
+            self.build_func(),
+            side_effect=AssertionError("traced"),
+        ):
+            cached_out, cached_loss = net(self.x)
+        np.testing.assert_allclose(cached_out.numpy(), out.numpy())
+        np.testing.assert_allclose(cached_loss.numpy(), loss.numpy())
+
+        cached_loss.backward()
+        self.assertIsNotNone(net.linear.weight.grad)
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_invalidation(self):
+        net = paddle.jit.to_static(Net())
+        net(self.x)
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 1)
+
+        # the eval mode is another entry
+        net.eval()
+        net(self.x)
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 2)
+
+        # a broken entry is ignored and the program is traced again
+        for entry in os.listdir(self.temp_dir.name):
+            with open(
+                os.path.join(
+                    self.temp_dir.name, entry, persistent_cache._META_FILE
+                ),
+                'wb',
+            ) as f:
+                f.write(b'broken')
+        net.forward.program_cache.clear()
+        out, _ = net(self.x)
+        self.assertEqual(out.shape, [4, 3])
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_attributes_and_closures(self):
+        # layers differ only in the attributes of sublayers, parameters
+        # are created with the same names
+        for p in [0.1, 0.5]:
+            paddle.seed(2024)
+            with paddle.utils.unique_name.guard():
+                net = DropoutNet(p)
+            net.eval()
+            expected = net(self.x)
+            out = paddle.jit.to_static(net)(self.x)
+            np.testing.assert_allclose(out.numpy(), expected.numpy())
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 2)
+
+        # functions differ only in the values of closures
+        for scale in [2, 3]:
+            out = paddle.jit.to_static(make_scale_fn(scale))(self.x)
+            np.testing.assert_allclose(out.numpy(), self.x.numpy() * scale)
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 4)
+
+    def write_module(self, root, name, source):
+        with open(os.path.join(root, f'{name}.py'), 'w') as f:
+            f.write(source)
+        self.addCleanup(sys.modules.pop, name, None)
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_helper_modules(self):
+        # the function calls a helper in another module, which calls a
+        # helper in a third module
+        module_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(module_dir.cleanup)
+        sys.path.insert(0, module_dir.name)
+        self.addCleanup(sys.path.remove, module_dir.name)
+        self.write_module(
+            module_dir.name, 'cache_leaf', 'def leaf(x):\n    return x + 1\n'
+        )
+        self.write_module(
+            module_dir.name,
+            'cache_helper',
+            'import cache_leaf\n\n\n'
+            'def helper(x):\n    return cache_leaf.leaf(x) * 2\n',
+        )
+        self.write_module(
+            module_dir.name,
+            'cache_main',
+            'import cache_helper\n\n\n'
+            'def forward(x):\n    return cache_helper.helper(x)\n',
+        )
+        cache_leaf = importlib.import_module('cache_leaf')
+        cache_main = importlib.import_module('cache_main')
+
+        out = paddle.jit.to_static(cache_main.forward)(self.x)
+        np.testing.assert_allclose(out.numpy(), (self.x.numpy() + 1) * 2)
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 1)
+
+        # the change of the third module is a new entry
+        self.write_module(
+            module_dir.name, 'cache_leaf', 'def leaf(x):\n    return x + 10\n'
+        )
+        importlib.invalidate_caches()
+        importlib.reload(cache_leaf)
+        out = paddle.jit.to_static(cache_main.forward)(self.x)
+        np.testing.assert_allclose(out.numpy(), (self.x.numpy() + 10) * 2)
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 2)
+
+    @test_legacy_and_pir
+    @test_ast_only
+    def test_disabled(self):
+        persistent_cache.set_cache_dir(None)
+        net = paddle.jit.to_static(Net())
+        net(self.x)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
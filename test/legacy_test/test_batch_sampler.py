@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+import math
 import random
 import unittest
 
@@ -20,6 +22,7 @@ import numpy as np
 from paddle.io import (
     BatchSampler,
     Dataset,
+    DistributedBatchSampler,
     RandomSampler,
     Sampler,
     SequenceSampler,
@@ -360,5 +363,140 @@ class TestWeightedRandomSampler(unittest.TestCase):
             self.assertTrue(True)
 
 
+def reference_distributed_batches(
+    num_samples, batch_size, nranks, rank, shuffle, drop_last, epoch
+):
+    # list based reference of DistributedBatchSampler epoch order
+    local_num_samples = int(math.ceil(num_samples / nranks))
+    total_size = local_num_samples * nranks
+    indices = list(range(num_samples))
+    indices += (indices * math.ceil(total_size / num_samples))[
+        : total_size - num_samples
+    ]
+    if shuffle:
+        np.random.RandomState(epoch).shuffle(indices)
+
+    last_batch_size = total_size % (batch_size * nranks)
+    last_local_batch_size = last_batch_size // nranks
+    local_indices = []
+    for i in range(
+        rank * batch_size, total_size - last_batch_size, batch_size * nranks
+    ):
+        local_indices.extend(indices[i : i + batch_size])
+    tail = indices[total_size - last_batch_size :]
+    local_indices.extend(
+        tail[rank * last_local_batch_size : (rank + 1) * last_local_batch_size]
+    )
+
+    batches = [
+        local_indices[i : i + batch_size]
+        for i in range(0, len(local_indices), batch_size)
+    ]
+    if drop_last and len(batches) > 0 and len(batches[-1]) < batch_size:
+        batches = batches[:-1]
+    return batches
+
+
+class TestDistributedBatchSampler(unittest.TestCase):
+    def test_order(self):
+        for (
+            num_samples,
+            batch_size,
+            nranks,
+            shuffle,
+            drop_last,
+        ) in itertools.product(
+            [1, 7, 33, 100], [1, 3, 8], [1, 3, 4], [False, True], [False, True]
+        ):
+            for rank in range(nranks):
+                sampler = DistributedBatchSampler(
+                    list(range(num_samples)),
+                    batch_size=batch_size,
+                    num_replicas=nranks,
+                    rank=rank,
+                    shuffle=shuffle,
+                    drop_last=drop_last,
+                )
+                for epoch in range(2):
+                    batches = list(sampler)
+                    self.assertEqual(len(batches), len(sampler))
+                    self.assertEqual(
+                        batches,
+                        reference_distributed_batches(
+                            num_samples,
+                            batch_size,
+                            nranks,
+                            rank,
+                            shuffle,
+                            drop_last,
+                            epoch if shuffle else 0,
+                        ),
+                    )
+
+
+class TestSamplerStateDict(unittest.TestCase):
+    def check_resume(self, create_sampler):
+        for num_consumed in [1, 3, 12, 13]:
+            np.random.seed(2024)
+            sampler = create_sampler()
+            expected = list(sampler)
+            next_epoch = list(sampler)
+
+            np.random.seed(2024)
+            sampler = create_sampler()
+            sampler_iter = iter(sampler)
+            consumed = [
+                next(sampler_iter)
+                for _ in range(min(num_consumed, len(expected)))
+            ]
+            state = sampler.state_dict()
+
+            np.random.seed(0)
+            new_sampler = create_sampler()
+            new_sampler.load_state_dict(state)
+            self.assertEqual(consumed + list(new_sampler), expected)
+            # resuming only affects one epoch
+            self.assertEqual(list(new_sampler), next_epoch)
+
+    def test_sequence_sampler(self):
+        self.check_resume(lambda: SequenceSampler(list(range(13))))
+
+    def test_random_sampler(self):
+        self.check_resume(lambda: RandomSampler(list(range(13))))
+        self.check_resume(
+            lambda: RandomSampler(
+                list(range(13)), replacement=True, num_samples=20
+            )
+        )
+
+    def test_batch_sampler(self):
+        for shuffle, drop_last in itertools.product(
+            [False, True], [False, True]
+        ):
+            self.check_resume(
+                lambda: BatchSampler(
+                    list(range(100)),
+                    shuffle=shuffle,
+                    batch_size=8,
+                    drop_last=drop_last,
+                )
+            )
+
+    def test_distributed_batch_sampler(self):
+        for shuffle, drop_last in itertools.product(
+            [False, True], [False, True]
+        ):
+            self.check_resume(
+                lambda: DistributedBatchSampler(
+                    list(range(100)),
+                    batch_size=4,
+                    num_replicas=3,
+                    rank=1,
+                    shuffle=shuffle,
+                    drop_last=drop_last,
+                )
+            )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,153 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.vision import transforms
+
+
+class RandomImageDataset(Dataset):
+    def __init__(self, sample_num=16):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.randint(0, 256, [3, 16, 12]).astype('uint8')
+        label = np.array([idx]).astype('int64')
+        return image, label
+
+    def __len__(self):
+        return self.sample_num
+
+
+class TestBatchTransforms(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(2024)
+        self.images = np.random.randint(0, 256, [4, 3, 16, 12]).astype('uint8')
+
+    def test_numpy_and_tensor(self):
+        trans = transforms.BatchNormalize(mean=127.5, std=127.5)
+        expected = (self.images.astype('float32') - 127.5) / 127.5
+        out = trans(self.images)
+        self.assertIsInstance(out, np.ndarray)
+        np.testing.assert_allclose(out, expected, rtol=1e-6)
+
+        out = trans(paddle.to_tensor(self.images))
+        self.assertIsInstance(out, paddle.Tensor)
+        np.testing.assert_allclose(out.numpy(), expected, rtol=1e-6)
+
+    def test_hwc(self):
+        images = self.images.transpose([0, 2, 3, 1])
+        out = transforms.BatchCenterCrop([8, 6], data_format='HWC')(images)
+        np.testing.assert_array_equal(out, images[:, 4:12, 3:9, :])
+
+    def test_resize(self):
+        out = transforms.BatchResize(6)(self.images.astype('float32'))
+        self.assertEqual(out.shape, (4, 3, 8, 6))
+        out = transforms.BatchResize([10, 10], 'nearest')(self.images)
+        self.assertEqual(out.shape, (4, 3, 10, 10))
+        self.assertEqual(out.dtype, np.uint8)
+
+    def test_random_crop(self):
+        trans = transforms.BatchRandomCrop([8, 6])
+        np.random.seed(0)
+        out = trans(self.images)
+        np.random.seed(0)
+        top, left = trans._get_param(4, 16, 12)
+        for i in range(4):
+            np.testing.assert_array_equal(
+                out[i],
+                self.images[i, :, top[i] : top[i] + 8, left[i] : left[i] + 6],
+            )
+
+    def test_random_resized_crop(self):
+        images = self.images.astype('float32')
+        trans = transforms.BatchRandomResizedCrop([8, 6], scale=(1.0, 1.0))
+        out = trans(images)
+        self.assertEqual(out.shape, (4, 3, 8, 6))
+
+        # crop of the whole image resized to the same size is identity
+        trans = transforms.BatchRandomResizedCrop(
+            [16, 12], scale=(1.0, 1.0), ratio=(0.75, 0.75)
+        )
+        np.testing.assert_allclose(trans(images), images, atol=1e-3)
+
+    def test_flip(self):
+        out = transforms.BatchRandomHorizontalFlip(1.0)(self.images)
+        np.testing.assert_array_equal(out, self.images[..., ::-1])
+        out = transforms.BatchRandomVerticalFlip(1.0)(self.images)
+        np.testing.assert_array_equal(out, self.images[:, :, ::-1, :])
+        out = transforms.BatchRandomHorizontalFlip(0.0)(self.images)
+        np.testing.assert_array_equal(out, self.images)
+
+        out = transforms.BatchRandomHorizontalFlip(0.5)(self.images)
+        for i in range(4):
+            self.assertTrue(
+                np.array_equal(out[i], self.images[i])
+                or np.array_equal(out[i], self.images[i, :, :, ::-1])
+            )
+
+    def test_color_jitter(self):
+        trans = transforms.BatchColorJitter(0.4, 0.4, 0.4, 0.1)
+        out = trans(self.images)
+        self.assertEqual(out.shape, self.images.shape)
+        self.assertEqual(out.dtype, np.uint8)
+
+        out = trans(self.images.astype('float32') / 255.0)
+        self.assertEqual(out.dtype, np.float32)
+        self.assertTrue(np.all(out >= 0) and np.all(out <= 1))
+
+        # brightness factor of each sample is applied
+        trans = transforms.BatchColorJitter(brightness=0.5)
+        images = self.images.astype('float32') / 255.0
+        np.random.seed(3)
+        factor = np.random.uniform(*trans.brightness, size=4)
+        np.random.seed(3)
+        out = trans(images)
+        expected = np.clip(images * factor.reshape([-1, 1, 1, 1]), 0, 1)
+        np.testing.assert_allclose(out, expected, rtol=1e-5, atol=1e-6)
+
+        # hue jitter of gray images is identity
+        gray = np.repeat(images[:, :1], 3, axis=1)
+        out = transforms.BatchColorJitter(hue=0.5)(gray)
+        np.testing.assert_allclose(out, gray, atol=1e-5)
+
+    def test_compose_dataloader(self):
+        trans = transforms.BatchCompose(
+            [
+                transforms.BatchRandomCrop(8),
+                transforms.BatchRandomHorizontalFlip(),
+                transforms.BatchNormalize(
+                    mean=[127.5, 127.5, 127.5], std=[127.5, 127.5, 127.5]
+                ),
+            ]
+        )
+        loader = DataLoader(
+            RandomImageDataset(), batch_size=4, collate_fn=trans, num_workers=0
+        )
+        num_batches = 0
+        for image, label in loader:
+            self.assertEqual(image.shape, [4, 3, 8, 8])
+            self.assertEqual(image.dtype, paddle.float32)
+            self.assertEqual(label.shape, [4, 1])
+            num_batches += 1
+        self.assertEqual(num_batches, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
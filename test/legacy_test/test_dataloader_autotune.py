@@ -24,6 +24,7 @@ import numpy as np
 import paddle
 from paddle import nn
 from paddle.io import DataLoader, Dataset
+from paddle.io.dataloader.autotune import _AdaptiveAutoTuner
 
 
 class RandomDataset(Dataset):
@@ -98,6 +99,62 @@ class TestAutoTune(unittest.TestCase):
         )
 
 
+class TestAdaptiveAutoTune(unittest.TestCase):
+    def tearDown(self):
+        paddle.io.reader.set_adaptive_autotune_config(False)
+
+    def test_tuner_decisions(self):
+        tuner = _AdaptiveAutoTuner(
+            num_workers=1,
+            max_num_workers=2,
+            prefetch_factor=2,
+            max_prefetch_factor=3,
+            interval=1,
+        )
+        # consumer always waits: grow workers first, then prefetch factor
+        self.assertTrue(tuner.step(10.0, 0, 4))
+        self.assertEqual(tuner.num_workers, 2)
+        self.assertTrue(tuner.step(10.0, 0, 4))
+        self.assertEqual(tuner.prefetch_factor, 3)
+        self.assertFalse(tuner.step(10.0, 0, 4))
+
+        # queue full and no waiting in 2 windows: shrink prefetch first
+        self.assertFalse(tuner.step(0.0, 4, 4))
+        self.assertTrue(tuner.step(0.0, 4, 4))
+        self.assertEqual(tuner.prefetch_factor, 2)
+        self.assertFalse(tuner.step(0.0, 4, 4))
+        self.assertTrue(tuner.step(0.0, 4, 4))
+        self.assertEqual(tuner.num_workers, 1)
+        self.assertEqual(len(tuner.metrics), 7)
+
+    def test_dataloader_adaptive_autotune(self):
+        paddle.incubate.autotune.set_config(
+            config={
+                "dataloader": {
+                    "enable": False,
+                    "adaptive": True,
+                    "max_num_workers": 2,
+                }
+            }
+        )
+        paddle.io.reader.ADAPTIVE_TUNING_INTERVAL = 2
+        dataset = RandomDataset(20)
+        loader = DataLoader(dataset, batch_size=1, num_workers=1)
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            self.assertEqual(loader.autotune_metrics(), [])
+            return
+        for _ in range(2):
+            num_samples = 0
+            for image, label in loader:
+                num_samples += image.shape[0]
+            self.assertEqual(num_samples, 20)
+        metrics = loader.autotune_metrics()
+        self.assertEqual(len(metrics), 20)
+        for record in metrics:
+            self.assertLessEqual(record['num_workers'], 2)
+            self.assertLessEqual(record['prefetch_factor'], 4)
+
+
 class TestAutoTuneAPI(unittest.TestCase):
     def test_set_config_warnings(self):
         with warnings.catch_warnings(record=True) as w:
@@ -0,0 +1,91 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset, IterableDataset
+
+
+class PidDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        return np.array([idx, os.getpid()]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+class RangeIterableDataset(IterableDataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __iter__(self):
+        worker_info = paddle.io.get_worker_info()
+        for i in range(
+            worker_info.id, self.sample_num, worker_info.num_workers
+        ):
+            yield np.array([i]).astype('int64')
+
+
+class TestPersistentWorkers(unittest.TestCase):
+    def test_map_dataset(self):
+        loader = DataLoader(
+            PidDataset(40),
+            places=paddle.CPUPlace(),
+            batch_size=4,
+            num_workers=2,
+            prefetch_factor=4,
+            persistent_workers=True,
+        )
+        pids = set()
+        for _ in range(3):
+            indices = []
+            for data in loader:
+                indices.extend(data.numpy()[:, 0].tolist())
+                pids.update(data.numpy()[:, 1].tolist())
+            self.assertEqual(indices, list(range(40)))
+        # workers are kept across epochs
+        self.assertEqual(len(pids), 2)
+
+        # break an epoch with prefetched batches, next epoch restarts
+        for i, data in enumerate(loader):
+            if i == 1:
+                break
+        indices = []
+        for data in loader:
+            indices.extend(data.numpy()[:, 0].tolist())
+        self.assertEqual(indices, list(range(40)))
+
+    def test_iterable_dataset_drop_last(self):
+        loader = DataLoader(
+            RangeIterableDataset(22),
+            places=paddle.CPUPlace(),
+            batch_size=4,
+            num_workers=2,
+            drop_last=False,
+            persistent_workers=True,
+        )
+        for _ in range(3):
+            num_samples = sum(data.shape[0] for data in loader)
+            self.assertEqual(num_samples, 22)
+
+
+if __name__ == '__main__':
+    unittest.main()
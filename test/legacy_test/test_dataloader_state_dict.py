@@ -0,0 +1,100 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset, IterableDataset
+
+
+class IndexDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        return np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+class IndexIterableDataset(IterableDataset):
+    def __iter__(self):
+        for i in range(10):
+            yield np.array([i]).astype('int64')
+
+
+class TestDataLoaderStateDict(unittest.TestCase):
+    def create_loader(self, num_workers, persistent_workers=False):
+        return DataLoader(
+            IndexDataset(50),
+            places=paddle.CPUPlace(),
+            batch_size=4,
+            shuffle=True,
+            num_workers=num_workers,
+            persistent_workers=persistent_workers,
+        )
+
+    def read_indices(self, loader_iter, num_batches=None):
+        indices = []
+        for i, data in enumerate(loader_iter):
+            if num_batches is not None and i == num_batches:
+                break
+            indices.append(data.numpy().flatten().tolist())
+        return indices
+
+    def check_resume(self, num_workers, persistent_workers=False):
+        np.random.seed(2024)
+        loader = self.create_loader(num_workers, persistent_workers)
+        expected = self.read_indices(loader)
+
+        np.random.seed(2024)
+        loader = self.create_loader(num_workers, persistent_workers)
+        loader_iter = iter(loader)
+        consumed = [next(loader_iter).numpy().flatten().tolist()]
+        consumed.append(next(loader_iter).numpy().flatten().tolist())
+        consumed.append(next(loader_iter).numpy().flatten().tolist())
+        # state is kept after the iterator is released
+        del loader_iter
+        state = loader.state_dict()
+        self.assertEqual(state['num_batches_yielded'], 3)
+
+        np.random.seed(0)
+        new_loader = self.create_loader(num_workers, persistent_workers)
+        new_loader.load_state_dict(state)
+        self.assertEqual(consumed + self.read_indices(new_loader), expected)
+        # next epoch of resumed loader starts from the beginning
+        self.assertEqual(len(self.read_indices(new_loader)), len(expected))
+
+    def test_single_process(self):
+        self.check_resume(0)
+
+    def test_multi_process(self):
+        self.check_resume(2)
+
+    def test_persistent_workers(self):
+        self.check_resume(2, persistent_workers=True)
+
+    def test_iterable_dataset(self):
+        loader = DataLoader(IndexIterableDataset(), batch_size=2)
+        with self.assertRaises(ValueError):
+            loader.state_dict()
+        with self.assertRaises(ValueError):
+            loader.load_state_dict({'num_batches_yielded': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset, IterableDataset, get_worker_info
+
+IMAGE_SIZE = 32
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        # sleep randomly to disorder the batches fetched by threads
+        time.sleep(np.random.random() * 0.005)
+        image = np.random.random([IMAGE_SIZE]).astype('float32')
+        label = np.random.randint(0, 9, (1,)).astype('int64')
+        return image, label
+
+    def __len__(self):
+        return self.sample_num
+
+
+class SplitIterableDataset(IterableDataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __iter__(self):
+        worker_info = get_worker_info()
+        for i in range(
+            worker_info.id, self.sample_num, worker_info.num_workers
+        ):
+            yield np.array([i]).astype('int64')
+
+
+class ErrorDataset(Dataset):
+    def __getitem__(self, idx):
+        if idx == 10:
+            raise ValueError("error in dataset")
+        return np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return 20
+
+
+class TestDataLoaderThreadWorker(unittest.TestCase):
+    def test_map_dataset(self):
+        dataset = RandomDataset(50)
+        dataloader = DataLoader(
+            dataset,
+            places=paddle.CPUPlace(),
+            batch_size=8,
+            num_workers=3,
+            worker_mode='thread',
+        )
+        for _ in range(2):
+            idx = 0
+            for image, label in dataloader:
+                for i in range(image.shape[0]):
+                    image_t, label_t = dataset[idx]
+                    np.testing.assert_allclose(image[i].numpy(), image_t)
+                    np.testing.assert_allclose(label[i].numpy(), label_t)
+                    idx += 1
+            self.assertEqual(idx, 50)
+
+    def test_iterable_dataset(self):
+        thread_ids = set()
+
+        def worker_init_fn(worker_id):
+            thread_ids.add(threading.get_ident())
+
+        dataloader = DataLoader(
+            SplitIterableDataset(50),
+            places=paddle.CPUPlace(),
+            batch_size=4,
+            num_workers=3,
+            worker_init_fn=worker_init_fn,
+            worker_mode='thread',
+        )
+        data = [batch.numpy().flatten().tolist() for batch in dataloader]
+        self.assertEqual(
+            sorted(i for batch in data for i in batch), list(range(50))
+        )
+        self.assertEqual(len(thread_ids), 3)
+        self.assertNotIn(threading.get_ident(), thread_ids)
+        # batches are fetched from workers in turn
+        self.assertEqual(data[0], [0, 3, 6, 9])
+        self.assertEqual(data[1], [1, 4, 7, 10])
+
+    def test_error(self):
+        dataloader = DataLoader(
+            ErrorDataset(),
+            places=paddle.CPUPlace(),
+            batch_size=4,
+            num_workers=2,
+            worker_mode='thread',
+        )
+        with self.assertRaises(ValueError):
+            for _ in dataloader:
+                pass
+
+    def test_invalid_worker_mode(self):
+        with self.assertRaises(AssertionError):
+            DataLoader(RandomDataset(10), worker_mode='fork')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle import Model, nn
+from paddle.io import Dataset
+from paddle.static import InputSpec
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num=100):
+        np.random.seed(2024)
+        self.x = np.random.random([sample_num, 8]).astype('float32')
+        self.y = np.random.randint(0, 4, [sample_num, 1]).astype('int64')
+
+    def __getitem__(self, idx):
+        return self.x[idx], self.y[idx]
+
+    def __len__(self):
+        return len(self.x)
+
+
+class LogsRecorder(paddle.callbacks.Callback):
+    def __init__(self):
+        super().__init__()
+        self.batch_logs = []
+        self.epoch_logs = []
+
+    def on_train_batch_end(self, step, logs=None):
+        self.batch_logs.append(dict(logs))
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_logs.append(dict(logs))
+
+
+class TestFitSyncInterval(unittest.TestCase):
+    def run_fit(self, sync_interval):
+        paddle.disable_static()
+        paddle.seed(2024)
+        net = nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 4))
+        model = Model(
+            net,
+            InputSpec([None, 8], 'float32', 'x'),
+            InputSpec([None, 1], 'int64', 'y'),
+        )
+        optim = paddle.optimizer.SGD(
+            learning_rate=0.1, parameters=model.parameters()
+        )
+        model.prepare(
+            optim,
+            nn.CrossEntropyLoss(),
+            paddle.metric.Accuracy(topk=(1, 2)),
+        )
+        recorder = LogsRecorder()
+        model.fit(
+            RandomDataset(),
+            batch_size=8,
+            epochs=2,
+            shuffle=False,
+            verbose=0,
+            callbacks=[recorder],
+            sync_interval=sync_interval,
+        )
+        return recorder
+
+    def test_same_results(self):
+        expected = self.run_fit(1)
+        recorder = self.run_fit(5)
+        self.assertEqual(len(recorder.epoch_logs), 2)
+        for logs, expected_logs in zip(
+            recorder.epoch_logs, expected.epoch_logs
+        ):
+            np.testing.assert_allclose(
+                logs['loss'], expected_logs['loss'], rtol=1e-5
+            )
+            self.assertAlmostEqual(logs['acc_top1'], expected_logs['acc_top1'])
+            self.assertAlmostEqual(logs['acc_top2'], expected_logs['acc_top2'])
+
+    def test_sync_steps(self):
+        recorder = self.run_fit(5)
+        # 13 steps in each epoch, logs are updated in step 5 and 10
+        batch_logs = recorder.batch_logs[:13]
+        for step in range(5, 9):
+            self.assertEqual(batch_logs[step]['loss'], batch_logs[4]['loss'])
+            self.assertEqual(
+                batch_logs[step]['acc_top1'], batch_logs[4]['acc_top1']
+            )
+        self.assertNotEqual(batch_logs[9]['loss'], batch_logs[4]['loss'])
+
+    def test_invalid_sync_interval(self):
+        with self.assertRaises(AssertionError):
+            self.run_fit(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -296,5 +296,128 @@ class TestAuc(unittest.TestCase):
         self.assertEqual(m.accumulate(), 0.0)
 
 
+class TestVectorizedMetrics(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(2024)
+        self.preds = np.random.random([1000, 1]).astype('float32')
+        self.preds[::10] = 0.5
+        self.labels = np.random.randint(0, 2, [1000, 1]).astype('int64')
+
+    def check_metric(self, metric_cls):
+        expected = metric_cls()
+        for pred, label in zip(self.preds, self.labels):
+            expected.update(pred.reshape([1, 1]), label.reshape([1, 1]))
+
+        m = metric_cls()
+        m.update(paddle.to_tensor(self.preds), paddle.to_tensor(self.labels))
+        self.assertIsNotNone(m._device_stat)
+        self.assertAlmostEqual(m.accumulate(), expected.accumulate())
+        self.assertIsNone(m._device_stat)
+
+        m = metric_cls()
+        m.update_many(
+            np.split(self.preds, 10),
+            paddle.split(paddle.to_tensor(self.labels), 10),
+        )
+        self.assertEqual(m.tp, expected.tp)
+        self.assertAlmostEqual(m.accumulate(), expected.accumulate())
+
+    def test_precision(self):
+        self.check_metric(paddle.metric.Precision)
+
+    def test_recall(self):
+        self.check_metric(paddle.metric.Recall)
+
+    def test_rounding_boundary(self):
+        preds = np.array([[0.5], [1.5], [0.49], [1.0], [2.5]], 'float32')
+        labels = np.ones([5, 1], 'int64')
+        # Precision rounds by floor(x + 0.5), Recall rounds by rint
+        for metric_cls, tp in [
+            (paddle.metric.Precision, 2),
+            (paddle.metric.Recall, 1),
+        ]:
+            for to_input in [np.array, paddle.to_tensor]:
+                m = metric_cls()
+                m.update(to_input(preds), to_input(labels))
+                self.assertEqual(m.tp, tp)
+
+    def test_auc(self):
+        preds = np.concatenate([1 - self.preds, self.preds], axis=1)
+        expected = paddle.metric.Auc()
+        for i in range(0, 1000, 100):
+            expected.update(preds[i : i + 100], self.labels[i : i + 100])
+
+        m = paddle.metric.Auc()
+        m.update_many(
+            [paddle.to_tensor(p) for p in np.split(preds, 10)],
+            [paddle.to_tensor(y) for y in np.split(self.labels, 10)],
+        )
+        self.assertIsNotNone(m._device_stat)
+        self.assertAlmostEqual(m.accumulate(), expected.accumulate())
+        np.testing.assert_array_equal(m._stat_pos, expected._stat_pos)
+        np.testing.assert_array_equal(m._stat_neg, expected._stat_neg)
+
+        m.reset()
+        self.assertIsNone(m._device_stat)
+        self.assertEqual(m.accumulate(), 0.0)
+
+
+class TestMergeMetricStates(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(2024)
+        self.preds = np.random.random([100, 2]).astype('float32')
+        self.labels = np.random.randint(0, 2, [100, 1]).astype('int64')
+
+    def check_merge(self, metric_cls, preds, labels):
+        expected = metric_cls()
+        expected.update(preds, labels)
+
+        m1, m2 = metric_cls(), metric_cls()
+        m1.update(preds[:30], labels[:30])
+        m2.update(paddle.to_tensor(preds[30:]), paddle.to_tensor(labels[30:]))
+        m1.merge(m2)
+        self.assertAlmostEqual(m1.accumulate(), expected.accumulate())
+
+        m = metric_cls()
+        m.set_states(expected.get_states())
+        self.assertAlmostEqual(m.accumulate(), expected.accumulate())
+
+    def test_merge(self):
+        self.check_merge(paddle.metric.Precision, self.preds[:, 1], self.labels)
+        self.check_merge(paddle.metric.Recall, self.preds[:, 1], self.labels)
+        self.check_merge(paddle.metric.Auc, self.preds, self.labels)
+
+    def test_accuracy(self):
+        pred = paddle.to_tensor(self.preds)
+        label = paddle.to_tensor(self.labels)
+        expected = paddle.metric.Accuracy(topk=(1, 2))
+        expected.update(expected.compute(pred, label))
+
+        m1 = paddle.metric.Accuracy(topk=(1, 2))
+        m2 = paddle.metric.Accuracy(topk=(1, 2))
+        m1.update(m1.compute(pred[:30], label[:30]))
+        m2.update(m2.compute(pred[30:], label[30:]))
+        m1.merge(m2)
+        np.testing.assert_allclose(m1.accumulate(), expected.accumulate())
+
+    def test_not_mergeable(self):
+        class CustomMetric(paddle.metric.Metric):
+            def reset(self):
+                pass
+
+            def update(self, *args):
+                pass
+
+            def accumulate(self):
+                return 0.0
+
+            def name(self):
+                return 'custom'
+
+        self.assertIsNone(CustomMetric().get_states())
+        with self.assertRaises(NotImplementedError):
+            CustomMetric().merge(CustomMetric())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -505,5 +505,67 @@ class TestConcatDataset(unittest.TestCase):
             ConcatDataset([it1, d1])
 
 
+class BatchedRandomDataset(RandomDataset):
+    def __init__(self, sample_num):
+        super().__init__(sample_num)
+        self.getitems_calls = 0
+
+    def __getitems__(self, indices):
+        self.getitems_calls += 1
+        return [self[idx] for idx in indices]
+
+
+class TestDatasetGetitems(unittest.TestCase):
+    def test_tensor_dataset(self):
+        input_np = np.random.random([16, 3, 4]).astype('float32')
+        label_np = np.random.random([16, 1]).astype('int32')
+        dataset = TensorDataset(
+            [paddle.to_tensor(input_np), paddle.to_tensor(label_np)]
+        )
+        indices = [3, 0, 15, 3]
+        samples = dataset.__getitems__(indices)
+        assert len(samples) == len(indices)
+        for idx, (input, label) in zip(indices, samples):
+            assert input.shape == [3, 4]
+            assert label.shape == [1]
+            np.testing.assert_allclose(input.numpy(), input_np[idx])
+            np.testing.assert_allclose(label.numpy(), label_np[idx])
+
+    def test_subset_and_concat(self):
+        dataset = ConcatDataset([[0, 1, 2, 3, 4], [], [5, 6, 7, 8, 9]])
+        self.assertEqual(
+            dataset.__getitems__([5, 0, 9, -1, 4]), [5, 0, 9, 9, 4]
+        )
+        subset = paddle.io.Subset(dataset, [9, 7, 5, 3, 1])
+        self.assertEqual(subset.__getitems__([0, 4, 2]), [9, 1, 5])
+
+    def test_compose(self):
+        dataset1 = BatchedRandomDataset(10)
+        dataset2 = RandomDataset(10)
+        dataset = ComposeDataset([dataset1, dataset2])
+        indices = [7, 1, 4]
+        for idx, sample in zip(indices, dataset.__getitems__(indices)):
+            for field, field_t in zip(sample, dataset[idx]):
+                np.testing.assert_allclose(field, field_t)
+        assert dataset1.getitems_calls == 1
+
+    def test_dataloader(self):
+        for num_workers in [0, 2]:
+            dataset = BatchedRandomDataset(10)
+            dataloader = DataLoader(
+                dataset, batch_size=4, num_workers=num_workers
+            )
+            idx = 0
+            for image, label in dataloader:
+                for i in range(image.shape[0]):
+                    image_t, label_t = dataset[idx]
+                    np.testing.assert_allclose(image[i].numpy(), image_t)
+                    np.testing.assert_allclose(label[i].numpy(), label_t)
+                    idx += 1
+            assert idx == 10
+            if num_workers == 0:
+                assert dataset.getitems_calls == 3
+
+
 if __name__ == '__main__':
     unittest.main()
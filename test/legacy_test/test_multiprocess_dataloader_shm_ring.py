@@ -0,0 +1,103 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.io.dataloader.shm_ring import _MainShmRing, _WorkerShmRing
+
+IMAGE_SIZE = 32
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([IMAGE_SIZE]).astype('float32')
+        label = np.random.randint(0, 9, (1,)).astype('int64')
+        return image, label
+
+    def __len__(self):
+        return self.sample_num
+
+
+class TestShmRing(unittest.TestCase):
+    def test_put_and_view(self):
+        worker_ring = _WorkerShmRing(worker_id=0, num_slots=2)
+        main_ring = _MainShmRing()
+
+        image = np.random.random([4, IMAGE_SIZE]).astype('float32')
+        label = np.arange(4).reshape([4, 1]).astype('int64')
+        ring_batch = worker_ring.put([image, label])
+        self.assertIsNotNone(ring_batch)
+        self.assertEqual(ring_batch.slot_id, 0)
+        tensors = main_ring.to_tensors(ring_batch)
+        np.testing.assert_allclose(np.array(tensors[0]), image)
+        np.testing.assert_allclose(np.array(tensors[1]), label)
+
+        # smaller batch fits in slot
+        ring_batch = worker_ring.put([image[:3], label[:3]])
+        self.assertEqual(ring_batch.slot_id, 1)
+        tensors = main_ring.to_tensors(ring_batch)
+        self.assertEqual(tensors[0].shape(), [3, IMAGE_SIZE])
+        np.testing.assert_allclose(np.array(tensors[1]), label[:3])
+
+        # all slots in use
+        self.assertIsNone(worker_ring.put([image, label]))
+        worker_ring.release(0)
+        self.assertEqual(worker_ring.put([image, label]).slot_id, 0)
+
+        # larger batch or different dtype falls back
+        worker_ring.release(0)
+        self.assertIsNone(
+            worker_ring.put([np.concatenate([image, image]), label])
+        )
+        self.assertIsNone(worker_ring.put([image, label.astype('int32')]))
+
+
+class TestDataLoaderWithShmRing(unittest.TestCase):
+    def setUp(self):
+        os.environ['FLAGS_dataloader_use_shm_ring'] = '1'
+
+    def tearDown(self):
+        del os.environ['FLAGS_dataloader_use_shm_ring']
+
+    def test_main(self):
+        dataset = RandomDataset(50)
+        dataloader = DataLoader(
+            dataset,
+            places=paddle.CPUPlace(),
+            batch_size=8,
+            num_workers=2,
+            drop_last=False,
+        )
+        for _ in range(2):
+            idx = 0
+            for image, label in dataloader:
+                for i in range(image.shape[0]):
+                    image_t, label_t = dataset[idx]
+                    np.testing.assert_allclose(image[i].numpy(), image_t)
+                    np.testing.assert_allclose(label[i].numpy(), label_t)
+                    idx += 1
+            self.assertEqual(idx, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, PackedRecordDataset, PackedRecordWriter
+
+IMAGE_SIZE = 32
+
+
+class TestPackedRecordDataset(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'data', 'train')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_bytes_records(self):
+        records = [
+            np.random.bytes(np.random.randint(0, 300)) for _ in range(100)
+        ]
+        with PackedRecordWriter(self.path, max_shard_size=1024) as writer:
+            for i, record in enumerate(records):
+                self.assertEqual(writer.write(record), i)
+        self.assertGreater(len(os.listdir(os.path.dirname(self.path))), 2)
+        with self.assertRaises(ValueError):
+            writer.write(records[0])
+
+        dataset = PackedRecordDataset(self.path)
+        self.assertEqual(len(dataset), len(records))
+        for i, record in enumerate(records):
+            self.assertEqual(dataset[i].tobytes(), record)
+        self.assertEqual(dataset[-1].tobytes(), records[-1])
+        batch = dataset.__getitems__([3, 0, 99])
+        self.assertEqual(
+            [r.tobytes() for r in batch], [records[3], records[0], records[99]]
+        )
+        # records are read-only views of mapped shards
+        self.assertFalse(dataset[1].flags.writeable)
+
+    def test_dataloader(self):
+        images = np.random.random([50, IMAGE_SIZE]).astype('float32')
+        with PackedRecordWriter(self.path, max_shard_size=4096) as writer:
+            for image in images:
+                writer.write(image)
+
+        dataset = PackedRecordDataset(
+            self.path, transform=lambda r: r.view('float32').copy()
+        )
+        for num_workers in [0, 2]:
+            loader = DataLoader(
+                dataset,
+                places=paddle.CPUPlace(),
+                batch_size=8,
+                num_workers=num_workers,
+            )
+            data = np.concatenate([batch.numpy() for batch in loader])
+            np.testing.assert_allclose(data, images)
+
+    def test_index_not_found(self):
+        with self.assertRaises(ValueError):
+            PackedRecordDataset(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
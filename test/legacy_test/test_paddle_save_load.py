@@ -14,6 +14,7 @@
 
 import os
 import tempfile
+import threading
 import unittest
 from io import BytesIO
 
@@ -1121,6 +1122,80 @@ class TestAsyncSaveLoad(unittest.TestCase):
         )
         with self.assertRaises(ValueError):
             paddle.async_save(layer_state_dict, static_save_path)
+        paddle.disable_static()
+
+    def test_async_save_snapshot(self):
+        layer = LinearNet()
+        state_dict = layer.state_dict()
+        expected = {k: v.numpy() for k, v in state_dict.items()}
+        path = os.path.join(self.temp_dir.name, "snapshot.pdparams")
+
+        future = paddle.async_save(state_dict, path)
+        # updates after async_save do not change the saved values
+        for value in state_dict.values():
+            value.zero_()
+        self.assertIsNone(future.result())
+        self.assertTrue(future.done())
+
+        load_state_dict = paddle.load(path)
+        for key, value in expected.items():
+            np.testing.assert_array_equal(load_state_dict[key].numpy(), value)
+            self.assertEqual(load_state_dict[key].name, state_dict[key].name)
+        paddle.clear_async_save_task_queue()
+
+    def test_async_save_error(self):
+        x = paddle.rand([2, 3])
+        # the path is a directory, so the save fails
+        future = paddle.async_save(x, self.temp_dir.name + os.sep + ".")
+        # IsADirectoryError on Linux, PermissionError on Windows
+        self.assertIsInstance(future.exception(), OSError)
+        with self.assertRaises(OSError):
+            paddle.clear_async_save_task_queue()
+        # the failed task is removed after reported
+        paddle.clear_async_save_task_queue()
+
+    def test_async_save_backpressure(self):
+        from paddle.framework.async_io import _AsyncSaveEngine
+
+        engine = _AsyncSaveEngine(max_pending=1)
+        event = threading.Event()
+        saved = []
+
+        def slow_save(obj):
+            event.wait()
+            saved.append(obj)
+
+        x = paddle.rand([4])
+        first = engine.submit({'x': x}, slow_save)
+        submitted = threading.Event()
+
+        def submit_second():
+            engine.submit({'x': x}, saved.append).result()
+            submitted.set()
+
+        thread = threading.Thread(target=submit_second)
+        thread.start()
+        # the second save waits for the first one
+        self.assertFalse(submitted.wait(0.2))
+        self.assertFalse(first.done())
+        event.set()
+        thread.join()
+        self.assertTrue(first.done())
+        self.assertEqual(len(saved), 2)
+        np.testing.assert_array_equal(saved[0]['x'].numpy(), x.numpy())
+
+    def test_staging_pool_reuse(self):
+        from paddle.framework.async_io import _StagingPool
+
+        pool = _StagingPool(capacity=64)
+        x = paddle.rand([4])
+        key, buffer = pool.stage(x)
+        pool.reserve(16)
+        pool.release(16, [(key, buffer)])
+        y = paddle.rand([4])
+        _, reused = pool.stage(y)
+        self.assertIs(reused, buffer)
+        np.testing.assert_array_equal(reused.numpy(), y.numpy())
 
 
 class TestSaveLoadProgram(unittest.TestCase):
@@ -0,0 +1,169 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+
+import paddle
+from paddle.framework import stream_io
+
+
+class TestSaveLoadStreamFormat(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'model.pdparams')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_state_dict(self):
+        layer = paddle.nn.Linear(5, 7)
+        state_dict = layer.state_dict()
+        paddle.save(state_dict, self.path, use_stream_format=True)
+        self.assertTrue(stream_io._is_stream_file(self.path))
+
+        load_dict = paddle.load(self.path)
+        self.assertEqual(list(load_dict.keys()), list(state_dict.keys()))
+        for key, value in state_dict.items():
+            self.assertIsInstance(load_dict[key], paddle.Tensor)
+            self.assertEqual(load_dict[key].name, value.name)
+            np.testing.assert_array_equal(load_dict[key].numpy(), value.numpy())
+
+        load_dict = paddle.load(self.path, return_numpy=True)
+        for key, value in state_dict.items():
+            self.assertIsInstance(load_dict[key], np.ndarray)
+            np.testing.assert_array_equal(load_dict[key], value.numpy())
+
+        # the loaded array is writable and the file is not modified
+        load_dict['weight'][:] = 0
+        load_dict = paddle.load(self.path, return_numpy=True)
+        np.testing.assert_array_equal(
+            load_dict['weight'], state_dict['weight'].numpy()
+        )
+
+    def test_same_as_pickle(self):
+        x = paddle.rand([3, 4])
+        obj = {
+            'x': x,
+            'nested': [x, paddle.to_tensor([1, 2], dtype='int64')],
+            'bf16': paddle.ones([2, 2], dtype='bfloat16'),
+            'empty': paddle.zeros([0, 3]),
+            'array': np.arange(6).reshape([2, 3]),
+            'epoch': 10,
+            'name': 'model',
+        }
+        buffer = BytesIO()
+        paddle.save(obj, buffer)
+        buffer.seek(0)
+        expected = paddle.load(buffer, return_numpy=True)
+
+        paddle.save(obj, self.path, use_stream_format=True)
+        result = paddle.load(self.path, return_numpy=True)
+        self.assertEqual(result['epoch'], 10)
+        self.assertEqual(result['name'], 'model')
+        for key in ['x', 'bf16', 'empty', 'array']:
+            self.assertEqual(result[key].dtype, expected[key].dtype)
+            np.testing.assert_array_equal(result[key], expected[key])
+        for value, expected_value in zip(result['nested'], expected['nested']):
+            np.testing.assert_array_equal(value, expected_value)
+
+        result = paddle.load(self.path)
+        self.assertIsInstance(result['x'], paddle.Tensor)
+        self.assertEqual(result['x'].name, x.name)
+
+    def test_tensor(self):
+        x = paddle.rand([10, 3])
+        paddle.save(x, self.path, use_stream_format=True)
+        y = paddle.load(self.path)
+        np.testing.assert_array_equal(x.numpy(), y.numpy())
+
+    def test_alignment(self):
+        obj = {str(i): paddle.rand([i + 1]) for i in range(5)}
+        paddle.save(obj, self.path, use_stream_format=True)
+        with open(self.path, 'rb') as f:
+            buffer = f.read()
+        _, _, _, header_size = stream_io._PROLOGUE.unpack(
+            buffer[: stream_io._PROLOGUE.size]
+        )
+        entries, _ = pickle.loads(
+            buffer[
+                stream_io._PROLOGUE.size : stream_io._PROLOGUE.size
+                + header_size
+            ]
+        )
+        self.assertEqual(len(entries), 5)
+        data_start = stream_io._align(stream_io._PROLOGUE.size + header_size)
+        self.assertEqual(data_start % 64, 0)
+        for _, _, _, _, offset, _ in entries:
+            self.assertEqual(offset % 64, 0)
+
+    def test_partial_load(self):
+        layer = paddle.nn.Linear(5, 7)
+        state_dict = layer.state_dict()
+        paddle.save(state_dict, self.path, use_stream_format=True)
+        load_dict = paddle.load(self.path, keys=['bias'], keep_name_table=True)
+        self.assertEqual(
+            list(load_dict.keys()), ['bias', 'StructuredToParameterName@@']
+        )
+        self.assertEqual(
+            load_dict['StructuredToParameterName@@'],
+            {'bias': state_dict['bias'].name},
+        )
+        np.testing.assert_array_equal(
+            load_dict['bias'].numpy(), state_dict['bias'].numpy()
+        )
+
+        # keys are supported by the pickle format as well
+        paddle.save(state_dict, self.path)
+        load_dict = paddle.load(self.path, keys=['weight'])
+        self.assertEqual(list(load_dict.keys()), ['weight'])
+
+        with self.assertRaises(KeyError):
+            paddle.load(self.path, keys=['not_exist'])
+
+    def test_parallel_write(self):
+        obj = {str(i): paddle.rand([100, i + 1]) for i in range(16)}
+        stream_io._stream_save(obj, self.path, num_workers=1)
+        with open(self.path, 'rb') as f:
+            expected = f.read()
+        stream_io._stream_save(obj, self.path, num_workers=4)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_errors(self):
+        x = paddle.rand([2])
+        with self.assertRaises(ValueError):
+            paddle.save(x, BytesIO(), use_stream_format=True)
+        with self.assertRaises(ValueError):
+            paddle.save(
+                x, self.path, use_stream_format=True, use_binary_format=True
+            )
+        with self.assertRaises(TypeError):
+            paddle.save(x, self.path, use_stream_format=1)
+        with self.assertRaises(ValueError):
+            paddle.save(
+                {'layer': paddle.nn.Linear(2, 2)},
+                self.path,
+                use_stream_format=True,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import json
+import os
+import tempfile
+import time
+import unittest
+import urllib.request
+
+import numpy as np
+
+from paddle.profiler import timer
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentile(self):
+        np.random.seed(2024)
+        values = np.random.uniform(0.01, 0.02, [10000])
+        histogram = timer.Histogram()
+        for value in values:
+            histogram.record(value)
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 10000)
+        self.assertAlmostEqual(summary['avg'], values.mean())
+        self.assertEqual(summary['max'], values.max())
+        # the relative error is bounded by the growth of buckets
+        np.testing.assert_allclose(
+            summary['p50'], np.percentile(values, 50), rtol=0.1
+        )
+        np.testing.assert_allclose(
+            summary['p99'], np.percentile(values, 99), rtol=0.1
+        )
+
+        histogram.reset()
+        self.assertEqual(histogram.summary()['count'], 0)
+        self.assertEqual(histogram.percentile(99), 0)
+
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.benchmark = timer.Benchmark()
+
+    def tearDown(self):
+        self.benchmark.disable_telemetry()
+        self.temp_dir.cleanup()
+
+    def run_steps(self, num_steps):
+        for _ in range(num_steps):
+            self.benchmark.before_reader()
+            self.benchmark.after_reader()
+            with self.benchmark.timing('optimizer_cost'):
+                pass
+            self.benchmark.record_cost('h2d_cost', 0.001)
+            self.benchmark.step()
+
+    def test_exporters(self):
+        csv_path = os.path.join(self.temp_dir.name, 'telemetry.csv')
+        json_path = os.path.join(self.temp_dir.name, 'telemetry.json')
+        http_exporter = timer.HTTPExporter()
+        hook = self.benchmark.enable_telemetry(
+            [
+                timer.CSVExporter(csv_path),
+                timer.JSONExporter(json_path),
+                http_exporter,
+            ],
+            interval=5,
+        )
+        self.run_steps(12)
+        self.assertEqual(hook.summary()['batch_cost']['count'], 2)
+
+        with open(json_path) as f:
+            snapshots = [json.loads(line) for line in f]
+        self.assertEqual([s['step'] for s in snapshots], [5, 10])
+        for snapshot in snapshots:
+            self.assertEqual(snapshot['stragglers'], [])
+            self.assertEqual(
+                sorted(snapshot['metrics'].keys()),
+                ['batch_cost', 'h2d_cost', 'optimizer_cost', 'reader_cost'],
+            )
+            self.assertEqual(snapshot['metrics']['batch_cost']['count'], 5)
+            self.assertAlmostEqual(
+                snapshot['metrics']['h2d_cost']['max'], 0.001
+            )
+
+        with open(csv_path) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[0]['step'], '5')
+
+        with urllib.request.urlopen(
+            f'http://127.0.0.1:{http_exporter.port}/'
+        ) as response:
+            self.assertEqual(json.loads(response.read()), snapshots[-1])
+
+    def test_disabled(self):
+        self.run_steps(3)
+        self.assertNotIn('telemetry_hook', self.benchmark.hooks)
+        hook = self.benchmark.enable_telemetry(interval=100)
+        self.run_steps(3)
+        self.assertEqual(hook.summary()['batch_cost']['count'], 3)
+        self.benchmark.disable_telemetry()
+        self.assertNotIn('telemetry_hook', self.benchmark.hooks)
+
+    def test_pause_in_nested_task(self):
+        class Reader:
+            def __init__(self, dataset):
+                self._dataset = dataset
+
+        def read(reader, cost=0.0):
+            self.benchmark.check_if_need_record(reader)
+            self.benchmark.before_reader()
+            time.sleep(cost)
+            self.benchmark.after_reader()
+
+        hook = self.benchmark.enable_telemetry(interval=100)
+        # the time before the first step is not recorded
+        time.sleep(0.05)
+        self.benchmark.begin()
+        train_reader, eval_reader = Reader('train'), Reader('eval')
+        for _ in range(3):
+            read(train_reader)
+            self.benchmark.step()
+        # evaluation inside training is not recorded
+        for _ in range(3):
+            read(eval_reader, 0.02)
+        read(train_reader)
+        self.benchmark.step()
+
+        summary = hook.summary()
+        self.assertEqual(summary['reader_cost']['count'], 4)
+        self.assertLess(summary['reader_cost']['max'], 0.02)
+        self.assertEqual(summary['batch_cost']['count'], 4)
+        self.assertLess(summary['batch_cost']['max'], 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, ShardedIterableDataset
+
+
+def create_shards(num_shards):
+    rng = np.random.RandomState(0)
+    return [
+        list(range(i * 100, i * 100 + rng.randint(1, 30)))
+        for i in range(num_shards)
+    ]
+
+
+def all_records(shards):
+    return sorted(record for shard in shards for record in shard)
+
+
+def read_shard(shard):
+    for record in shard:
+        yield np.array([record]).astype('int64')
+
+
+class TestShardedIterableDataset(unittest.TestCase):
+    def create_dataset(self, shards, rank, shuffle_buffer_size):
+        dataset = ShardedIterableDataset(
+            shards,
+            read_shard,
+            shuffle=True,
+            shuffle_buffer_size=shuffle_buffer_size,
+            seed=5,
+            num_replicas=2,
+            rank=rank,
+        )
+        dataset.set_epoch(3)
+        return dataset
+
+    def test_read_once_across_ranks(self):
+        shards = create_shards(13)
+        for shuffle_buffer_size in [0, 8]:
+            records = []
+            for rank in range(2):
+                dataset = self.create_dataset(shards, rank, shuffle_buffer_size)
+                records.extend(int(r[0]) for r in dataset)
+            self.assertEqual(sorted(records), all_records(shards))
+
+    def test_resume(self):
+        shards = create_shards(13)
+        for shuffle_buffer_size in [0, 8]:
+            expected = [
+                int(r[0])
+                for r in self.create_dataset(shards, 1, shuffle_buffer_size)
+            ]
+            for num_consumed in [0, 1, 10, len(expected)]:
+                dataset = self.create_dataset(shards, 1, shuffle_buffer_size)
+                records = iter(dataset)
+                consumed = [int(next(records)[0]) for _ in range(num_consumed)]
+                state = dataset.state_dict()
+
+                new_dataset = self.create_dataset(
+                    shards, 1, shuffle_buffer_size
+                )
+                new_dataset.set_epoch(0)
+                new_dataset.load_state_dict(state)
+                resumed = [int(r[0]) for r in new_dataset]
+                self.assertEqual(consumed + resumed, expected)
+
+    def test_dataloader(self):
+        shards = create_shards(16)
+        for num_workers in [0, 2]:
+            records = []
+            for rank in range(2):
+                dataset = self.create_dataset(shards, rank, 8)
+                loader = DataLoader(
+                    dataset,
+                    places=paddle.CPUPlace(),
+                    batch_size=4,
+                    num_workers=num_workers,
+                )
+                for batch in loader:
+                    records.extend(batch.numpy().flatten().tolist())
+            self.assertEqual(sorted(records), all_records(shards))
+
+    def read_loader(self, loader, num_batches=None):
+        records = []
+        for i, batch in enumerate(loader):
+            records.extend(batch.numpy().flatten().tolist())
+            if i + 1 == num_batches:
+                break
+        return records
+
+    def test_dataloader_resume(self):
+        shards = create_shards(16)
+        for num_workers, worker_mode in [
+            (0, 'process'),
+            (2, 'process'),
+            (2, 'thread'),
+        ]:
+            for shuffle_buffer_size in [0, 8]:
+
+                def create_loader():
+                    dataset = self.create_dataset(
+                        shards, 0, shuffle_buffer_size
+                    )
+                    return DataLoader(
+                        dataset,
+                        places=paddle.CPUPlace(),
+                        batch_size=4,
+                        num_workers=num_workers,
+                        worker_mode=worker_mode,
+                    )
+
+                expected = self.read_loader(create_loader())
+                loader = create_loader()
+                consumed = self.read_loader(loader, num_batches=5)
+                state = loader.state_dict()
+
+                new_loader = create_loader()
+                new_loader.load_state_dict(state)
+                resumed = self.read_loader(new_loader)
+                if num_workers == 0:
+                    self.assertEqual(consumed + resumed, expected)
+                else:
+                    # batches of workers are interleaved, each record is
+                    # still yielded exactly once
+                    self.assertEqual(
+                        sorted(consumed + resumed), sorted(expected)
+                    )
+
+                # only the epoch after loading state is resumed
+                next_epoch = self.read_loader(new_loader)
+                self.assertEqual(sorted(next_epoch), sorted(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Microbenchmark of the latency of looking up the last variant of a code
+# object by GuardTree and by trying guards one by one, the guards of
+# variants only differ in the shape of input. Run it in this directory:
+#
+#   python benchmark_guard_tree.py
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from test_guard_tree import (
+    build_guard_tree,
+    linear_lookup,
+    make_frame,
+    make_tensor_guard,
+)
+
+import paddle
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument(
+        "--variants", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32]
+    )
+    args = parser.parse_args()
+
+    print("variants | linear lookup (us) | guard tree lookup (us)")
+    for num_variants in args.variants:
+        guard_fns = [
+            make_tensor_guard(paddle.randn([i + 1, 8]))
+            for i in range(num_variants)
+        ]
+        guard_tree = build_guard_tree(guard_fns)
+        frame = make_frame(paddle.randn([num_variants, 8]))
+        assert guard_tree.lookup(frame) == num_variants - 1
+        assert linear_lookup(guard_fns, frame) == num_variants - 1
+
+        linear_cost = timeit(
+            lambda: linear_lookup(guard_fns, frame), args.repeat
+        )
+        tree_cost = timeit(lambda: guard_tree.lookup(frame), args.repeat)
+        print(
+            f"{num_variants:8} | {linear_cost * 1e6:18.2f} | {tree_cost * 1e6:22.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+import unittest
+from unittest.mock import patch
+
+from test_case_base import (
+    TestCaseBase,
+    test_instruction_translator_cache_context,
+)
+
+import paddle
+from paddle.jit.sot import symbolic_translate
+from paddle.jit.sot.opcode_translator.executor import executor_cache
+from paddle.jit.sot.utils import InnerError, async_compile_guard
+
+
+def foo(x, y):
+    z = x + y * 2
+    return z.mean(), z
+
+
+def bar(x):
+    return paddle.nn.functional.relu(x) - 1
+
+
+def append_and_sum(xs):
+    xs.append(xs[0] * 2)
+    return sum(xs)
+
+
+def raise_inner_error(frame, **kwargs):
+    raise InnerError("translate failed")
+
+
+def blocking_translate(code, event):
+    start_translate = executor_cache.start_translate
+
+    def translate(frame, **kwargs):
+        if frame.f_code is code:
+            event.wait()
+        return start_translate(frame, **kwargs)
+
+    return translate
+
+
+class TestAsyncCompile(TestCaseBase):
+    def test_eager_fallback(self):
+        with async_compile_guard(
+            True
+        ), test_instruction_translator_cache_context() as ctx:
+            x, y = paddle.randn([3, 4]), paddle.randn([3, 4])
+            # the first call runs eagerly while translating
+            self.assert_results(foo, x, y)
+            ctx.wait_translations()
+            self.assertEqual(ctx.translate_count, 1)
+
+            # the translated code is installed in the next call
+            self.assert_results(foo, x, y)
+            custom_code, _ = ctx.cache[foo.__code__][0]
+            self.assertIsNotNone(custom_code.code)
+            self.assertEqual(ctx.translate_count, 1)
+
+            # a new variant is translated in background as well
+            x, y = paddle.randn([5, 4]), paddle.randn([5, 4])
+            self.assert_results(foo, x, y)
+            ctx.wait_translations()
+            self.assert_results(foo, x, y)
+            self.assertEqual(ctx.translate_count, 2)
+            self.assertEqual(len(ctx.cache[foo.__code__]), 2)
+
+    @patch(
+        "paddle.jit.sot.opcode_translator.executor.executor_cache.start_translate",
+        raise_inner_error,
+    )
+    def test_translate_error(self):
+        with async_compile_guard(
+            True
+        ), test_instruction_translator_cache_context() as ctx:
+            x, y = paddle.randn([3, 4]), paddle.randn([3, 4])
+            self.assert_results(foo, x, y)
+            ctx.wait_translations()
+            # the error of translation is raised in the next call
+            with self.assertRaises(InnerError):
+                symbolic_translate(foo)(x, y)
+
+    def test_run_compiled_while_translating(self):
+        event = threading.Event()
+        with patch.object(
+            executor_cache,
+            "start_translate",
+            blocking_translate(foo.__code__, event),
+        ), async_compile_guard(
+            True
+        ), test_instruction_translator_cache_context() as ctx:
+            x, y = paddle.randn([3, 4]), paddle.randn([3, 4])
+            self.assert_results(bar, x)
+            ctx.wait_translations()
+
+            # the translation of foo is in flight, the compiled bar waits for
+            # it to build its program instead of racing on the static graph
+            self.assert_results(foo, x, y)
+            timer = threading.Timer(0.2, event.set)
+            timer.start()
+            for _ in range(3):
+                self.assert_results(bar, x)
+            custom_code, _ = ctx.cache[bar.__code__][0]
+            self.assertIsNotNone(custom_code.code)
+
+            ctx.wait_translations()
+            timer.join()
+            self.assert_results(foo, x, y)
+            self.assertEqual(ctx.translate_count, 2)
+            self.assertEqual(len(ctx.cache[foo.__code__]), 1)
+
+    def test_snapshot_of_locals(self):
+        event = threading.Event()
+        with patch.object(
+            executor_cache,
+            "start_translate",
+            blocking_translate(append_and_sum.__code__, event),
+        ), async_compile_guard(
+            True
+        ), test_instruction_translator_cache_context() as ctx:
+            xs = [paddle.randn([3]), paddle.randn([3])]
+            self.assert_results_with_side_effects(append_and_sum, xs)
+            # the eager run appends to the list before it is translated
+            symbolic_translate(append_and_sum)(xs)
+            self.assertEqual(len(xs), 3)
+            event.set()
+            ctx.wait_translations()
+            self.assertEqual(ctx.translate_count, 1)
+
+            # guards are derived from the list before the eager run
+            self.assert_results_with_side_effects(
+                append_and_sum, [paddle.randn([3]), paddle.randn([3])]
+            )
+            self.assertEqual(ctx.translate_count, 1)
+            self.assertEqual(len(ctx.cache[append_and_sum.__code__]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
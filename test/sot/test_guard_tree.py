@@ -0,0 +1,148 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import inspect
+import unittest
+
+from test_case_base import (
+    TestCaseBase,
+    test_instruction_translator_cache_context,
+)
+
+import paddle
+from paddle.jit.sot.infer_meta import MetaInfo
+from paddle.jit.sot.opcode_translator.executor.guard import (
+    StringifiedExpression,
+    make_guard,
+)
+from paddle.jit.sot.opcode_translator.executor.guard_tree import GuardTree
+from paddle.jit.sot.utils import enable_guard_tree_guard, tmp_name_guard
+
+
+def make_frame(x, y=None):
+    return inspect.currentframe()
+
+
+def make_tensor_guard(x):
+    with tmp_name_guard():
+        x_tracer = StringifiedExpression("frame.f_locals['x']", [], {})
+        return make_guard(
+            [
+                StringifiedExpression(
+                    f"id(type({{}})) == {id(paddle.Tensor)}", [x_tracer], {}
+                ),
+                StringifiedExpression(
+                    f"MetaInfo.from_tensor({{}}).guard_str() == '{MetaInfo.from_tensor(x).guard_str()}'",
+                    [x_tracer],
+                    {"MetaInfo": MetaInfo},
+                ),
+            ]
+        )
+
+
+def make_value_guard(y):
+    with tmp_name_guard():
+        y_tracer = StringifiedExpression("frame.f_locals['y']", [], {})
+        return make_guard(
+            [
+                StringifiedExpression("isinstance({}, int)", [y_tracer], {}),
+                StringifiedExpression(f"{{}} == {y!r}", [y_tracer], {}),
+            ]
+        )
+
+
+def linear_lookup(guard_fns, frame):
+    for index, guard_fn in enumerate(guard_fns):
+        try:
+            if guard_fn(frame):
+                return index
+        except Exception:
+            continue
+    return None
+
+
+def build_guard_tree(guard_fns):
+    guard_tree = GuardTree()
+    for index, guard_fn in enumerate(guard_fns):
+        guard_tree.add(index, guard_fn)
+    return guard_tree
+
+
+class TestGuardTree(unittest.TestCase):
+    def test_dispatch(self):
+        tensors = [paddle.randn([i + 1, 4]) for i in range(4)]
+        guard_fns = [make_tensor_guard(x) for x in tensors]
+        guard_fns.insert(2, make_value_guard(3))
+        guard_fns.append(lambda frame: frame.f_locals['y'] == 'opaque')
+        guard_tree = build_guard_tree(guard_fns)
+
+        frames = [make_frame(x) for x in tensors]
+        frames += [
+            make_frame(paddle.randn([5, 4])),
+            make_frame(paddle.randn([2, 4], dtype='float64')),
+            make_frame(tensors[3], 3),
+            make_frame([1, 2], 3),
+            make_frame([1, 2], 'opaque'),
+            make_frame([1, 2], [3]),
+        ]
+        for frame in frames:
+            self.assertEqual(
+                guard_tree.lookup(frame), linear_lookup(guard_fns, frame)
+            )
+        # shape of x is read once for all tensor guards
+        self.assertEqual(
+            len({test.key[1] for test in guard_tree.tests.values()}),
+            len(guard_tree.tests),
+        )
+
+    def test_many_variants(self):
+        guard_fns = [
+            make_tensor_guard(paddle.randn([i + 1, 8])) for i in range(16)
+        ]
+        guard_tree = build_guard_tree(guard_fns)
+        for i in range(17):
+            frame = make_frame(paddle.randn([i + 1, 8]))
+            self.assertEqual(
+                guard_tree.lookup(frame), linear_lookup(guard_fns, frame)
+            )
+
+    def test_empty_guard(self):
+        guard_tree = build_guard_tree([make_value_guard(1), make_guard([])])
+        self.assertEqual(guard_tree.lookup(make_frame(None, 1)), 0)
+        self.assertEqual(guard_tree.lookup(make_frame(None, 2)), 1)
+        self.assertIsNone(GuardTree().lookup(make_frame(None)))
+
+
+def foo(x):
+    return x + 1
+
+
+class TestGuardTreeCache(TestCaseBase):
+    def test_cache_hit(self):
+        for enable in [True, False]:
+            with enable_guard_tree_guard(
+                enable
+            ), test_instruction_translator_cache_context() as ctx:
+                for i in range(1, 5):
+                    self.assert_results(foo, paddle.randn([i, 3]))
+                    self.assertEqual(ctx.translate_count, i)
+                for i in range(1, 5):
+                    self.assert_results(foo, paddle.randn([i, 3]))
+                self.assertEqual(ctx.translate_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
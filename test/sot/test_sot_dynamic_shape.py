@@ -22,7 +22,10 @@ from test_case_base import (
 )
 
 import paddle
-from paddle.jit.sot.utils import with_allow_dynamic_shape_guard
+from paddle.jit.sot.utils import (
+    dynamic_shape_threshold_guard,
+    with_allow_dynamic_shape_guard,
+)
 
 
 def dynamic_shape_input_func1(x):
@@ -123,6 +126,23 @@ class TestOpcodeExecutorDynamicShapeCache(TestCaseBase):
                 )
                 self.assertEqual(ctx.translate_count, 2)
 
+    def test_dynamic_shape_threshold(self):
+        with with_allow_dynamic_shape_guard(
+            True
+        ), dynamic_shape_threshold_guard(
+            3
+        ), test_instruction_translator_cache_context() as ctx:
+            for i in range(1, 4):
+                self.assert_results(
+                    dynamic_shape_input_func1, paddle.randn([i, 4, 5])
+                )
+                self.assertEqual(ctx.translate_count, i)
+            for i in range(4, 8):
+                self.assert_results(
+                    dynamic_shape_input_func1, paddle.randn([i, 4, 5])
+                )
+                self.assertEqual(ctx.translate_count, 3)
+
     # def test_dynamic_shape_in_list(self):
     #     with with_allow_dynamic_shape_guard(
     #         True